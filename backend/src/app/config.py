@@ -12,9 +12,23 @@ class Settings(BaseSettings):
 
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     MONGODB_URI: str = "mongodb://localhost:27017"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_WAIT_QUEUE_TIMEOUT_SEC: float = 10
+    MONGODB_ENSURE_INDEXES: bool = True
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     BOT_ENV: str = "http://localhost:8080/"
+    BOT_ENV_MAX_CONNECTIONS: int = 32
+    BOT_ENV_KEEPALIVE_SEC: float = 60
+    BOT_ENV_CONNECT_TIMEOUT_SEC: float = 5
+    BOT_ENV_TIMEOUT_SEC: float = 330
+    BOT_ENV_RETRIES: int = 3
+    BOT_ENV_BACKOFF_SEC: float = 0.5
+    JOB_WORKERS: int = 8
+    JOB_LEASE_SEC: float = 60
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_POLL_SEC: float = 2
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
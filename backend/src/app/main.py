@@ -1,18 +1,36 @@
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, Response
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 import uvicorn
 
-from app.routers import admin, users, bots, tournaments, matches, game_types
+from app.routers import admin, users, bots, tournaments, matches, game_types, jobs
+from app.utils.connection import close_client
+from app.utils import database
+from app.utils.jobs import workers
 from app.config import settings
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    database.get_client()
+    if settings.MONGODB_ENSURE_INDEXES:
+        database.bootstrap_indexes()
+    workers.start()
+    yield
+    await workers.stop()
+    await close_client()
+    database.close_client()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(admin.router, tags=["admin"])
 app.include_router(users.router, tags=["users"])
 app.include_router(bots.router, tags=["bots"])
 app.include_router(tournaments.router, tags=["tournaments"])
 app.include_router(matches.router, tags=["matches"])
 app.include_router(game_types.router, tags=["game_types"])
+app.include_router(jobs.router, tags=["jobs"])
 
 app.add_middleware(
     CORSMiddleware,
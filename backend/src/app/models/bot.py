@@ -4,6 +4,7 @@ from bson import ObjectId
 
 from app.schemas.user import AccountType, User
 from app.schemas.tournament import Tournament
+from app.utils.loaders import get_loaders
 from app.schemas.bot import Bot, BotUpdate
 from database.main import (
     Tournament as TournamentCollection,
@@ -96,14 +97,14 @@ class DBBot:
         Retrieves the owner of the bot.
         """
 
-        owner_data = self._collection.get_owner(self.id)
+        owner_data = get_loaders(self._db).owners.load(self.id)
         if owner_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Owner of bot: {self.id} not found.",
             )
 
-        db_owner = U.DBUser(self._db, id=owner_data["_id"])
+        db_owner = U.DBUser(self._db, data=owner_data)
         return db_owner.to_schema()
 
     def get_tournaments(self) -> list[Tournament]:
@@ -116,6 +117,7 @@ class DBBot:
         db_tournaments = [
             T.DBTournament(self._db, data=tournament) for tournament in tournament_ids
         ]
+        T.DBTournament.prefetch(self._db, db_tournaments)
 
         return [db_tournament.to_schema() for db_tournament in db_tournaments]
 
@@ -128,6 +130,7 @@ class DBBot:
         db_tournaments = [
             T.DBTournament(self._db, data=tournament) for tournament in tournaments
         ]
+        T.DBTournament.prefetch(self._db, db_tournaments)
 
         return [db_tournament.to_schema() for db_tournament in db_tournaments]
 
@@ -149,6 +152,7 @@ class DBBot:
         if bot_data.name is not None:
             self._collection.update_name(self.id, bot_data.name)
 
+        get_loaders(self._db).bots.clear(self.id)
         self._from_id(self.id)
 
     def update_stats(self, winner: bool) -> None:
@@ -157,6 +161,7 @@ class DBBot:
         """
 
         self._collection.update_stats(self.id, winner)
+        get_loaders(self._db).bots.clear(self.id)
         self._from_id(self.id)
 
     def delete(self) -> None:
@@ -165,13 +170,16 @@ class DBBot:
         """
 
         self._collection.delete_bot(self.id)
+        loaders = get_loaders(self._db)
+        loaders.bots.clear(self.id)
+        loaders.owners.clear(self.id)
 
     def to_schema(self, detail: bool = False) -> Bot:
         """
         Converts the model to a Bot schema.
         """
 
-        db_game_type = G.DBGameType(self._db, id=self.game_type)
+        db_game_type = G.DBGameType.load_many(self._db, [self.game_type])[0]
         game_type = db_game_type.to_schema()
 
         owner = self.get_owner()
@@ -204,7 +212,7 @@ class DBBot:
         )
 
     @classmethod
-    def insert(
+    async def insert(
         cls,
         db: MongoDB,
         current_user: User,
@@ -219,7 +227,7 @@ class DBBot:
         db_game_type = G.DBGameType(db, id=game_type_id)
         game_type = db_game_type.to_schema()
 
-        if not conn.validate_bot(game_type.name, code):
+        if not await conn.validate_bot(game_type.name, code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Bot validation failed.",
@@ -233,6 +241,27 @@ class DBBot:
         collection.validate_bot(bot_id)
         return cls(db, id=bot_id)
 
+    @classmethod
+    def load_many(cls, db: MongoDB, bot_ids: list[ObjectId]) -> list["DBBot"]:
+        """
+        Retrieves bots with their owners and game types in a few queries.
+        They are remembered for the rest of the request.
+        """
+
+        loaders = get_loaders(db)
+        loaders.prefetch_bots(bot_ids)
+
+        db_bots = []
+        for bot_id, data in zip(bot_ids, loaders.bots.load_many(bot_ids)):
+            if data is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Bot: {bot_id} not found.",
+                )
+            db_bots.append(cls(db, data=data))
+
+        return db_bots
+
     @staticmethod
     def get_all(db: MongoDB) -> list[Bot]:
         """
@@ -240,5 +269,10 @@ class DBBot:
         """
 
         bots = db.get_all_bots()
+        loaders = get_loaders(db)
+        for bot in bots:
+            loaders.bots.prime(bot["_id"], bot)
+        loaders.prefetch_bots(bot["_id"] for bot in bots)
+
         db_bots = [DBBot(db, data=bot) for bot in bots]
         return [db_bot.to_schema() for db_bot in db_bots]
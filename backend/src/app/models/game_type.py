@@ -4,6 +4,7 @@ from bson import ObjectId
 
 from database.main import MongoDB, GameType as GameTypeCollection
 from app.schemas.game_type import GameType, GameTypeCreate
+from app.utils.loaders import get_loaders
 
 
 class DBGameType:
@@ -79,6 +80,27 @@ class DBGameType:
 
         return cls(db, id=game_id)
 
+    @classmethod
+    def load_many(
+        cls, db: MongoDB, game_type_ids: list[ObjectId]
+    ) -> list["DBGameType"]:
+        """
+        Retrieves game types in a single query.
+        They are remembered for the rest of the request.
+        """
+
+        game_types = get_loaders(db).game_types.load_many(game_type_ids)
+        db_game_types = []
+        for game_type_id, data in zip(game_type_ids, game_types):
+            if data is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Game type: {game_type_id} not found.",
+                )
+            db_game_types.append(cls(db, data=data))
+
+        return db_game_types
+
     @staticmethod
     def get_all(db: MongoDB) -> list[GameType]:
         """
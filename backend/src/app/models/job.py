@@ -0,0 +1,153 @@
+from fastapi import HTTPException, status
+from typing import overload, Any
+from datetime import datetime
+from bson import ObjectId
+
+from app.schemas.job import Job, JobKind, JobProgress, JobStatus
+from database.main import MongoDB, Job as JobCollection
+
+
+class DBJob:
+    """
+    Represents a background job model in the database.
+
+    Attributes:
+    ---
+    id : ObjectId
+        The unique identifier of the job.
+    kind : JobKind
+        The kind of work done by the job.
+    status : JobStatus
+        The status of the job.
+    tournament_id : ObjectId
+        The unique identifier of the tournament the job belongs to.
+    match_id : ObjectId
+        The unique identifier of the match run by the job.
+    attempts : int
+        The number of times a worker took the job.
+    progress : float
+        The part of the job that is done, from 0 to 1.
+    result : dict[str, Any]
+        The result of the job once it is done.
+    error : str
+        The error of the last failed attempt.
+    """
+
+    @overload
+    def __init__(self, db: MongoDB, /, *, id: ObjectId) -> None: ...
+
+    @overload
+    def __init__(self, db: MongoDB, /, *, data: dict[str, Any]) -> None: ...
+
+    def __init__(
+        self,
+        db: MongoDB,
+        /,
+        *,
+        id: ObjectId | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> None:
+        self._db = db
+        self._collection = JobCollection(db)
+
+        if id is not None:
+            self._from_id(id)
+        elif data is not None:
+            self._from_data(data)
+        else:
+            raise ValueError("DBJob must be initialized with either id or data.")
+
+    def _from_data(self, data: dict[str, Any]) -> None:
+        self.id: ObjectId = data["_id"]
+        self.kind = JobKind(data["kind"])
+        self.status = JobStatus(data["status"])
+        self.tournament_id: ObjectId = data["tournament_id"]
+        self.match_id: ObjectId | None = data["match_id"]
+        self.attempts: int = data["attempts"]
+        self.progress: float = data["progress"]
+        self.result: dict[str, Any] | None = data["result"]
+        self.error: str | None = data["error"]
+        self.created_at: datetime = data["created_at"]
+        self.updated_at: datetime = data["updated_at"]
+
+    def _from_id(self, job_id: ObjectId) -> None:
+        data = self._collection.get_job_by_id(job_id)
+
+        if data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job: {job_id} not found.",
+            )
+
+        self._from_data(data)
+
+    def to_schema(self) -> Job:
+        """
+        Converts the model to a Job schema.
+        """
+
+        return Job(
+            _id=self.id,
+            kind=self.kind,
+            status=self.status,
+            tournament_id=self.tournament_id,
+            match_id=self.match_id,
+            attempts=self.attempts,
+            progress=self.progress,
+            result=self.result,
+            error=self.error,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    @classmethod
+    def insert(
+        cls,
+        db: MongoDB,
+        kind: JobKind,
+        tournament_id: ObjectId,
+        match_id: ObjectId | None = None,
+    ) -> "DBJob":
+        """
+        Queues a job.
+        Returns the queued job, or the job already queued or running for the same work.
+        """
+
+        collection = JobCollection(db)
+        job_id = collection.create_job(kind.value, tournament_id, match_id)
+
+        return cls(db, id=job_id)
+
+    @staticmethod
+    def get_by_tournament(db: MongoDB, tournament_id: ObjectId) -> list[Job]:
+        """
+        Retrieves the jobs of a tournament, oldest first.
+        """
+
+        collection = JobCollection(db)
+        jobs = collection.get_jobs_by_tournament(tournament_id)
+
+        return [DBJob(db, data=job).to_schema() for job in jobs]
+
+    @staticmethod
+    def get_progress(db: MongoDB, tournament_id: ObjectId) -> JobProgress:
+        """
+        Counts the jobs of a tournament by status.
+        """
+
+        jobs = DBJob.get_by_tournament(db, tournament_id)
+        counts = {job_status: 0 for job_status in JobStatus}
+        for job in jobs:
+            counts[job.status] += 1
+
+        total = len(jobs)
+        finished = counts[JobStatus.DONE] + counts[JobStatus.FAILED]
+
+        return JobProgress(
+            total=total,
+            queued=counts[JobStatus.QUEUED],
+            running=counts[JobStatus.RUNNING],
+            done=counts[JobStatus.DONE],
+            failed=counts[JobStatus.FAILED],
+            progress=finished / total if total else 1.0,
+        )
@@ -4,8 +4,10 @@ from bson import ObjectId
 
 from database.main import MongoDB, Match as MatchCollection
 from app.schemas.match import Match, MatchCreate
+from app.utils.loaders import get_loaders
 from app.schemas.bot import Bot
 import app.utils.connection as conn
+import app.utils.results as results
 import app.models.tournament as T
 import app.models.bot as B
 
@@ -22,8 +24,10 @@ class DBMatch:
         The number of the game in the tournament.
     players : tuple[ObjectId, ObjectId]
         The unique identifiers of the players.
-    moves : list[str]
-        The moves of the match.
+    seed : int
+        The seed the match is played with, None to draw one when it is run.
+    n_moves : int
+        The number of moves of the match, read with get_moves.
     winner : ObjectId
         The unique identifier of the winner of the match.
     """
@@ -56,7 +60,8 @@ class DBMatch:
         self.id: ObjectId = data["_id"]
         self.game_num: int = data["game_num"]
         self.players: tuple[ObjectId, ObjectId] = data["players"]
-        self.moves: list[str] = data["moves"]
+        self.seed: int | None = data.get("seed")
+        self.n_moves: int = data.get("n_moves", 0)
         self.winner: ObjectId | None = data["winner"]
 
     def _from_id(self, match_id: ObjectId) -> None:
@@ -75,17 +80,18 @@ class DBMatch:
         Retrieves the players of the match.
         """
 
-        id_0, id_1 = self.players
-        db_players = B.DBBot(self._db, id=id_0), B.DBBot(self._db, id=id_1)
+        db_players = B.DBBot.load_many(self._db, list(self.players))
         bot_0 = db_players[0].to_schema(detail=detail)
         bot_1 = db_players[1].to_schema(detail=detail)
 
         return bot_0, bot_1
 
-    def run(self) -> dict[str, Bot]:
+    async def run(self) -> dict[str, Bot]:
         """
-        Runs the match on docker.
-        Updates the database with the results of a match.
+        Runs the match on docker, or reuses the result of the same match played before.
+        A draw is replayed with the next seeds until one has a winner.
+        Saves the result of the match, with the seed that decided it, and the stats of
+        its bots at once.
         Returns the winner and loser bots with updated stats.
         """
 
@@ -95,11 +101,17 @@ class DBMatch:
         assert bot_0.code is not None
         assert bot_1.code is not None
 
-        response = conn.run_match(game_type.name, bot_0.code, bot_1.code)
+        seed = self.seed if self.seed is not None else results.new_seed()
+        response = await results.run_match(
+            self._db, game_type.name, bot_0.code, bot_1.code, seed
+        )
         i = 0
 
         while response["winner"] is None:
-            response = conn.run_match(game_type.name, bot_0.code, bot_1.code)
+            seed = (seed + 1) % (results.MAX_SEED + 1)
+            response = await results.run_match(
+                self._db, game_type.name, bot_0.code, bot_1.code, seed
+            )
             i += 1
 
             if i > 9:
@@ -108,7 +120,7 @@ class DBMatch:
                     detail=f"Match: {self.id} ended in a draw.",
                 )
 
-        moves: list[str] = response["states"]
+        moves: list[Any] = response["moves"]
         if response["winner"] == 0:
             winner = bot_0
             loser = bot_1
@@ -116,42 +128,71 @@ class DBMatch:
             winner = bot_1
             loser = bot_0
 
-        self._collection.set_winner(self.id, winner.id)
-        for move in moves:
-            self._collection.add_move(self.id, move)
+        # a match run twice at once is only counted by the run that saves it first
+        self._collection.save_result(self.id, winner.id, loser.id, moves, seed)
+        self._from_id(self.id)
+        if self.winner != winner.id:
+            winner, loser = loser, winner
 
+        loaders = get_loaders(self._db)
+        loaders.bots.clear(winner.id)
+        loaders.bots.clear(loser.id)
         db_winner = B.DBBot(self._db, id=winner.id)
         db_loser = B.DBBot(self._db, id=loser.id)
-        db_winner.update_stats(True)
-        db_loser.update_stats(False)
 
         return {
             "winner": db_winner.to_schema(),
             "loser": db_loser.to_schema(),
         }
 
+    def get_moves(self, offset: int = 0, limit: int | None = None) -> list[Any]:
+        """
+        Retrieves the moves of the match from offset on, at most limit of them.
+        Each move is the list of arguments of the game's move.
+        """
+
+        return self._collection.get_match_moves(self.id, offset, limit)
+
+    async def get_states(self, ply: int | None = None) -> list[str]:
+        """
+        Replays the match on docker.
+        Returns the text representations of its states, or only the state after ply moves.
+        """
+
+        bot_0, _ = self.get_players()
+
+        return await conn.replay_match(bot_0.game_type.name, self.get_moves(), ply)
+
     def to_schema(self, detail: bool = False) -> Match:
         """
         Converts the model to a Match schema.
+        The seed is hidden until the match is played, so that bots cannot be tuned to
+        the random numbers it draws.
         """
 
         players = self.get_players()
+        seed = self.seed if self.winner is not None else None
 
-        db_winner = B.DBBot(self._db, id=self.winner) if self.winner else None
-        winner = db_winner.to_schema() if db_winner else None
+        winner = None
+        if self.winner is not None:
+            winner = B.DBBot.load_many(self._db, [self.winner])[0].to_schema()
 
         if detail:
             return Match(
                 _id=self.id,
                 game_num=self.game_num,
                 players=players,
-                moves=self.moves,
+                seed=seed,
+                n_moves=self.n_moves,
+                moves=self.get_moves(),
                 winner=winner,
             )
         return Match(
             _id=self.id,
             game_num=self.game_num,
             players=players,
+            seed=seed,
+            n_moves=self.n_moves,
             moves=None,
             winner=winner,
         )
@@ -178,7 +219,10 @@ class DBMatch:
 
         collection = MatchCollection(db)
         match_id = collection.create_match(
-            match_data.game_num, match_data.players[0], match_data.players[1]
+            match_data.game_num,
+            match_data.players[0],
+            match_data.players[1],
+            match_data.seed,
         )
         db_tournament.add_match(match_id)
 
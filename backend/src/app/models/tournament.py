@@ -1,15 +1,30 @@
 from fastapi import HTTPException, status
-from typing import overload, Any
+from typing import overload, Any, Callable
 from datetime import datetime
 from bson import ObjectId
 import random
 import string
-
-from app.schemas.tournament import Tournament, TournamentCreate, TournamentUpdate
-from database.main import MongoDB, Tournament as TournamentCollection
+import math
+
+from app.schemas.tournament import (
+    Standing,
+    Tournament,
+    TournamentCreate,
+    TournamentFormat,
+    TournamentUpdate,
+)
+from app.utils.scheduler import round_robin_rounds, swiss_pairings, run_pairings
+from database.main import (
+    Tournament as TournamentCollection,
+    Match as MatchCollection,
+    MongoDB,
+)
 from app.schemas.match import Match, MatchCreate
+from app.utils.loaders import get_loaders
 from app.schemas.user import AccountType, User
 from app.schemas.bot import Bot
+from app.config import settings
+import app.utils.results as results
 import app.models.game_type as G
 import app.models.match as M
 import app.models.user as U
@@ -38,10 +53,20 @@ class DBTournament:
         The access code of the tournament.
     max_participants : int
         The maximum number of participants in the tournament.
+    format : TournamentFormat
+        The format of the tournament.
+    rounds : int
+        The number of rounds of a Swiss-system tournament, None for the default.
+    seed : int
+        The seed the bracket is drawn with and the seeds of the matches derive from.
     participants : list[ObjectId]
         The unique identifiers of the participants in the tournament.
+    bracket : list[ObjectId]
+        The participants in the drawn order of the bracket, empty until started.
     matches : list[ObjectId]
         The unique identifiers of the matches in the tournament.
+    standings : dict[str, dict[str, int]]
+        The results of the bots in the played matches, by bot identifier.
     winner : ObjectId
         The unique identifier of the winner of the tournament.
     """
@@ -79,8 +104,13 @@ class DBTournament:
         self.start_date: datetime = data["start_date"]
         self.access_code: str = data["access_code"]
         self.max_participants: int = data["max_participants"]
+        self.format = TournamentFormat(data.get("format", "single_elimination"))
+        self.rounds: int | None = data.get("rounds")
+        self.seed: int | None = data.get("seed")
         self.participants: list[ObjectId] = data["participants"]
+        self.bracket: list[ObjectId] = data.get("bracket") or []
         self.matches: list[ObjectId] = data["matches"]
+        self.standings: dict[str, dict[str, int]] = data.get("standings") or {}
         self.winner: ObjectId | None = data["winner"]
 
     def _from_id(self, tournament_id: ObjectId) -> None:
@@ -124,15 +154,37 @@ class DBTournament:
         Retrieves all bots from the database that participate in the tournament.
         """
 
-        db_bots = [B.DBBot(self._db, id=bot_id) for bot_id in self.participants]
+        db_bots = B.DBBot.load_many(self._db, self.participants)
         return [db_bot.to_schema() for db_bot in db_bots]
 
     def get_matches(self) -> list[Match]:
         """
         Retrieves all matches from the database that belong to a specific tournament.
+        The matches and then all their bots are fetched together.
         """
 
-        db_matches = [M.DBMatch(self._db, id=match_id) for match_id in self.matches]
+        collection = MatchCollection(self._db)
+        matches = {
+            match["_id"]: match
+            for match in collection.get_matches_by_ids(self.matches)
+        }
+
+        db_matches = []
+        for match_id in self.matches:
+            if match_id not in matches:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Match: {match_id} not found.",
+                )
+            db_matches.append(M.DBMatch(self._db, data=matches[match_id]))
+
+        bot_ids = {
+            bot_id
+            for db_match in db_matches
+            for bot_id in (*db_match.players, db_match.winner)
+            if bot_id is not None
+        }
+        get_loaders(self._db).prefetch_bots(bot_ids)
 
         return [db_match.to_schema() for db_match in db_matches]
 
@@ -169,6 +221,7 @@ class DBTournament:
         """
 
         self._collection.set_winner(self.id, winner_id)
+        get_loaders(self._db).bots.clear(winner_id)
         self._from_id(self.id)
 
     def add_participant(self, bot_id: ObjectId) -> None:
@@ -202,6 +255,7 @@ class DBTournament:
             )
 
         success = self._collection.add_participant(self.id, bot_id)
+        get_loaders(self._db).bots.clear(bot_id)
 
         if not success:
             raise HTTPException(
@@ -223,6 +277,7 @@ class DBTournament:
             )
 
         success = self._collection.remove_participant(self.id, bot_id)
+        get_loaders(self._db).bots.clear(bot_id)
 
         if not success:
             raise HTTPException(
@@ -240,11 +295,11 @@ class DBTournament:
         self._collection.add_match(self.id, match_id)
         self._from_id(self.id)
 
-    def run(self) -> None:
+    def start(self) -> None:
         """
         Starts the tournament.
-        Creates the first round of matches.
-        Adds an example bot to the tournament if there are too few participants.
+        Draws the order of the participants in the bracket, with the seed of the
+        tournament.
         """
 
         if self._is_finished():
@@ -252,32 +307,116 @@ class DBTournament:
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Tournament: {self.id} is already finished.",
             )
+        if len(self.participants) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Tournament: {self.id} needs at least 2 participants.",
+            )
+
+        bracket = list(self.participants)
+        random.Random(self.seed).shuffle(bracket)
+
+        if not self._collection.start_tournament(self.id, bracket, datetime.now()):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Tournament: {self.id} is already started.",
+            )
+
+        self._from_id(self.id)
+
+    def prepare_run(self) -> None:
+        """
+        Starts the tournament if it was not started yet.
+        A started tournament without a winner is left as it is, so that a run which
+        stopped can be queued again and resume.
+        """
+
+        if self.winner is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Tournament: {self.id} is already finished.",
+            )
+
+        if not self.bracket:
+            self.start()
+
+    async def run(
+        self, on_progress: Callable[[float], None] | None = None
+    ) -> ObjectId:
+        """
+        Plays a started tournament in its format.
+        Runs independent matches concurrently, records their results in the standings
+        as they finish and sets and returns the winner.
+        Matches already played are not played again, so a run can be resumed.
+        """
+
+        if self.winner is not None:
+            return self.winner
+        if not self.bracket:
+            self.start()
+
+        n_bots = len(self.bracket)
+        if self.format is TournamentFormat.ROUND_ROBIN:
+            total = n_bots * (n_bots - 1) // 2
+        elif self.format is TournamentFormat.SWISS:
+            total = self._get_swiss_rounds() * (n_bots // 2)
+        else:
+            total = n_bots - 1
+        runner = _MatchRunner(self, total, on_progress)
+
+        if self.format is TournamentFormat.ROUND_ROBIN:
+            winner = await self._run_round_robin(runner)
+        elif self.format is TournamentFormat.SWISS:
+            winner = await self._run_swiss(runner)
+        else:
+            winner = await self._run_single_elimination(runner)
+
+        self.set_winner(winner)
 
-        participants = self._fill_tournament()
-        random.shuffle(participants)
-        for i in range(len(participants) // 2):
-            bot_0 = participants[2 * i]
-            bot_1 = participants[2 * i + 1]
+        return winner
 
-            match_data = MatchCreate(game_num=i, players=[bot_0, bot_1])
-            M.DBMatch.insert(self._db, self.id, match_data)
+    def record_result(
+        self, key: str, winner_id: ObjectId, loser_id: ObjectId | None = None
+    ) -> None:
+        """
+        Adds the result of a match, or a bye if there is no loser, to the standings.
+        A result with the same key is only counted once.
+        """
+
+        self._collection.record_result(self.id, key, winner_id, loser_id)
+
+    def get_standings(self) -> list[Standing]:
+        """
+        Retrieves the standings of the tournament, best first.
+        Bots with the same number of points are ordered by their place in the bracket.
+        """
 
-        self._collection.update_start_date(self.id, datetime.now())
         self._from_id(self.id)
+        bots = self.bracket or self.participants
+        order = {bot_id: i for i, bot_id in enumerate(bots)}
+        standings = [
+            Standing(bot_id=bot_id, **self.standings.get(str(bot_id), {}))
+            for bot_id in bots
+        ]
+
+        return sorted(standings, key=lambda s: (-s.points, order[s.bot_id]))
 
     def to_schema(self) -> Tournament:
         """
         Converts the model to a Tournament schema.
+        The seed is hidden until the tournament is finished, as the seeds of all its
+        matches derive from it.
         """
 
-        db_game_type = G.DBGameType(self._db, id=self.game_type)
+        db_game_type = G.DBGameType.load_many(self._db, [self.game_type])[0]
         game_type = db_game_type.to_schema()
 
-        db_creator = U.DBUser(self._db, id=self.creator)
+        db_creator = U.DBUser.load_many(self._db, [self.creator])[0]
         creator = db_creator.to_schema()
 
-        db_winner = B.DBBot(self._db, id=self.winner) if self.winner else None
-        winner = db_winner.to_schema() if db_winner else None
+        winner = None
+        if self.winner is not None:
+            winner = B.DBBot.load_many(self._db, [self.winner])[0].to_schema()
 
         return Tournament(
             _id=self.id,
@@ -288,6 +427,9 @@ class DBTournament:
             start_date=self.start_date,
             access_code=self.access_code,
             max_participants=self.max_participants,
+            format=self.format,
+            rounds=self.rounds,
+            seed=self.seed if self.winner is not None else None,
             winner=winner,
         )
 
@@ -302,6 +444,10 @@ class DBTournament:
 
         G.DBGameType(db, id=tournament_data.game_type_id)
 
+        seed = tournament_data.seed
+        if seed is None:
+            seed = results.new_seed()
+
         access_code = cls._generate_access_code()
         i = 0
         while cls.get_id_by_access_code(db, access_code) is not None:
@@ -323,6 +469,9 @@ class DBTournament:
             tournament_data.start_date,
             access_code,
             tournament_data.max_participants,
+            tournament_data.format.value,
+            tournament_data.rounds,
+            seed,
         )
 
         return cls(db, id=tournament_id)
@@ -350,9 +499,22 @@ class DBTournament:
         db_tournaments = [
             DBTournament(db, data=tournament) for tournament in tournaments
         ]
+        DBTournament.prefetch(db, db_tournaments)
 
         return [db_tournament.to_schema() for db_tournament in db_tournaments]
 
+    @staticmethod
+    def prefetch(db: MongoDB, db_tournaments: list["DBTournament"]) -> None:
+        """
+        Loads the game types, creators and winners of the tournaments together,
+        so that converting them to schemas takes no further queries.
+        """
+
+        loaders = get_loaders(db)
+        loaders.game_types.load_many(t.game_type for t in db_tournaments)
+        loaders.users.load_many(t.creator for t in db_tournaments)
+        loaders.prefetch_bots(t.winner for t in db_tournaments if t.winner is not None)
+
     def _is_user_participant(self, user_id: ObjectId) -> bool:
         """
         Checks if a user is a participant in the tournament.
@@ -368,55 +530,74 @@ class DBTournament:
 
         return self.start_date < datetime.now()
 
-    def _get_example_bot(self) -> Bot:
+    async def _run_single_elimination(self, runner: "_MatchRunner") -> ObjectId:
         """
-        Retrieves an example bot for the tournament.
+        Plays the bracket round by round, advancing the winners.
+        If the number of bots is not a power of two, the first bots of the bracket
+        get a bye to the second round.
         """
 
-        admin_id = U.DBUser.get_id_by_username(self._db, "admin")
-        if admin_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Admin not found.",
-            )
+        bots = list(self.bracket)
+        while len(bots) > 1:
+            n_byes = (1 << (len(bots) - 1).bit_length()) - len(bots)
+            byes, playing = bots[:n_byes], bots[n_byes:]
 
-        db_admin = U.DBUser(self._db, id=admin_id)
-        example_bots = db_admin.get_bots()
-        example_bot = None
-        for bot in example_bots:
-            if bot.game_type.id == self.game_type:
-                example_bot = bot
-                break
+            db_matches = runner.create(list(zip(playing[::2], playing[1::2])))
+            winners = await runner.play(db_matches)
 
-        if example_bot is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Example bot not found for game type: {self.game_type}",
-            )
+            bots = byes + winners
+
+        return bots[0]
 
-        return example_bot
+    async def _run_round_robin(self, runner: "_MatchRunner") -> ObjectId:
+        """
+        Plays every bot against every other bot.
+        No pairing depends on another result, so all the matches are scheduled at once.
+        """
+
+        rounds = round_robin_rounds(self.bracket)
+        pairings = [pairing for round_pairings in rounds for pairing in round_pairings]
+        db_matches = runner.create(pairings)
+        await runner.play(db_matches)
 
-    def _fill_tournament(self) -> list[ObjectId]:
+        winner: ObjectId = self.get_standings()[0].bot_id
+        return winner
+
+    async def _run_swiss(self, runner: "_MatchRunner") -> ObjectId:
         """
-        Fills the tournament with example bots if there are too few participants.
-        Returns the modified list of participants.
+        Plays the Swiss-system rounds, pairing bots with similar scores that have not
+        played each other yet. A bye is worth a win.
         """
 
-        n_participants = len(self.participants)
-        next_power = 1
-        while next_power < n_participants:
-            next_power *= 2
-        bots_needed = next_power - n_participants
+        order = {bot_id: i for i, bot_id in enumerate(self.bracket)}
+        points = {bot_id: 0 for bot_id in self.bracket}
+        played: set[frozenset[ObjectId]] = set()
+        byes: set[ObjectId] = set()
+
+        for round_num in range(self._get_swiss_rounds()):
+            ranking = sorted(self.bracket, key=lambda bot: (-points[bot], order[bot]))
+            pairings, bye = swiss_pairings(ranking, played, byes)
 
-        participants = self.participants
-        if bots_needed > 0:
-            example_bot = self._get_example_bot()
-            self.add_participant(example_bot.id)
+            if bye is not None:
+                self.record_result(f"bye-{round_num}", bye)
+                points[bye] += 1
+                byes.add(bye)
 
-            for _ in range(bots_needed):
-                participants.append(example_bot.id)
+            db_matches = runner.create(pairings)
+            for match_winner in await runner.play(db_matches):
+                points[match_winner] += 1
+            played.update(frozenset(pairing) for pairing in pairings)
 
-        return participants
+        winner: ObjectId = self.get_standings()[0].bot_id
+        return winner
+
+    def _get_swiss_rounds(self) -> int:
+        """
+        Returns the number of rounds of a Swiss-system tournament, by default enough
+        to tell apart the winner.
+        """
+
+        return self.rounds or max(1, math.ceil(math.log2(len(self.bracket))))
 
     @staticmethod
     def _generate_access_code(length: int = 6) -> str:
@@ -426,3 +607,85 @@ class DBTournament:
 
         characters = string.ascii_uppercase + string.digits
         return "".join(random.choice(characters) for _ in range(length))
+
+
+class _MatchRunner:
+    """
+    Creates and plays the matches of a tournament run, numbered in creation order.
+    A match with the same number and players as an existing one is reused.
+    The seed of a match derives from the seed of the tournament and its number.
+    """
+
+    def __init__(
+        self,
+        db_tournament: DBTournament,
+        total: int,
+        on_progress: Callable[[float], None] | None,
+    ) -> None:
+        self.db_tournament = db_tournament
+        self.total = total
+        self.on_progress = on_progress
+        self.game_num = 0
+        self.played = 0
+        self.existing: dict[int, M.DBMatch] = {}
+        collection = MatchCollection(db_tournament._db)
+        for match in collection.get_matches_by_ids(db_tournament.matches):
+            db_match = M.DBMatch(db_tournament._db, data=match)
+            self.existing[db_match.game_num] = db_match
+
+    def create(self, pairings: list[tuple[ObjectId, ObjectId]]) -> list[M.DBMatch]:
+        """
+        Returns the matches of the pairings.
+        """
+
+        db_matches = []
+        for pairing in pairings:
+            players = list(pairing)
+            db_match = self.existing.get(self.game_num)
+            if db_match is None or list(db_match.players) != players:
+                seed = self.db_tournament.seed
+                if seed is not None:
+                    seed = results.derive_seed(seed, self.game_num)
+                match_data = MatchCreate(
+                    game_num=self.game_num, players=players, seed=seed
+                )
+                db_match = M.DBMatch.insert(
+                    self.db_tournament._db, self.db_tournament.id, match_data
+                )
+            db_matches.append(db_match)
+            self.game_num += 1
+
+        return db_matches
+
+    async def play(self, db_matches: list[M.DBMatch]) -> list[ObjectId]:
+        """
+        Plays the matches, as many at once as bot_env can take.
+        Returns their winners.
+        """
+
+        return await run_pairings(
+            db_matches, self._play_match, settings.BOT_ENV_MAX_CONNECTIONS
+        )
+
+    async def _play_match(self, db_match: M.DBMatch) -> ObjectId:
+        """
+        Runs a match unless it already has a winner and records its result.
+        Returns the winner.
+        """
+
+        winner: ObjectId
+        if db_match.winner is None:
+            result = await db_match.run()
+            winner = result["winner"].id
+        else:
+            winner = db_match.winner
+
+        bot_0, bot_1 = db_match.players
+        loser = bot_1 if winner == bot_0 else bot_0
+        self.db_tournament.record_result(str(db_match.id), winner, loser)
+
+        self.played += 1
+        if self.on_progress is not None and self.total:
+            self.on_progress(self.played / self.total)
+
+        return winner
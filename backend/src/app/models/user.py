@@ -4,6 +4,7 @@ from bson import ObjectId
 
 from app.schemas.user import AccountType, User, UserUpdate
 from app.schemas.tournament import Tournament
+from app.utils.loaders import get_loaders
 from app.schemas.bot import Bot
 from database.main import (
     Tournament as TournamentCollection,
@@ -82,12 +83,9 @@ class DBUser:
         Retrieves all bots from the database that belong to the user.
         """
 
-        bots = []
-        for bot_id in self.bots:
-            db_bot = B.DBBot(self._db, id=bot_id)
-            bots.append(db_bot.to_schema())
+        db_bots = B.DBBot.load_many(self._db, self.bots)
 
-        return bots
+        return [db_bot.to_schema() for db_bot in db_bots]
 
     def get_created_tournaments(self) -> list[Tournament]:
         """
@@ -99,6 +97,7 @@ class DBUser:
         db_tournaments = [
             T.DBTournament(self._db, data=tournament) for tournament in tournament_ids
         ]
+        T.DBTournament.prefetch(self._db, db_tournaments)
 
         return [db_tournament.to_schema() for db_tournament in db_tournaments]
 
@@ -123,6 +122,7 @@ class DBUser:
 
         self._collection.update_password(self.id, hashed_password)
         self._from_id(self.id)
+        self._clear_loaders()
 
     def update(self, user_data: UserUpdate) -> None:
         """
@@ -143,6 +143,7 @@ class DBUser:
             self._collection.update_ban(self.id, user_data.is_banned)
 
         self._from_id(self.id)
+        self._clear_loaders()
 
     def add_bot(self, bot_id: ObjectId) -> None:
         """
@@ -150,6 +151,7 @@ class DBUser:
         """
 
         self._collection.add_bot(self.id, bot_id)
+        get_loaders(self._db).owners.clear(bot_id)
         self._from_id(self.id)
 
     def to_schema(self) -> User:
@@ -181,6 +183,25 @@ class DBUser:
         user_id = collection.create_user(username, hashed_password, "standard")
         return cls(db, id=user_id)
 
+    @classmethod
+    def load_many(cls, db: MongoDB, user_ids: list[ObjectId]) -> list["DBUser"]:
+        """
+        Retrieves users in a single query.
+        They are remembered for the rest of the request.
+        """
+
+        users = get_loaders(db).users.load_many(user_ids)
+        db_users = []
+        for user_id, data in zip(user_ids, users):
+            if data is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"User: {user_id} not found.",
+                )
+            db_users.append(cls(db, data=data))
+
+        return db_users
+
     @staticmethod
     def get_id_by_username(db: MongoDB, username: str | None = None) -> ObjectId | None:
         """
@@ -204,3 +225,14 @@ class DBUser:
         users = db.get_all_users()
         db_users = [DBUser(db, data=user) for user in users]
         return [db_user.to_schema() for db_user in db_users]
+
+    def _clear_loaders(self) -> None:
+        """
+        Forgets the loaded user, also as the owner of each of its bots.
+        Called after reloading the user, so that its current bots are known.
+        """
+
+        loaders = get_loaders(self._db)
+        loaders.users.clear(self.id)
+        for bot_id in self.bots:
+            loaders.owners.clear(bot_id)
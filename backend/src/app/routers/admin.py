@@ -2,12 +2,15 @@ from fastapi import APIRouter, Form
 from pyobjectID import PyObjectId
 
 from app.schemas.game_type import GameType, GameTypeCreate
-from app.utils.database import get_db_connection
+from app.utils.database import get_db_connection, monitor
 from app.models.tournament import DBTournament
 from app.schemas.user import User, UserUpdate
 from app.schemas.tournament import Tournament
 from app.dependencies import AdminDependency
 from app.models.game_type import DBGameType
+from database.indexes import verify_indexes
+from app.schemas.index import IndexReport
+from app.schemas.pool import PoolStats
 from app.models.user import DBUser
 from app.models.bot import DBBot
 from app.schemas.bot import Bot
@@ -96,3 +99,16 @@ def create_game_type(
         new_game = db_game.to_schema()
 
     return new_game
+
+
+@router.get("/database/pool/", response_model=PoolStats)
+async def read_database_pool(current_admin: AdminDependency):
+    return monitor.get_stats()
+
+
+@router.get("/database/indexes/", response_model=IndexReport)
+async def read_database_indexes(current_admin: AdminDependency):
+    with get_db_connection() as db:
+        report = IndexReport(**verify_indexes(db))
+
+    return report
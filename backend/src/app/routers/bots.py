@@ -31,7 +31,9 @@ async def create_bot(
     code: UploadFile = File(...),
 ):
     with get_db_connection() as db:
-        db_bot = DBBot.insert(db, current_user, name, game_type_id, code.file.read())
+        db_bot = await DBBot.insert(
+            db, current_user, name, game_type_id, code.file.read()
+        )
         new_bot = db_bot.to_schema(detail=True)
 
     return new_bot
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, status
+from pyobjectID import PyObjectId
+
+from app.utils.database import get_db_connection
+from app.models.tournament import DBTournament
+from app.dependencies import UserDependency
+from app.models.job import DBJob
+from app.schemas.job import Job
+
+router = APIRouter(prefix="/jobs")
+
+
+@router.get("/{job_id}/", response_model=Job)
+async def read_job_by_id(
+    current_user: UserDependency,
+    job_id: PyObjectId,
+):
+    with get_db_connection() as db:
+        db_job = DBJob(db, id=job_id)
+        db_tournament = DBTournament(db, id=db_job.tournament_id)
+        if not db_tournament.check_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job: {job_id} not found.",
+            )
+
+        job = db_job.to_schema()
+
+    return job
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, status, Query
 from pyobjectID import PyObjectId
+from typing import Any
 
 from app.dependencies import UserDependency, PremiumDependency
 from app.utils.database import get_db_connection
 from app.schemas.match import Match, MatchCreate
 from app.models.tournament import DBTournament
 from app.models.match import DBMatch
+from app.schemas.job import Job, JobKind
 from app.schemas.bot import Bot
+from app.utils import jobs
 
 
 router = APIRouter(prefix="/tournaments/{tournament_id}/matches")
@@ -102,9 +105,59 @@ async def read_bots_by_match_id(
     return bots
 
 
+@router.get(
+    "/{match_id}/states/",
+    response_model=list[str],
+)
+async def read_states_by_match_id(
+    current_user: UserDependency,
+    tournament_id: PyObjectId,
+    match_id: PyObjectId,
+    ply: int | None = None,
+):
+    with get_db_connection() as db:
+        db_tournament = DBTournament(db, id=tournament_id)
+        if not db_tournament.check_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tournament: {tournament_id} not found.",
+            )
+
+        db_match = DBMatch(db, id=match_id)
+        states = await db_match.get_states(ply)
+
+    return states
+
+
+@router.get(
+    "/{match_id}/moves/",
+    response_model=list[Any],
+)
+async def read_moves_by_match_id(
+    current_user: UserDependency,
+    tournament_id: PyObjectId,
+    match_id: PyObjectId,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    with get_db_connection() as db:
+        db_tournament = DBTournament(db, id=tournament_id)
+        if not db_tournament.check_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tournament: {tournament_id} not found.",
+            )
+
+        db_match = DBMatch(db, id=match_id)
+        moves = db_match.get_moves(offset, limit)
+
+    return moves
+
+
 @router.put(
     "/{match_id}/run/",
-    response_model=dict[str, Bot],
+    response_model=Job,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def run_match(
     current_user: UserDependency,
@@ -119,7 +172,13 @@ async def run_match(
                 detail=f"User does not have access to run match: {match_id}.",
             )
 
-        db_match = DBMatch(db, id=match_id)
-        result = db_match.run()
+        if match_id not in db_tournament.matches:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Match: {match_id} not found.",
+            )
+
+        db_job = jobs.enqueue(db, JobKind.MATCH, tournament_id, match_id)
+        job = db_job.to_schema()
 
-    return result
+    return job
@@ -1,13 +1,20 @@
 from fastapi import APIRouter, HTTPException, status, Form
 from pyobjectID import PyObjectId
 
-from app.schemas.tournament import Tournament, TournamentCreate, TournamentUpdate
+from app.schemas.tournament import (
+    Standing,
+    Tournament,
+    TournamentCreate,
+    TournamentUpdate,
+)
 from app.dependencies import UserDependency, PremiumDependency
 from app.utils.database import get_db_connection
+from app.schemas.job import Job, JobKind, JobProgress
 from app.models.tournament import DBTournament
-from app.schemas.match import Match
 from app.models.user import DBUser
+from app.models.job import DBJob
 from app.schemas.bot import Bot
+from app.utils import jobs
 
 
 router = APIRouter(prefix="/tournaments")
@@ -180,7 +187,11 @@ async def remove_bot_from_tournament(
     return bots
 
 
-@router.put("/{tournament_id}/run", response_model=list[Match])
+@router.put(
+    "/{tournament_id}/run",
+    response_model=Job,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def run_tournament(
     current_premium_user: PremiumDependency,
     tournament_id: PyObjectId,
@@ -193,7 +204,62 @@ async def run_tournament(
                 detail=f"Tournament: {tournament_id} not found.",
             )
 
-        db_tournament.run()
-        matches = db_tournament.get_matches()
+        db_tournament.prepare_run()
+        db_job = jobs.enqueue(db, JobKind.TOURNAMENT, tournament_id)
+        job = db_job.to_schema()
+
+    return job
+
+
+@router.get("/{tournament_id}/standings/", response_model=list[Standing])
+async def read_standings_by_tournament_id(
+    current_user: UserDependency,
+    tournament_id: PyObjectId,
+):
+    with get_db_connection() as db:
+        db_tournament = DBTournament(db, id=tournament_id)
+        if not db_tournament.check_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tournament: {tournament_id} not found.",
+            )
+
+        standings = db_tournament.get_standings()
+
+    return standings
+
+
+@router.get("/{tournament_id}/jobs/", response_model=list[Job])
+async def read_jobs_by_tournament_id(
+    current_user: UserDependency,
+    tournament_id: PyObjectId,
+):
+    with get_db_connection() as db:
+        db_tournament = DBTournament(db, id=tournament_id)
+        if not db_tournament.check_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tournament: {tournament_id} not found.",
+            )
+
+        tournament_jobs = DBJob.get_by_tournament(db, tournament_id)
+
+    return tournament_jobs
+
+
+@router.get("/{tournament_id}/progress/", response_model=JobProgress)
+async def read_progress_by_tournament_id(
+    current_user: UserDependency,
+    tournament_id: PyObjectId,
+):
+    with get_db_connection() as db:
+        db_tournament = DBTournament(db, id=tournament_id)
+        if not db_tournament.check_access(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tournament: {tournament_id} not found.",
+            )
+
+        progress = DBJob.get_progress(db, tournament_id)
 
-    return matches
+    return progress
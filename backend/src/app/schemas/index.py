@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class IndexReport(BaseModel):
+    """Represents the state of the database indexes, as "collection.index" names"""
+
+    missing: list[str]
+    unexpected: list[str]
+    unused: list[str]
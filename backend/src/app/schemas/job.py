@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field
+from pyobjectID import PyObjectId
+from datetime import datetime
+from typing import Any
+from enum import Enum
+
+BaseModel.model_config["json_encoders"] = {PyObjectId: lambda v: str(v)}
+
+
+class JobKind(str, Enum):
+    """Represents the kind of work done by a job"""
+
+    MATCH = "match"
+    TOURNAMENT = "tournament"
+
+
+class JobStatus(str, Enum):
+    """Represents the status of a job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """Represents a background job"""
+
+    id: PyObjectId = Field(alias="_id")
+    kind: JobKind
+    status: JobStatus
+    tournament_id: PyObjectId
+    match_id: PyObjectId | None = None
+    attempts: int
+    progress: float
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class JobProgress(BaseModel):
+    """Represents the progress of the jobs of a tournament"""
+
+    total: int
+    queued: int
+    running: int
+    done: int
+    failed: int
+    progress: float
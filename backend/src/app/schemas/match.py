@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import Any
 from pyobjectID import PyObjectId
 
 from app.schemas.bot import Bot
@@ -13,7 +14,9 @@ class Match(BaseModel):
     id: PyObjectId = Field(alias="_id")
     game_num: int
     players: tuple[Bot, Bot]
-    moves: list[str] | None = None
+    seed: int | None = None
+    n_moves: int = 0
+    moves: list[Any] | None = None
     winner: Bot | None = None
 
 
@@ -22,3 +25,4 @@ class MatchCreate(BaseModel):
 
     game_num: int
     players: list[PyObjectId] = Field(min_length=2, max_length=2)
+    seed: int | None = Field(ge=0, default=None)
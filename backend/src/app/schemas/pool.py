@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    """Represents the state of the database connection pool"""
+
+    max_size: int
+    open: int
+    in_use: int
+    checkouts: int
+    checkout_failures: int
+    cleared: int
+    wait_avg_sec: float
+    wait_p50_sec: float
+    wait_p99_sec: float
+    wait_max_sec: float
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from pyobjectID import PyObjectId
 from datetime import datetime
+from enum import Enum
 
 from app.schemas.game_type import GameType
 from app.schemas.user import User
@@ -10,6 +11,14 @@ from app.schemas.bot import Bot
 BaseModel.model_config["json_encoders"] = {PyObjectId: lambda v: str(v)}
 
 
+class TournamentFormat(str, Enum):
+    """Represents the format of a tournament"""
+
+    SINGLE_ELIMINATION = "single_elimination"
+    ROUND_ROBIN = "round_robin"
+    SWISS = "swiss"
+
+
 class Tournament(BaseModel):
     """Represents a tournament"""
 
@@ -21,6 +30,9 @@ class Tournament(BaseModel):
     start_date: datetime
     access_code: str
     max_participants: int
+    format: TournamentFormat = TournamentFormat.SINGLE_ELIMINATION
+    rounds: int | None = None
+    seed: int | None = None
     winner: Bot | None = None
 
 
@@ -32,6 +44,9 @@ class TournamentCreate(BaseModel):
     game_type_id: PyObjectId
     start_date: datetime = Field(gt=datetime.now())
     max_participants: int = Field(ge=2)
+    format: TournamentFormat = TournamentFormat.SINGLE_ELIMINATION
+    rounds: int | None = Field(ge=1, default=None)
+    seed: int | None = Field(ge=0, default=None)
 
 
 class TournamentUpdate(BaseModel):
@@ -41,3 +56,14 @@ class TournamentUpdate(BaseModel):
     description: str | None = Field(max_length=128, default=None)
     start_date: datetime | None = Field(gt=datetime.now(), default=None)
     max_participants: int | None = Field(ge=2, default=None)
+
+
+class Standing(BaseModel):
+    """Represents the results of a bot in a tournament"""
+
+    bot_id: PyObjectId
+    played: int = 0
+    wins: int = 0
+    losses: int = 0
+    byes: int = 0
+    points: int = 0
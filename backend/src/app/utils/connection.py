@@ -1,11 +1,107 @@
 from fastapi import HTTPException, status
 from typing import Any
-import requests
+import asyncio
+import httpx
 
 from app.config import settings
 
 
-def validate_bot(game_name: str, code: bytes) -> bool:
+# responses of a bot_env that is restarting or overloaded, worth trying again
+RETRY_STATUS_CODES = {502, 503, 504}
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_override: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Returns the client shared by all requests to bot_env.
+    Connections are kept alive and reused, at most BOT_ENV_MAX_CONNECTIONS are open
+    at a time and further requests wait for a free one instead of failing.
+    """
+
+    global _client, _client_loop
+
+    if _override is not None:
+        return _override
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=settings.BOT_ENV,
+            limits=httpx.Limits(
+                max_connections=settings.BOT_ENV_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.BOT_ENV_MAX_CONNECTIONS,
+                keepalive_expiry=settings.BOT_ENV_KEEPALIVE_SEC,
+            ),
+            timeout=httpx.Timeout(
+                settings.BOT_ENV_TIMEOUT_SEC,
+                connect=settings.BOT_ENV_CONNECT_TIMEOUT_SEC,
+                pool=None,
+            ),
+        )
+        _client_loop = loop
+
+    return _client
+
+
+def set_client(client: httpx.AsyncClient | None) -> None:
+    """
+    Makes all requests to bot_env go through the given client, e.g. one mounted on
+    a stand-in app in tests. None restores the shared client.
+    """
+
+    global _override
+    _override = client
+
+
+async def close_client() -> None:
+    """
+    Closes the connections of the shared client.
+    """
+
+    global _client, _client_loop
+
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def _post(path: str, **kwargs: Any) -> httpx.Response:
+    """
+    Sends a request to bot_env.
+    Retries with exponential backoff when bot_env cannot be reached or is unavailable,
+    raises an HTTPException if it still is after BOT_ENV_RETRIES retries.
+    """
+
+    client = get_client()
+
+    for attempt in range(settings.BOT_ENV_RETRIES + 1):
+        if attempt > 0:
+            await asyncio.sleep(settings.BOT_ENV_BACKOFF_SEC * 2 ** (attempt - 1))
+
+        try:
+            response = await client.post(path, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+            continue
+        except httpx.TimeoutException:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Bot environment did not respond in time.",
+            )
+
+        if response.status_code not in RETRY_STATUS_CODES:
+            return response
+
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Bot environment is unavailable.",
+    )
+
+
+async def validate_bot(game_name: str, code: bytes) -> bool:
     """
     Validates a bot for a specific game.
     Returns True if the bot is valid, otherwise raises an HTTPException with error details.
@@ -13,8 +109,7 @@ def validate_bot(game_name: str, code: bytes) -> bool:
 
     files = {"file": code}
     data = {"game": game_name}
-    url = settings.BOT_ENV + "validate"
-    response = requests.post(url, data=data, files=files)
+    response = await _post("validate", data=data, files=files)
 
     if response.status_code == 200:
         response_data = response.json()
@@ -35,16 +130,21 @@ def validate_bot(game_name: str, code: bytes) -> bool:
         )
 
 
-def run_match(game_name: str, bot1_code: bytes, bot2_code: bytes) -> dict[str, Any]:
+async def run_match(
+    game_name: str, bot1_code: bytes, bot2_code: bytes, seed: int | None = None
+) -> dict[str, Any]:
     """
     Runs a match between two bots for a specific game.
-    Returns the match result as a dictionary.
+    The same bots with the same seed always play the same match, without a seed
+    bot_env draws one.
+    Returns the match result as a dictionary, with the seed it was played with.
     """
 
     files = {"file1": bot1_code, "file2": bot2_code}
-    data = {"game": game_name}
-    url = settings.BOT_ENV + "run-match"
-    response = requests.post(url, data=data, files=files)
+    data: dict[str, Any] = {"game": game_name}
+    if seed is not None:
+        data["seed"] = seed
+    response = await _post("run-match", data=data, files=files)
 
     if response.status_code == 200:
         result: dict[str, Any] = response.json()
@@ -62,3 +162,32 @@ def run_match(game_name: str, bot1_code: bytes, bot2_code: bytes) -> dict[str, A
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error: {response.status_code}",
         )
+
+
+async def replay_match(
+    game_name: str, moves: list[Any], ply: int | None = None
+) -> list[str]:
+    """
+    Regenerates the states of a match from its moves.
+    Returns the text representations of the states, or only the state after ply moves.
+    """
+
+    data = {"game": game_name, "moves": moves, "ply": ply}
+    response = await _post("replay", json=data)
+
+    if response.status_code == 200:
+        states: list[str] = response.json()["states"]
+
+        return states
+    elif response.status_code == 400:
+        response_data = response.json()
+        error_message = response_data.get("detail", "Unknown error")
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=error_message
+        )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error: {response.status_code}",
+        )
@@ -1,16 +1,195 @@
+from pymongo import MongoClient, monitoring
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator
+from collections import deque
+import threading
+import logging
 
+from database.indexes import ensure_indexes, verify_indexes
+from app.schemas.index import IndexReport
+from app.schemas.pool import PoolStats
 from database.main import MongoDB
 from app.config import settings
 
 
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Counts the connections of the shared client and how long requests wait for one.
+    Only the last WINDOW waits are kept to compute the percentiles.
+    """
+
+    WINDOW = 1000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.open = 0
+        self.in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.cleared = 0
+        self.waits: deque[float] = deque(maxlen=self.WINDOW)
+        self.max_wait = 0.0
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self.cleared += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self.open += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self.open -= 1
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+            self._record_wait(event.duration)
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self._record_wait(event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def get_stats(self) -> PoolStats:
+        """
+        Returns the current state of the pool.
+        """
+
+        with self._lock:
+            waits = sorted(self.waits)
+
+            return PoolStats(
+                max_size=settings.MONGODB_MAX_POOL_SIZE,
+                open=self.open,
+                in_use=self.in_use,
+                checkouts=self.checkouts,
+                checkout_failures=self.checkout_failures,
+                cleared=self.cleared,
+                wait_avg_sec=sum(waits) / len(waits) if waits else 0.0,
+                wait_p50_sec=self._percentile(waits, 0.5),
+                wait_p99_sec=self._percentile(waits, 0.99),
+                wait_max_sec=self.max_wait,
+            )
+
+    def _record_wait(self, duration: float | None) -> None:
+        if duration is not None:
+            self.waits.append(duration)
+            self.max_wait = max(self.max_wait, duration)
+
+    @staticmethod
+    def _percentile(values: list[float], q: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+monitor = PoolMonitor()
+
+_client: MongoClient[dict[str, Any]] | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MongoClient[dict[str, Any]]:
+    """
+    Returns the client shared by the whole process.
+    Its connections are pooled, at most MONGODB_MAX_POOL_SIZE are open at a time and
+    further operations wait up to MONGODB_WAIT_QUEUE_TIMEOUT_SEC for a free one.
+    """
+
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = MongoClient(
+                settings.MONGODB_URI,
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                waitQueueTimeoutMS=int(settings.MONGODB_WAIT_QUEUE_TIMEOUT_SEC * 1000),
+                event_listeners=[monitor],
+            )
+
+    return _client
+
+
+def close_client() -> None:
+    """
+    Closes the connections of the shared client.
+    """
+
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
 @contextmanager
 def get_db_connection(
     connection_string: str = settings.MONGODB_URI,
 ) -> Generator[MongoDB, None, None]:
+    """
+    Yields a handle to the database.
+    Handles to MONGODB_URI share the connections of the process-wide client and are
+    cheap to get, any other database gets a client of its own, closed afterwards.
+    """
+
+    if connection_string == settings.MONGODB_URI:
+        yield MongoDB(client=get_client())
+        return
+
     db = MongoDB(connection_string)
     try:
         yield db
     finally:
         db.client.close()
+
+
+def bootstrap_indexes() -> IndexReport:
+    """
+    Creates the missing indexes of the database and reports the state of all of them.
+    Indexes that cannot be created are logged instead of stopping the startup.
+    """
+
+    with get_db_connection() as db:
+        for index, error in ensure_indexes(db).items():
+            logger.error("Could not create index %s: %s", index, error)
+        report = IndexReport(**verify_indexes(db))
+
+    if report.missing:
+        logger.warning("Missing indexes: %s", ", ".join(report.missing))
+    if report.unexpected:
+        logger.info("Indexes not created by the app: %s", ", ".join(report.unexpected))
+
+    return report
@@ -0,0 +1,164 @@
+from fastapi import HTTPException
+from typing import Any, Awaitable, Callable, ContextManager
+from bson import ObjectId
+import logging
+import asyncio
+import uuid
+
+from database.main import MongoDB, Job as JobCollection
+from app.utils.database import get_db_connection
+from app.schemas.job import JobKind
+from app.models.job import DBJob
+from app.config import settings
+import app.models.tournament as T
+import app.models.match as M
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[MongoDB, dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+async def run_match_job(db: MongoDB, job: dict[str, Any]) -> dict[str, Any]:
+    """
+    Runs the match of the job, unless an earlier attempt already recorded its result.
+    """
+
+    db_match = M.DBMatch(db, id=job["match_id"])
+    if db_match.winner is None:
+        await db_match.run()
+        db_match = M.DBMatch(db, id=job["match_id"])
+
+    return {"winner": str(db_match.winner)}
+
+
+async def run_tournament_job(db: MongoDB, job: dict[str, Any]) -> dict[str, Any]:
+    """
+    Plays the bracket of the tournament of the job, resuming where an earlier
+    attempt stopped.
+    """
+
+    collection = JobCollection(db)
+
+    def on_progress(progress: float) -> None:
+        collection.set_progress(job["_id"], job["worker"], progress)
+
+    db_tournament = T.DBTournament(db, id=job["tournament_id"])
+    winner = await db_tournament.run(on_progress)
+
+    return {"winner": str(winner)}
+
+
+HANDLERS: dict[str, Handler] = {
+    JobKind.MATCH.value: run_match_job,
+    JobKind.TOURNAMENT.value: run_tournament_job,
+}
+
+
+class JobWorkers:
+    """
+    Pool of async workers running the jobs queued in the database.
+
+    A worker claims a job atomically and renews its lease while running it. If the
+    process dies, the lease expires and another worker takes the job again, up to
+    JOB_MAX_ATTEMPTS times, so handlers must be safe to run more than once.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.JOB_WORKERS,
+        connect: Callable[[], ContextManager[MongoDB]] = get_db_connection,
+    ) -> None:
+        self.size = size
+        self.connect = connect
+        self.name = uuid.uuid4().hex
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._work(f"{self.name}-{i}"))
+            for i in range(self.size)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """
+        Wakes up the idle workers, so a new job does not wait for the next poll.
+        """
+
+        self._wakeup.set()
+
+    async def run_next(self, worker: str) -> bool:
+        """
+        Claims and runs a single job.
+        Returns False if there was no job to run.
+        """
+
+        with self.connect() as db:
+            collection = JobCollection(db)
+            collection.fail_expired_jobs(settings.JOB_MAX_ATTEMPTS)
+            job = collection.claim_job(
+                worker, settings.JOB_LEASE_SEC, settings.JOB_MAX_ATTEMPTS
+            )
+            if job is None:
+                return False
+
+            heartbeat = asyncio.create_task(self._heartbeat(db, job["_id"], worker))
+            try:
+                result = await HANDLERS[job["kind"]](db, job)
+            except Exception as e:
+                error = str(e.detail) if isinstance(e, HTTPException) else str(e)
+                collection.fail_job(
+                    job["_id"], worker, error, settings.JOB_MAX_ATTEMPTS
+                )
+            else:
+                collection.complete_job(job["_id"], worker, result)
+            finally:
+                heartbeat.cancel()
+
+        return True
+
+    async def _work(self, worker: str) -> None:
+        while True:
+            try:
+                if await self.run_next(worker):
+                    continue
+            except Exception:
+                logger.exception("Job worker %s failed to run a job", worker)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.JOB_POLL_SEC)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _heartbeat(self, db: MongoDB, job_id: ObjectId, worker: str) -> None:
+        collection = JobCollection(db)
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SEC / 3)
+            collection.renew_lease(job_id, worker, settings.JOB_LEASE_SEC)
+
+
+workers = JobWorkers()
+
+
+def enqueue(
+    db: MongoDB,
+    kind: JobKind,
+    tournament_id: ObjectId,
+    match_id: ObjectId | None = None,
+) -> DBJob:
+    """
+    Queues a job and wakes up the workers.
+    Returns the job, or the one already queued or running for the same work.
+    """
+
+    db_job = DBJob.insert(db, kind, tournament_id, match_id)
+    workers.notify()
+
+    return db_job
@@ -0,0 +1,127 @@
+from typing import Any, Callable, Generic, Hashable, Iterable, TypeVar
+from weakref import WeakKeyDictionary
+from bson import ObjectId
+
+from database.main import (
+    GameType as GameTypeCollection,
+    User as UserCollection,
+    Bot as BotCollection,
+    MongoDB,
+)
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class Loader(Generic[K, V]):
+    """
+    Loads values by key in batches and remembers them, so that every key is fetched
+    at most once.
+    """
+
+    def __init__(self, fetch: Callable[[list[K]], dict[K, V]]) -> None:
+        self._fetch = fetch
+        self._cache: dict[K, V | None] = {}
+
+    def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        """
+        Returns the values of the keys, None for the ones that do not exist.
+        The keys not loaded yet are fetched together.
+        """
+
+        keys = list(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in self._cache]
+        if missing:
+            found = self._fetch(missing)
+            for key in missing:
+                self._cache[key] = found.get(key)
+
+        return [self._cache[key] for key in keys]
+
+    def load(self, key: K) -> V | None:
+        """
+        Returns the value of the key, None if it does not exist.
+        """
+
+        return self.load_many([key])[0]
+
+    def prime(self, key: K, value: V) -> None:
+        """
+        Remembers a value fetched some other way.
+        """
+
+        self._cache[key] = value
+
+    def clear(self, key: K) -> None:
+        """
+        Forgets the value of the key, so that it is fetched again.
+        """
+
+        self._cache.pop(key, None)
+
+
+class Loaders:
+    """
+    Loaders of the documents the schemas are built from.
+
+    Attributes:
+    ---
+    bots : Loader[ObjectId, dict[str, Any]]
+        The bots by their identifiers.
+    owners : Loader[ObjectId, dict[str, Any]]
+        The users by the identifiers of the bots they own.
+    users : Loader[ObjectId, dict[str, Any]]
+        The users by their identifiers.
+    game_types : Loader[ObjectId, dict[str, Any]]
+        The game types by their identifiers.
+    """
+
+    def __init__(self, db: MongoDB) -> None:
+        bots = BotCollection(db)
+        users = UserCollection(db)
+        game_types = GameTypeCollection(db)
+
+        self.bots: Loader[ObjectId, dict[str, Any]] = Loader(
+            lambda ids: _by_id(bots.get_bots_by_ids(ids))
+        )
+        self.owners: Loader[ObjectId, dict[str, Any]] = Loader(bots.get_owners)
+        self.users: Loader[ObjectId, dict[str, Any]] = Loader(
+            lambda ids: _by_id(users.get_users_by_ids(ids))
+        )
+        self.game_types: Loader[ObjectId, dict[str, Any]] = Loader(
+            lambda ids: _by_id(game_types.get_game_types_by_ids(ids))
+        )
+
+    def prefetch_bots(self, bot_ids: Iterable[ObjectId]) -> None:
+        """
+        Loads the bots together with their owners and game types, in three queries.
+        """
+
+        bot_ids = list(bot_ids)
+        bots = self.bots.load_many(bot_ids)
+        for owner in self.owners.load_many(bot_ids):
+            if owner is not None:
+                self.users.prime(owner["_id"], owner)
+        self.game_types.load_many(bot["game_type"] for bot in bots if bot is not None)
+
+
+def _by_id(documents: list[dict[str, Any]]) -> dict[ObjectId, dict[str, Any]]:
+    return {document["_id"]: document for document in documents}
+
+
+_loaders: WeakKeyDictionary[MongoDB, Loaders] = WeakKeyDictionary()
+
+
+def get_loaders(db: MongoDB) -> Loaders:
+    """
+    Returns the loaders of a database handle.
+    A handle is got for every request, so the loaded documents are remembered for the
+    request and never go stale across requests.
+    """
+
+    loaders = _loaders.get(db)
+    if loaders is None:
+        loaders = _loaders[db] = Loaders(db)
+
+    return loaders
@@ -0,0 +1,61 @@
+from typing import Any
+import hashlib
+import random
+
+from database.main import MongoDB, MatchResult
+import app.utils.connection as conn
+
+
+# seeds are drawn from the range bot_env seeds all the generators of the bots with
+MAX_SEED = 2**32 - 1
+
+
+def new_seed() -> int:
+    """
+    Draws a fresh seed.
+    """
+
+    return random.SystemRandom().randint(0, MAX_SEED)
+
+
+def derive_seed(seed: int, n: int) -> int:
+    """
+    Returns the seed of the n-th match played under the given seed.
+    """
+
+    return random.Random(f"{seed}:{n}").randint(0, MAX_SEED)
+
+
+def get_result_key(
+    game_name: str, bot0_code: bytes, bot1_code: bytes, seed: int
+) -> str:
+    """
+    Returns the key of the result of a match.
+    A match of the same bots in the same game with the same seed always plays out the
+    same, so its result is stored under the same key.
+    """
+
+    hashes = [hashlib.sha256(code).hexdigest() for code in (bot0_code, bot1_code)]
+    return ":".join([game_name, *hashes, str(seed)])
+
+
+async def run_match(
+    db: MongoDB, game_name: str, bot0_code: bytes, bot1_code: bytes, seed: int
+) -> dict[str, Any]:
+    """
+    Returns the result of a match, running it on bot_env only if it was not played yet.
+    Forfeits depend on how loaded bot_env was, so their results are not stored.
+    """
+
+    collection = MatchResult(db)
+    key = get_result_key(game_name, bot0_code, bot1_code, seed)
+
+    cached = collection.get_result(key)
+    if cached is not None:
+        return cached
+
+    result = await conn.run_match(game_name, bot0_code, bot1_code, seed)
+    if result.get("forfeit") is None:
+        collection.save_result(key, result["winner"], result["moves"], seed)
+
+    return result
@@ -0,0 +1,82 @@
+from typing import Awaitable, Callable, Hashable, Sequence, TypeVar
+import asyncio
+
+
+T = TypeVar("T", bound=Hashable)
+P = TypeVar("P")
+R = TypeVar("R")
+
+
+def round_robin_rounds(bots: Sequence[T]) -> list[list[tuple[T, T]]]:
+    """
+    Pairs every bot with every other bot once, using the circle method.
+    Returns the rounds, in each round every bot plays at most one match.
+    With an odd number of bots, a different bot sits out every round.
+    """
+
+    circle: list[T | None] = list(bots)
+    if len(circle) % 2 == 1:
+        circle.append(None)
+
+    n = len(circle)
+    rounds = []
+    for _ in range(n - 1):
+        pairings = []
+        for i in range(n // 2):
+            bot_0, bot_1 = circle[i], circle[n - 1 - i]
+            if bot_0 is not None and bot_1 is not None:
+                pairings.append((bot_0, bot_1))
+        rounds.append(pairings)
+        circle = [circle[0], circle[-1], *circle[1:-1]]
+
+    return rounds
+
+
+def swiss_pairings(
+    ranking: Sequence[T], played: set[frozenset[T]], byes: set[T]
+) -> tuple[list[tuple[T, T]], T | None]:
+    """
+    Pairs bots with the closest bots in the ranking they have not played yet.
+    Returns the pairings and the bot that gets a bye, the lowest ranked one that has
+    not had one, if the number of bots is odd. Rematches are allowed only when a bot
+    has already played all the others still unpaired.
+    """
+
+    unpaired = list(ranking)
+    bye = None
+    if len(unpaired) % 2 == 1:
+        bye = next((bot for bot in reversed(unpaired) if bot not in byes), unpaired[-1])
+        unpaired.remove(bye)
+
+    pairings = []
+    while unpaired:
+        bot_0 = unpaired.pop(0)
+        opponent = next(
+            (bot for bot in unpaired if frozenset((bot_0, bot)) not in played),
+            unpaired[0],
+        )
+        unpaired.remove(opponent)
+        pairings.append((bot_0, opponent))
+
+    return pairings, bye
+
+
+async def run_pairings(
+    pairings: Sequence[P],
+    play: Callable[[P], Awaitable[R]],
+    capacity: int,
+) -> list[R]:
+    """
+    Plays independent pairings concurrently, keeping at most capacity of them
+    running. A pairing starts as soon as another one finishes, so the slots are not
+    left idle while waiting for the slowest match of a batch.
+    Returns the results in the order of the pairings.
+    """
+
+    semaphore = asyncio.Semaphore(capacity)
+
+    async def play_limited(pairing: P) -> R:
+        async with semaphore:
+            return await play(pairing)
+
+    return await asyncio.gather(*(play_limited(pairing) for pairing in pairings))
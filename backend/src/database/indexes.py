@@ -0,0 +1,111 @@
+from pymongo.errors import OperationFailure
+from pymongo import ASCENDING, IndexModel
+from typing import Dict, List
+
+from database.main import MongoDB
+
+
+# indexes of the fields the queries in database.main filter and sort on, by collection
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username", unique=True),
+        IndexModel([("bots", ASCENDING)], name="bots"),
+    ],
+    "bots": [
+        IndexModel([("game_type", ASCENDING)], name="game_type"),
+    ],
+    "game_types": [
+        IndexModel([("name", ASCENDING)], name="name"),
+    ],
+    "tournaments": [
+        IndexModel([("access_code", ASCENDING)], name="access_code", unique=True),
+        IndexModel([("participants", ASCENDING)], name="participants"),
+        IndexModel([("creator", ASCENDING)], name="creator"),
+        IndexModel([("winner", ASCENDING)], name="winner"),
+        IndexModel([("matches", ASCENDING)], name="matches"),
+        IndexModel([("game_type", ASCENDING)], name="game_type"),
+        IndexModel([("start_date", ASCENDING)], name="start_date"),
+    ],
+    "matches": [
+        IndexModel([("players.0", ASCENDING)], name="players_0"),
+        IndexModel([("players.1", ASCENDING)], name="players_1"),
+        IndexModel([("winner", ASCENDING)], name="winner"),
+    ],
+    "match_moves": [
+        IndexModel(
+            [("match_id", ASCENDING), ("chunk", ASCENDING)],
+            name="match_id_chunk",
+            unique=True,
+        ),
+    ],
+    "jobs": [
+        IndexModel(
+            [("status", ASCENDING), ("created_at", ASCENDING)],
+            name="status_created_at",
+        ),
+        IndexModel(
+            [("tournament_id", ASCENDING), ("created_at", ASCENDING)],
+            name="tournament_id_created_at",
+        ),
+        # set only on queued and running jobs, so one job per work can be active
+        IndexModel(
+            [("active_key", ASCENDING)],
+            name="active_key",
+            unique=True,
+            partialFilterExpression={"active_key": {"$exists": True}},
+        ),
+    ],
+}
+
+
+def ensure_indexes(db: MongoDB) -> Dict[str, str]:
+    """
+    Creates the missing indexes, existing ones are left as they are.
+    Returns the errors of the indexes that could not be created, e.g. a unique index
+    over duplicate values, by "collection.index".
+    """
+    errors = {}
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                db.db[collection].create_indexes([index])
+            except OperationFailure as e:
+                errors[f"{collection}.{name}"] = str(e)
+    return errors
+
+
+def verify_indexes(db: MongoDB) -> Dict[str, List[str]]:
+    """
+    Compares the indexes of the database with INDEXES.
+    Returns the names of the missing indexes, of the ones not in INDEXES and of the
+    ones not used since the server started, as "collection.index".
+    """
+    report: Dict[str, List[str]] = {"missing": [], "unexpected": [], "unused": []}
+    for collection, indexes in INDEXES.items():
+        expected = {index.document["name"] for index in indexes}
+        existing = set(db.db[collection].index_information()) - {"_id_"}
+
+        report["missing"] += [
+            f"{collection}.{name}" for name in sorted(expected - existing)
+        ]
+        report["unexpected"] += [
+            f"{collection}.{name}" for name in sorted(existing - expected)
+        ]
+        report["unused"] += [
+            f"{collection}.{name}" for name in _get_unused(db, collection)
+        ]
+    return report
+
+
+def _get_unused(db: MongoDB, collection: str) -> List[str]:
+    """Usage statistics are not available on every deployment, then none are reported"""
+    try:
+        stats = list(db.db[collection].aggregate([{"$indexStats": {}}]))
+    except (OperationFailure, NotImplementedError):
+        return []
+    return sorted(
+        stat["name"]
+        for stat in stats
+        if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0
+    )
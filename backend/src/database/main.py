@@ -1,12 +1,42 @@
-from typing import List, Dict, Optional
-from datetime import datetime
-from pymongo import MongoClient
+from typing import Any, Iterator, List, Dict, Optional
+from pymongo import MongoClient, ReturnDocument
+from pymongo.client_session import ClientSession
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta
+from contextlib import contextmanager
 from bson import ObjectId
 
 
+# deployments that support multi-document transactions
+TRANSACTION_TOPOLOGIES = {"ReplicaSetWithPrimary", "Sharded", "LoadBalanced"}
+
+
+@contextmanager
+def transaction(client: Any) -> Iterator[Optional[ClientSession]]:
+    """
+    Yields a session with a started transaction, committed when the block ends.
+    Yields None on a standalone server, where the writes are done one by one.
+    """
+    if (
+        not isinstance(client, MongoClient)
+        or client.topology_description.topology_type_name
+        not in TRANSACTION_TOPOLOGIES
+    ):
+        yield None
+        return
+
+    with client.start_session() as session, session.start_transaction():
+        yield session
+
+
 class MongoDB:
-    def __init__(self, connection_string: str = "mongodb://localhost:27017/"):
-        self.client = MongoClient(connection_string)
+    def __init__(
+        self,
+        connection_string: str = "mongodb://localhost:27017/",
+        client: Optional[MongoClient[Dict[str, Any]]] = None,
+    ):
+        # a handle on a given client shares its connection pool
+        self.client = client if client is not None else MongoClient(connection_string)
         self.db = self.client.gry_boty_database
 
     def get_all_users(self) -> List[Dict]:
@@ -59,6 +89,9 @@ class User:
     def get_user_by_id(self, user_id: ObjectId) -> Optional[Dict]:
         return self.collection.find_one({"_id": user_id})
 
+    def get_users_by_ids(self, user_ids: List[ObjectId]) -> List[Dict]:
+        return list(self.collection.find({"_id": {"$in": user_ids}}))
+
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         return self.collection.find_one({"username": username})
 
@@ -104,6 +137,9 @@ class Bot:
     def get_bot_by_id(self, bot_id: ObjectId) -> Optional[Dict]:
         return self.collection.find_one({"_id": bot_id})
 
+    def get_bots_by_ids(self, bot_ids: List[ObjectId]) -> List[Dict]:
+        return list(self.collection.find({"_id": {"$in": bot_ids}}))
+
     def get_bots_by_game_type(self, game_type_id: ObjectId) -> List[Dict]:
         return list(self.collection.find({"game_type": game_type_id}))
 
@@ -128,6 +164,13 @@ class Bot:
     def get_owner(self, bot_id: ObjectId) -> Optional[Dict]:
         return self.users_collection.find_one({"bots": bot_id})
 
+    def get_owners(self, bot_ids: List[ObjectId]) -> Dict[ObjectId, Dict]:
+        owners = {}
+        for user in self.users_collection.find({"bots": {"$in": bot_ids}}):
+            for bot_id in user["bots"]:
+                owners[bot_id] = user
+        return {bot_id: owners[bot_id] for bot_id in bot_ids if bot_id in owners}
+
     def delete_bot(self, bot_id: ObjectId) -> bool:
         bot = self.get_bot_by_id(bot_id)
         if not bot:
@@ -157,6 +200,7 @@ class Bot:
         self.db.matches.delete_many(
             {"$or": [{"players.0": bot_id}, {"players.1": bot_id}]}
         )
+        self.db.match_moves.delete_many({"match_id": {"$in": match_ids}})
 
         self.collection.delete_one({"_id": bot_id})
 
@@ -179,6 +223,9 @@ class GameType:
     def get_game_type_by_id(self, game_type_id: ObjectId) -> Optional[Dict]:
         return self.collection.find_one({"_id": game_type_id})
 
+    def get_game_types_by_ids(self, game_type_ids: List[ObjectId]) -> List[Dict]:
+        return list(self.collection.find({"_id": {"$in": game_type_ids}}))
+
     def get_game_type_by_name(self, name: str) -> Optional[Dict]:
         return self.collection.find_one({"name": name})
 
@@ -200,6 +247,9 @@ class Tournament:
         start_date: datetime,
         access_code: str,
         max_participants: int,
+        format: str = "single_elimination",
+        rounds: Optional[int] = None,
+        seed: Optional[int] = None,
     ) -> ObjectId:
         tournament_data = {
             "name": name,
@@ -209,8 +259,14 @@ class Tournament:
             "start_date": start_date,
             "access_code": access_code,
             "max_participants": max_participants,
+            "format": format,
+            "rounds": rounds,
+            "seed": seed,
             "participants": [],
+            "bracket": [],
             "matches": [],
+            "standings": {},
+            "scored": [],
             "winner": None,
         }
         result = self.collection.insert_one(tournament_data)
@@ -247,6 +303,42 @@ class Tournament:
             {"_id": tournament_id}, {"$set": {"start_date": new_start_date}}
         )
 
+    def start_tournament(
+        self, tournament_id: ObjectId, bracket: List[ObjectId], start_date: datetime
+    ) -> bool:
+        result = self.collection.update_one(
+            {"_id": tournament_id, "bracket.0": {"$exists": False}},
+            {"$set": {"bracket": bracket, "start_date": start_date}},
+        )
+        return result.modified_count == 1
+
+    def record_result(
+        self,
+        tournament_id: ObjectId,
+        key: str,
+        winner_id: ObjectId,
+        loser_id: Optional[ObjectId] = None,
+    ) -> bool:
+        """
+        Adds a result to the standings, once per key (a match or a bye).
+        Without a loser, the result is a bye.
+        """
+        if loser_id is None:
+            inc = {f"standings.{winner_id}.byes": 1, f"standings.{winner_id}.points": 1}
+        else:
+            inc = {
+                f"standings.{winner_id}.played": 1,
+                f"standings.{winner_id}.wins": 1,
+                f"standings.{winner_id}.points": 1,
+                f"standings.{loser_id}.played": 1,
+                f"standings.{loser_id}.losses": 1,
+            }
+        result = self.collection.update_one(
+            {"_id": tournament_id, "scored": {"$ne": key}},
+            {"$inc": inc, "$push": {"scored": key}},
+        )
+        return result.modified_count == 1
+
     def update_max_participants(self, tournament_id: ObjectId, new_max: int) -> bool:
         tournament = self.get_tournament_by_id(tournament_id)
         if len(tournament["participants"]) <= new_max:
@@ -311,41 +403,325 @@ class Tournament:
 
 
 class Match:
+    # moves are kept in chunks of their own collection, so that a match document
+    # stays small and is read without its move log
+    MOVES_CHUNK_SIZE = 500
+    WITHOUT_MOVES = {"moves": 0}
+
     def __init__(self, db: MongoDB):
         self.db = db.db
         self.collection = db.db.matches
+        self.moves_collection = db.db.match_moves
 
     def create_match(
-        self, game_num: int, bot1_id: ObjectId, bot2_id: ObjectId
+        self,
+        game_num: int,
+        bot1_id: ObjectId,
+        bot2_id: ObjectId,
+        seed: Optional[int] = None,
     ) -> ObjectId:
         match_data = {
             "game_num": game_num,
             "players": (bot1_id, bot2_id),
-            "moves": [],
+            "seed": seed,
+            "n_moves": 0,
             "winner": None,
         }
         result = self.collection.insert_one(match_data)
         return result.inserted_id
 
-    def add_move(self, match_id: ObjectId, move: str) -> None:
-        self.collection.update_one({"_id": match_id}, {"$push": {"moves": move}})
+    def add_move(self, match_id: ObjectId, move: Any) -> None:
+        match = self.collection.find_one_and_update(
+            {"_id": match_id},
+            {"$inc": {"n_moves": 1}},
+            projection={"n_moves": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if match is None:
+            return
+        chunk = match.get("n_moves", 0) // self.MOVES_CHUNK_SIZE
+        self.moves_collection.update_one(
+            {"match_id": match_id, "chunk": chunk},
+            {"$push": {"moves": move}},
+            upsert=True,
+        )
 
     def set_winner(self, match_id: ObjectId, winner_id: ObjectId) -> None:
         self.collection.update_one({"_id": match_id}, {"$set": {"winner": winner_id}})
 
+    def set_seed(self, match_id: ObjectId, seed: int) -> None:
+        self.collection.update_one({"_id": match_id}, {"$set": {"seed": seed}})
+
+    def save_result(
+        self,
+        match_id: ObjectId,
+        winner_id: ObjectId,
+        loser_id: ObjectId,
+        moves: List[Any],
+        seed: Optional[int] = None,
+    ) -> bool:
+        """
+        Stores the winner of a match in one write and its moves in one write of their
+        chunks, and counts the match in the stats of both bots, in a transaction where
+        the server supports them.
+        Returns False and changes nothing if the match already has a winner.
+        """
+        with transaction(self.db.client) as session:
+            result = self.collection.update_one(
+                {"_id": match_id, "winner": None},
+                {"$set": {"winner": winner_id, "n_moves": len(moves), "seed": seed}},
+                session=session,
+            )
+            if result.modified_count == 0:
+                return False
+
+            self.moves_collection.delete_many({"match_id": match_id}, session=session)
+            size = self.MOVES_CHUNK_SIZE
+            chunks = [
+                {"match_id": match_id, "chunk": i // size, "moves": moves[i:i + size]}
+                for i in range(0, len(moves), size)
+            ]
+            if chunks:
+                self.moves_collection.insert_many(chunks, session=session)
+
+            for bot_id, field in ((winner_id, "wins"), (loser_id, "losses")):
+                self.db.bots.update_one(
+                    {"_id": bot_id},
+                    {"$inc": {"games_played": 1, field: 1}},
+                    session=session,
+                )
+        return True
+
     def get_match_by_id(self, match_id: ObjectId) -> Optional[Dict]:
-        return self.collection.find_one({"_id": match_id})
+        return self.collection.find_one({"_id": match_id}, self.WITHOUT_MOVES)
+
+    def get_matches_by_ids(self, match_ids: List[ObjectId]) -> List[Dict]:
+        return list(
+            self.collection.find({"_id": {"$in": match_ids}}, self.WITHOUT_MOVES)
+        )
 
     def get_matches_by_bot(self, bot_id: ObjectId) -> List[Dict]:
         return list(
             self.collection.find(
-                {"$or": [{"players.0": bot_id}, {"players.1": bot_id}]}
+                {"$or": [{"players.0": bot_id}, {"players.1": bot_id}]},
+                self.WITHOUT_MOVES,
             )
         )
 
-    def get_match_moves(self, match_id: ObjectId) -> List[str]:
-        match = self.get_match_by_id(match_id)
-        return match.get("moves", []) if match else []
+    def get_match_moves(
+        self, match_id: ObjectId, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Any]:
+        """Reads only the chunks holding the moves from offset to offset + limit"""
+        size = self.MOVES_CHUNK_SIZE
+        chunk_range: Dict[str, int] = {"$gte": offset // size}
+        if limit is not None:
+            chunk_range["$lte"] = (offset + limit - 1) // size
+        chunks = list(
+            self.moves_collection.find(
+                {"match_id": match_id, "chunk": chunk_range}
+            ).sort("chunk", 1)
+        )
+
+        if chunks:
+            start = offset - chunks[0]["chunk"] * size
+            moves = [move for chunk in chunks for move in chunk["moves"]]
+        else:
+            # matches played before the move log have their moves inline
+            match = self.collection.find_one({"_id": match_id}, {"moves": 1})
+            start = offset
+            moves = match.get("moves", []) if match else []
+
+        end = start + limit if limit is not None else None
+        return moves[start:end]
 
     def get_matches_by_winner(self, winner_id: ObjectId) -> List[Dict]:
-        return list(self.collection.find({"winner": winner_id}))
+        return list(self.collection.find({"winner": winner_id}, self.WITHOUT_MOVES))
+
+
+class MatchResult:
+    """
+    Results of played matches, keyed by the game, the hashes of the bots' code and
+    the seed, which together decide the whole match.
+    """
+
+    def __init__(self, db: MongoDB):
+        self.db = db.db
+        self.collection = db.db.match_results
+
+    def get_result(self, key: str) -> Optional[Dict]:
+        return self.collection.find_one({"_id": key})
+
+    def save_result(
+        self, key: str, winner: Optional[int], moves: List[Any], seed: int
+    ) -> None:
+        result_data = {
+            "winner": winner,
+            "moves": moves,
+            "seed": seed,
+            "created_at": datetime.now(),
+        }
+        self.collection.update_one({"_id": key}, {"$set": result_data}, upsert=True)
+
+
+class Job:
+    ACTIVE = ["queued", "running"]
+
+    def __init__(self, db: MongoDB):
+        self.db = db.db
+        self.collection = db.db.jobs
+
+    def create_job(
+        self,
+        kind: str,
+        tournament_id: ObjectId,
+        match_id: Optional[ObjectId] = None,
+    ) -> ObjectId:
+        """
+        Returns the active job for the same work if there is one.
+        Only active jobs have an active_key, unique in the collection, so two jobs
+        for the same work cannot be active at once.
+        """
+        active_key = self._get_active_key(kind, tournament_id, match_id)
+        now = datetime.now()
+        update = {
+            "$setOnInsert": {
+                "kind": kind,
+                "tournament_id": tournament_id,
+                "match_id": match_id,
+                "status": "queued",
+                "worker": None,
+                "lease_until": None,
+                "attempts": 0,
+                "progress": 0.0,
+                "result": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+        }
+        try:
+            job = self.collection.find_one_and_update(
+                {"active_key": active_key},
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # another enqueue of the same work inserted its job first
+            job = self.collection.find_one({"active_key": active_key})
+        return job["_id"]
+
+    @staticmethod
+    def _get_active_key(
+        kind: str, tournament_id: ObjectId, match_id: Optional[ObjectId] = None
+    ) -> str:
+        return f"{kind}:{tournament_id}:{match_id or ''}"
+
+    def claim_job(
+        self, worker: str, lease_sec: float, max_attempts: int
+    ) -> Optional[Dict]:
+        """
+        Atomically takes the oldest queued job, or a running one whose worker stopped
+        renewing its lease.
+        """
+        now = datetime.now()
+        return self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_until": {"$lt": now}},
+                ],
+                "attempts": {"$lt": max_attempts},
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker": worker,
+                    "lease_until": now + timedelta(seconds=lease_sec),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def renew_lease(self, job_id: ObjectId, worker: str, lease_sec: float) -> bool:
+        now = datetime.now()
+        result = self.collection.update_one(
+            {"_id": job_id, "status": "running", "worker": worker},
+            {
+                "$set": {
+                    "lease_until": now + timedelta(seconds=lease_sec),
+                    "updated_at": now,
+                }
+            },
+        )
+        return result.modified_count == 1
+
+    def set_progress(self, job_id: ObjectId, worker: str, progress: float) -> None:
+        self.collection.update_one(
+            {"_id": job_id, "status": "running", "worker": worker},
+            {"$set": {"progress": progress, "updated_at": datetime.now()}},
+        )
+
+    def complete_job(
+        self, job_id: ObjectId, worker: str, result: Optional[Dict] = None
+    ) -> bool:
+        update = {"status": "done", "progress": 1.0, "result": result, "error": None}
+        return self._finish_job(job_id, worker, update)
+
+    def fail_job(
+        self, job_id: ObjectId, worker: str, error: str, max_attempts: int
+    ) -> bool:
+        """Queues the job again unless it ran out of attempts"""
+        job = self.get_job_by_id(job_id)
+        retry = job is not None and job["attempts"] < max_attempts
+        update = {"status": "queued" if retry else "failed", "error": error}
+        return self._finish_job(job_id, worker, update)
+
+    def fail_expired_jobs(self, max_attempts: int) -> int:
+        now = datetime.now()
+        result = self.collection.update_many(
+            {
+                "status": "running",
+                "lease_until": {"$lt": now},
+                "attempts": {"$gte": max_attempts},
+            },
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": "Worker stopped responding.",
+                    "updated_at": now,
+                },
+                "$unset": {"active_key": ""},
+            },
+        )
+        return result.modified_count
+
+    def get_job_by_id(self, job_id: ObjectId) -> Optional[Dict]:
+        return self.collection.find_one({"_id": job_id})
+
+    def get_jobs_by_tournament(self, tournament_id: ObjectId) -> List[Dict]:
+        return list(
+            self.collection.find({"tournament_id": tournament_id}).sort(
+                "created_at", 1
+            )
+        )
+
+    def _finish_job(self, job_id: ObjectId, worker: str, update: Dict) -> bool:
+        """Only the worker holding the job can finish it"""
+        changes: Dict[str, Any] = {
+            "$set": {
+                **update,
+                "worker": None,
+                "lease_until": None,
+                "updated_at": datetime.now(),
+            }
+        }
+        if update["status"] not in self.ACTIVE:
+            changes["$unset"] = {"active_key": ""}
+        result = self.collection.update_one(
+            {"_id": job_id, "status": "running", "worker": worker}, changes
+        )
+        return result.modified_count == 1
@@ -1,3 +1,4 @@
+from database.indexes import ensure_indexes, verify_indexes
 from app.utils.database import get_db_connection
 from database.main import User, Bot, GameType
 
@@ -73,3 +74,10 @@ if __name__ == "__main__":
         )
         users.add_bot(admin_id, connect_four_example_bot)
         bots.validate_bot(connect_four_example_bot)
+
+        # Create the indexes of the emptied database
+        errors = ensure_indexes(db)
+        for index, error in errors.items():
+            print(f"Could not create index {index}: {error}")
+        for index in verify_indexes(db)["missing"]:
+            print(f"Missing index {index}")
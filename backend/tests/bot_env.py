@@ -0,0 +1,69 @@
+from fastapi import FastAPI, Form, HTTPException, Response, UploadFile, File
+from pydantic import BaseModel
+from typing import Any
+
+
+class BotEnv:
+    """
+    Stand-in for the bot_env service, answering like it does without running any bots.
+
+    Attributes:
+    ---
+    requests : list[str]
+        The paths of the received requests.
+    failures : int
+        The number of next requests to answer with 503 Service Unavailable.
+    draws : int
+        The number of next matches to end in a draw.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[str] = []
+        self.failures = 0
+        self.draws = 0
+        self.app = FastAPI()
+
+        @self.app.middleware("http")
+        async def record(request, call_next):  # type: ignore[no-untyped-def]
+            self.requests.append(request.url.path)
+            if self.failures > 0:
+                self.failures -= 1
+                return Response(status_code=503)
+            return await call_next(request)
+
+        @self.app.post("/validate")
+        async def validate(game: str = Form(...), file: UploadFile = File(...)):  # type: ignore[no-untyped-def]
+            if file.file.read().startswith(b"invalid"):
+                raise HTTPException(status_code=400, detail="Validation failed.")
+            return {"success": True, "message": "Validation passed."}
+
+        @self.app.post("/run-match")
+        async def run_match(  # type: ignore[no-untyped-def]
+            game: str = Form(...),
+            file1: UploadFile = File(...),
+            file2: UploadFile = File(...),
+            seed: int | None = Form(None),
+        ):
+            winner = 0
+            if self.draws > 0:
+                self.draws -= 1
+                winner = None
+            return {
+                "winner": winner,
+                "moves": [[0], [1]],
+                "times": [0.0, 0.0],
+                "forfeit": None,
+                "seed": seed if seed is not None else 0,
+            }
+
+        class ReplayRequest(BaseModel):
+            game: str
+            moves: list[Any]
+            ply: int | None = None
+
+        @self.app.post("/replay")
+        async def replay(request: ReplayRequest):  # type: ignore[no-untyped-def]
+            states = [f"state {i}" for i in range(len(request.moves) + 1)]
+            if request.ply is not None:
+                states = [states[request.ply]]
+            return {"states": states}
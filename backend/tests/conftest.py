@@ -3,7 +3,9 @@ from datetime import datetime
 from bson import ObjectId
 from typing import Any
 import mongomock
+import asyncio
 import pytest
+import httpx
 
 from app.schemas.game_type import GameType, GameTypeCreate
 from app.utils.authentication import get_password_hash
@@ -17,6 +19,9 @@ from database.main import MongoDB
 from app.schemas.user import User
 from app.models.bot import DBBot
 from app.schemas.bot import Bot
+from app.config import settings
+import app.utils.connection as conn
+from tests.bot_env import BotEnv
 
 
 @pytest.fixture
@@ -76,7 +81,7 @@ def tournament_dict(game_type_dict, user_dict):
         "description": "Test Description",
         "game_type": GameType(**game_type_dict),
         "creator": User(**user_dict),
-        "start_date": datetime(2025, 12, 24),
+        "start_date": datetime(datetime.now().year + 1, 12, 24),
         "access_code": "0A1B2C",
         "max_participants": 4,
         "participants": [],
@@ -125,6 +130,15 @@ def db_connection():
         yield db
 
 
+@pytest.fixture
+def bot_env():
+    stand_in = BotEnv()
+    transport = httpx.ASGITransport(app=stand_in.app)
+    conn.set_client(httpx.AsyncClient(transport=transport, base_url=settings.BOT_ENV))
+    yield stand_in
+    conn.set_client(None)
+
+
 @pytest.fixture
 def insert_game_type(db_connection, game_type_dict):
     game_type = GameTypeCreate(**game_type_dict)
@@ -143,17 +157,17 @@ def insert_user(db_connection, user_dict):
 
 
 @pytest.fixture
-def insert_bot(monkeypatch, insert_game_type, insert_user, db_connection, bot_dict):
-    monkeypatch.setattr("app.models.bot.conn.validate_bot", lambda x, y: True)
-
+def insert_bot(bot_env, insert_game_type, insert_user, db_connection, bot_dict):
     db_game_type = insert_game_type
     db_user = insert_user
-    db_bot = DBBot.insert(
-        db_connection,
-        db_user.to_schema(),
-        bot_dict["name"],
-        db_game_type.id,
-        bot_dict["code"],
+    db_bot = asyncio.run(
+        DBBot.insert(
+            db_connection,
+            db_user.to_schema(),
+            bot_dict["name"],
+            db_game_type.id,
+            bot_dict["code"],
+        )
     )
 
     return db_game_type, db_user, db_bot
@@ -176,25 +190,27 @@ def insert_tournament(insert_game_type, insert_user, db_connection, tournament_d
 
 
 @pytest.fixture
-def insert_match(monkeypatch, insert_tournament, db_connection, bot_dict):
-    monkeypatch.setattr("app.models.bot.conn.validate_bot", lambda x, y: True)
-
+def insert_match(bot_env, insert_tournament, db_connection, bot_dict):
     db_game_type, db_creator, db_tournament = insert_tournament
     db_user = DBUser.insert(db_connection, "participant", "password_hash")
 
-    db_bot_0 = DBBot.insert(
-        db_connection,
-        db_creator.to_schema(),
-        bot_dict["name"],
-        db_game_type.id,
-        bot_dict["code"],
+    db_bot_0 = asyncio.run(
+        DBBot.insert(
+            db_connection,
+            db_creator.to_schema(),
+            bot_dict["name"],
+            db_game_type.id,
+            bot_dict["code"],
+        )
     )
-    db_bot_1 = DBBot.insert(
-        db_connection,
-        db_user.to_schema(),
-        bot_dict["name"],
-        db_game_type.id,
-        bot_dict["code"],
+    db_bot_1 = asyncio.run(
+        DBBot.insert(
+            db_connection,
+            db_user.to_schema(),
+            bot_dict["name"],
+            db_game_type.id,
+            bot_dict["code"],
+        )
     )
 
     db_tournament.add_participant(db_bot_0.id)
@@ -0,0 +1,88 @@
+from fastapi import HTTPException
+import asyncio
+import pytest
+import httpx
+
+from app.config import settings
+import app.utils.connection as conn
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "BOT_ENV_BACKOFF_SEC", 0)
+
+
+def test_validate_bot(bot_env):
+    assert asyncio.run(conn.validate_bot("nim", b"class Bot: ...")) is True
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(conn.validate_bot("nim", b"invalid"))
+
+    assert e.value.status_code == 400
+    assert e.value.detail == "Validation failed."
+    assert bot_env.requests == ["/validate", "/validate"]
+
+
+def test_run_match(bot_env):
+    result = asyncio.run(conn.run_match("nim", b"bot_1", b"bot_2"))
+
+    assert result["winner"] == 0
+    assert result["moves"] == [[0], [1]]
+
+    result = asyncio.run(conn.run_match("nim", b"bot_1", b"bot_2", seed=7))
+
+    assert result["seed"] == 7
+
+
+def test_replay_match(bot_env):
+    states = asyncio.run(conn.replay_match("nim", [[0], [1]]))
+    state = asyncio.run(conn.replay_match("nim", [[0], [1]], 1))
+
+    assert states == ["state 0", "state 1", "state 2"]
+    assert state == ["state 1"]
+
+
+def test_retry(bot_env, no_backoff):
+    bot_env.failures = settings.BOT_ENV_RETRIES
+
+    assert asyncio.run(conn.validate_bot("nim", b"class Bot: ...")) is True
+    assert len(bot_env.requests) == settings.BOT_ENV_RETRIES + 1
+
+
+def test_retry_exhausted(bot_env, no_backoff):
+    bot_env.failures = settings.BOT_ENV_RETRIES + 1
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(conn.run_match("nim", b"bot_1", b"bot_2"))
+
+    assert e.value.status_code == 503
+    assert len(bot_env.requests) == settings.BOT_ENV_RETRIES + 1
+
+
+def test_timeout(monkeypatch):
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    transport = httpx.MockTransport(handler)
+    conn.set_client(httpx.AsyncClient(transport=transport, base_url=settings.BOT_ENV))
+    try:
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(conn.run_match("nim", b"bot_1", b"bot_2"))
+    finally:
+        conn.set_client(None)
+
+    assert e.value.status_code == 504
+
+
+def test_shared_client():
+    async def get_clients():
+        client = conn.get_client()
+        same = conn.get_client()
+        await conn.close_client()
+        return client, same, conn.get_client()
+
+    client, same, reopened = asyncio.run(get_clients())
+
+    assert client is same
+    assert client.is_closed
+    assert reopened is not client
@@ -4,7 +4,17 @@ from bson import ObjectId
 from typing import Generator
 from datetime import datetime, timedelta
 
-from database.main import MongoDB, User, Bot, GameType, Tournament, Match
+from database.main import (
+    MongoDB,
+    User,
+    Bot,
+    GameType,
+    Tournament,
+    Match,
+    MatchResult,
+    Job,
+)
+from database.indexes import ensure_indexes
 
 
 @pytest.fixture
@@ -42,6 +52,16 @@ def match_manager(mock_db: MongoDB) -> Match:
     return Match(mock_db)
 
 
+@pytest.fixture
+def match_result_manager(mock_db: MongoDB) -> MatchResult:
+    return MatchResult(mock_db)
+
+
+@pytest.fixture
+def job_manager(mock_db: MongoDB) -> Job:
+    return Job(mock_db)
+
+
 class TestUser:
     def test_create_user(self, user_manager: User):
         user_id = user_manager.create_user("testuser", "hash123", "standard")
@@ -204,6 +224,19 @@ class TestBot:
         assert owner["_id"] == user_id
         assert bot_id in owner["bots"]
 
+    def test_get_owners(self, bot_manager: Bot, user_manager: User):
+        bot_ids = [bot_manager.create_bot(f"bot{i}", ObjectId(), b"") for i in range(3)]
+        user_id = user_manager.create_user("testuser", "hashedpassword123", "standard")
+        user_manager.add_bot(user_id, bot_ids[0])
+        user_manager.add_bot(user_id, bot_ids[1])
+
+        owners = bot_manager.get_owners(bot_ids)
+        assert set(owners) == set(bot_ids[:2])
+        assert owners[bot_ids[1]]["_id"] == user_id
+
+        bots = bot_manager.get_bots_by_ids(bot_ids[1:])
+        assert {bot["_id"] for bot in bots} == set(bot_ids[1:])
+
         non_existent_bot_id = ObjectId()
         owner = bot_manager.get_owner(non_existent_bot_id)
         assert owner is None
@@ -423,6 +456,57 @@ class TestTournament:
         tournament = tournament_manager.get_tournament_by_id(tournament_id)
         assert tournament["start_date"] == new_date
 
+    def test_start_tournament(self, tournament_manager: Tournament):
+        tournament_id = tournament_manager.create_tournament(
+            "Test Tournament",
+            "Description",
+            ObjectId(),
+            ObjectId(),
+            datetime.now(),
+            "ABC123",
+            4,
+        )
+        bracket = [ObjectId(), ObjectId()]
+        start_date = datetime(2030, 1, 1)
+        assert tournament_manager.start_tournament(tournament_id, bracket, start_date)
+        assert not tournament_manager.start_tournament(tournament_id, [], start_date)
+        tournament = tournament_manager.get_tournament_by_id(tournament_id)
+        assert tournament["bracket"] == bracket
+        assert tournament["start_date"] == start_date
+
+    def test_record_result(self, tournament_manager: Tournament):
+        tournament_id = tournament_manager.create_tournament(
+            "Test Tournament",
+            "Description",
+            ObjectId(),
+            ObjectId(),
+            datetime.now(),
+            "ABC123",
+            4,
+            "round_robin",
+        )
+        bot1_id = ObjectId()
+        bot2_id = ObjectId()
+        assert tournament_manager.record_result(tournament_id, "match", bot1_id, bot2_id)
+        assert not tournament_manager.record_result(
+            tournament_id, "match", bot1_id, bot2_id
+        )
+        assert tournament_manager.record_result(tournament_id, "bye", bot2_id)
+
+        tournament = tournament_manager.get_tournament_by_id(tournament_id)
+        assert tournament["format"] == "round_robin"
+        assert tournament["standings"][str(bot1_id)] == {
+            "played": 1,
+            "wins": 1,
+            "points": 1,
+        }
+        assert tournament["standings"][str(bot2_id)] == {
+            "played": 1,
+            "losses": 1,
+            "byes": 1,
+            "points": 1,
+        }
+
     def test_update_max_participants(self, tournament_manager: Tournament):
         tournament_id = tournament_manager.create_tournament(
             "Test Tournament",
@@ -694,14 +778,42 @@ class TestMatch:
         assert match["game_num"] == 1
         assert match["players"][0] == bot1_id
         assert match["players"][1] == bot2_id
-        assert match["moves"] == []
+        assert match["n_moves"] == 0
+        assert match_manager.get_match_moves(match_id) == []
         assert match["winner"] is None
+        assert match["seed"] is None
+
+    def test_save_result(self, match_manager: Match, bot_manager: Bot):
+        winner_id = bot_manager.create_bot("winner", ObjectId(), b"")
+        loser_id = bot_manager.create_bot("loser", ObjectId(), b"")
+        match_id = match_manager.create_match(1, winner_id, loser_id)
+
+        assert match_manager.save_result(match_id, winner_id, loser_id, [[1], [2]], 3)
+        assert not match_manager.save_result(match_id, loser_id, winner_id, [[1]], 4)
+
+        match = match_manager.get_match_by_id(match_id)
+        assert match["winner"] == winner_id
+        assert match["n_moves"] == 2
+        assert match_manager.get_match_moves(match_id) == [[1], [2]]
+        assert match["seed"] == 3
+        winner = bot_manager.get_bot_by_id(winner_id)
+        loser = bot_manager.get_bot_by_id(loser_id)
+        assert (winner["games_played"], winner["wins"], winner["losses"]) == (1, 1, 0)
+        assert (loser["games_played"], loser["wins"], loser["losses"]) == (1, 0, 1)
+
+    def test_set_seed(self, match_manager: Match):
+        match_id = match_manager.create_match(1, ObjectId(), ObjectId(), seed=3)
+        assert match_manager.get_match_by_id(match_id)["seed"] == 3
+        match_manager.set_seed(match_id, 4)
+        assert match_manager.get_match_by_id(match_id)["seed"] == 4
 
     def test_add_move(self, match_manager: Match):
         match_id = match_manager.create_match(1, ObjectId(), ObjectId())
         match_manager.add_move(match_id, "e2e4")
         match = match_manager.get_match_by_id(match_id)
-        assert "e2e4" in match["moves"]
+        assert "moves" not in match
+        assert match["n_moves"] == 1
+        assert "e2e4" in match_manager.get_match_moves(match_id)
 
     def test_set_winner(self, match_manager: Match):
         bot1_id = ObjectId()
@@ -733,6 +845,35 @@ class TestMatch:
         assert moves[0] == "e2e4"
         assert moves[1] == "e7e5"
 
+    def test_get_match_moves_chunked(
+        self, monkeypatch, match_manager: Match, bot_manager: Bot
+    ):
+        monkeypatch.setattr(Match, "MOVES_CHUNK_SIZE", 3)
+        bot1_id = bot_manager.create_bot("bot1", ObjectId(), b"")
+        bot2_id = bot_manager.create_bot("bot2", ObjectId(), b"")
+        match_id = match_manager.create_match(1, bot1_id, bot2_id)
+        moves = [[i] for i in range(8)]
+        match_manager.save_result(match_id, bot1_id, bot2_id, moves)
+
+        assert match_manager.moves_collection.count_documents({}) == 3
+        assert match_manager.get_match_moves(match_id) == moves
+        assert match_manager.get_match_moves(match_id, 2, 3) == moves[2:5]
+        assert match_manager.get_match_moves(match_id, 6, 10) == moves[6:]
+        assert match_manager.get_match_moves(match_id, 9) == []
+
+        match_manager.add_move(match_id, [8])
+        match_manager.add_move(match_id, [9])
+        assert match_manager.get_match_moves(match_id, 7) == [[7], [8], [9]]
+        assert match_manager.moves_collection.count_documents({}) == 4
+
+    def test_get_match_moves_inline(self, match_manager: Match):
+        match_id = match_manager.collection.insert_one(
+            {"game_num": 1, "moves": [[0], [1], [2]], "winner": None}
+        ).inserted_id
+
+        assert "moves" not in match_manager.get_match_by_id(match_id)
+        assert match_manager.get_match_moves(match_id, 1, 1) == [[1]]
+
     def test_get_matches_by_winner(self, match_manager: Match):
         bot1_id = ObjectId()
         bot2_id = ObjectId()
@@ -747,3 +888,126 @@ class TestMatch:
         game_nums = [match["game_num"] for match in matches]
         assert 1 in game_nums
         assert 2 in game_nums
+
+
+class TestMatchResult:
+    def test_save_result(self, match_result_manager: MatchResult):
+        assert match_result_manager.get_result("nim:a:b:1") is None
+
+        match_result_manager.save_result("nim:a:b:1", 0, [[1], [2]], 1)
+        match_result_manager.save_result("nim:a:b:1", 1, [[2]], 1)
+        result = match_result_manager.get_result("nim:a:b:1")
+        assert result["winner"] == 1
+        assert result["moves"] == [[2]]
+        assert result["seed"] == 1
+        assert match_result_manager.collection.count_documents({}) == 1
+
+
+class TestJob:
+    def test_create_job(self, job_manager: Job):
+        tournament_id = ObjectId()
+        match_id = ObjectId()
+        job_id = job_manager.create_job("match", tournament_id, match_id)
+        job = job_manager.get_job_by_id(job_id)
+        assert job["kind"] == "match"
+        assert job["tournament_id"] == tournament_id
+        assert job["match_id"] == match_id
+        assert job["status"] == "queued"
+        assert job["attempts"] == 0
+
+    def test_create_job_active(self, job_manager: Job):
+        tournament_id = ObjectId()
+        match_id = ObjectId()
+        job_id = job_manager.create_job("match", tournament_id, match_id)
+        assert job_manager.create_job("match", tournament_id, match_id) == job_id
+
+        job_manager.claim_job("worker", 60, 3)
+        job_manager.complete_job(job_id, "worker")
+        assert "active_key" not in job_manager.get_job_by_id(job_id)
+        assert job_manager.create_job("match", tournament_id, match_id) != job_id
+
+    def test_create_job_concurrent(
+        self, monkeypatch, mock_db: MongoDB, job_manager: Job
+    ):
+        ensure_indexes(mock_db)
+        tournament_id = ObjectId()
+        job_id = job_manager.create_job("tournament", tournament_id)
+
+        # an enqueue that looked for the active job before the first one inserted it
+        monkeypatch.setattr(
+            job_manager.collection,
+            "find_one_and_update",
+            lambda *args, **kwargs: job_manager.collection.insert_one(
+                {"active_key": f"tournament:{tournament_id}:"}
+            ),
+        )
+
+        assert job_manager.create_job("tournament", tournament_id) == job_id
+        assert job_manager.collection.count_documents({}) == 1
+
+    def test_claim_job(self, job_manager: Job):
+        job_id1 = job_manager.create_job("match", ObjectId(), ObjectId())
+        job_id2 = job_manager.create_job("match", ObjectId(), ObjectId())
+
+        job = job_manager.claim_job("worker", 60, 3)
+        assert job["_id"] == job_id1
+        assert job["status"] == "running"
+        assert job["worker"] == "worker"
+        assert job["attempts"] == 1
+        assert job_manager.claim_job("worker", 60, 3)["_id"] == job_id2
+        assert job_manager.claim_job("worker", 60, 3) is None
+
+    def test_claim_expired_job(self, job_manager: Job):
+        job_id = job_manager.create_job("match", ObjectId(), ObjectId())
+        job_manager.claim_job("worker1", -1, 3)
+
+        job = job_manager.claim_job("worker2", 60, 3)
+        assert job["_id"] == job_id
+        assert job["worker"] == "worker2"
+        assert job["attempts"] == 2
+        assert not job_manager.complete_job(job_id, "worker1")
+        assert job_manager.complete_job(job_id, "worker2", {"winner": "bot"})
+
+        job = job_manager.get_job_by_id(job_id)
+        assert job["status"] == "done"
+        assert job["result"] == {"winner": "bot"}
+        assert job["progress"] == 1.0
+
+    def test_renew_lease(self, job_manager: Job):
+        job_manager.create_job("match", ObjectId(), ObjectId())
+        job = job_manager.claim_job("worker1", -1, 3)
+
+        assert job_manager.renew_lease(job["_id"], "worker1", 60)
+        assert not job_manager.renew_lease(job["_id"], "worker2", 60)
+        assert job_manager.claim_job("worker2", 60, 3) is None
+
+    def test_fail_job(self, job_manager: Job):
+        job_id = job_manager.create_job("match", ObjectId(), ObjectId())
+
+        job_manager.claim_job("worker", 60, 2)
+        job_manager.fail_job(job_id, "worker", "error", 2)
+        job = job_manager.get_job_by_id(job_id)
+        assert job["status"] == "queued"
+        assert job["error"] == "error"
+
+        job_manager.claim_job("worker", 60, 2)
+        job_manager.fail_job(job_id, "worker", "error", 2)
+        assert job_manager.get_job_by_id(job_id)["status"] == "failed"
+
+    def test_fail_expired_jobs(self, job_manager: Job):
+        job_id = job_manager.create_job("match", ObjectId(), ObjectId())
+        job_manager.claim_job("worker", -1, 1)
+
+        assert job_manager.claim_job("worker", 60, 1) is None
+        assert job_manager.fail_expired_jobs(1) == 1
+        assert job_manager.get_job_by_id(job_id)["status"] == "failed"
+        assert "active_key" not in job_manager.get_job_by_id(job_id)
+
+    def test_get_jobs_by_tournament(self, job_manager: Job):
+        tournament_id = ObjectId()
+        job_id1 = job_manager.create_job("match", tournament_id, ObjectId())
+        job_id2 = job_manager.create_job("match", tournament_id, ObjectId())
+        job_manager.create_job("match", ObjectId(), ObjectId())
+
+        jobs = job_manager.get_jobs_by_tournament(tournament_id)
+        assert [job["_id"] for job in jobs] == [job_id1, job_id2]
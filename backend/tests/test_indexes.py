@@ -0,0 +1,37 @@
+from pymongo.errors import DuplicateKeyError
+import pytest
+
+from database.indexes import INDEXES, ensure_indexes, verify_indexes
+
+
+def test_ensure_indexes(db_connection):
+    report = verify_indexes(db_connection)
+    n_indexes = sum(len(indexes) for indexes in INDEXES.values())
+
+    assert len(report["missing"]) == n_indexes
+    assert "users.username" in report["missing"]
+
+    assert ensure_indexes(db_connection) == {}
+    assert ensure_indexes(db_connection) == {}
+    assert verify_indexes(db_connection) == {
+        "missing": [],
+        "unexpected": [],
+        "unused": [],
+    }
+
+    db_connection.db.users.insert_one({"username": "username"})
+    with pytest.raises(DuplicateKeyError):
+        db_connection.db.users.insert_one({"username": "username"})
+
+
+def test_ensure_indexes_duplicates(db_connection):
+    for _ in range(2):
+        db_connection.db.tournaments.insert_one({"access_code": "ABCDEF"})
+    db_connection.db.matches.create_index("game_num", name="game_num")
+
+    errors = ensure_indexes(db_connection)
+    report = verify_indexes(db_connection)
+
+    assert list(errors) == ["tournaments.access_code"]
+    assert report["missing"] == ["tournaments.access_code"]
+    assert report["unexpected"] == ["matches.game_num"]
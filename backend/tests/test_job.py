@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+from datetime import datetime
+import asyncio
+import pytest
+
+from app.schemas.job import JobKind, JobStatus
+from app.utils.jobs import JobWorkers, enqueue
+from app.models.tournament import DBTournament
+from app.models.match import DBMatch
+from app.models.job import DBJob
+from app.models.bot import DBBot
+
+
+@pytest.fixture
+def job_workers(db_connection):
+    @contextmanager
+    def connect():
+        yield db_connection
+
+    return JobWorkers(size=1, connect=connect)
+
+
+class TestJobModel:
+    def test_insert(self, db_connection, insert_match):
+        db_tournament, db_match = insert_match[2], insert_match[5]
+
+        db_job = DBJob.insert(
+            db_connection, JobKind.MATCH, db_tournament.id, db_match.id
+        )
+        job = db_job.to_schema()
+
+        assert job.kind is JobKind.MATCH
+        assert job.status is JobStatus.QUEUED
+        assert job.tournament_id == db_tournament.id
+        assert job.match_id == db_match.id
+        assert (
+            DBJob.insert(db_connection, JobKind.MATCH, db_tournament.id, db_match.id).id
+            == job.id
+        )
+
+    def test_get_progress(self, db_connection, insert_match):
+        db_tournament, db_match = insert_match[2], insert_match[5]
+
+        progress = DBJob.get_progress(db_connection, db_tournament.id)
+        assert progress.total == 0
+        assert progress.progress == 1.0
+
+        enqueue(db_connection, JobKind.MATCH, db_tournament.id, db_match.id)
+        progress = DBJob.get_progress(db_connection, db_tournament.id)
+        assert progress.total == 1
+        assert progress.queued == 1
+        assert progress.progress == 0.0
+
+
+class TestJobWorkers:
+    def test_run_match(self, bot_env, db_connection, insert_match, job_workers):
+        db_tournament, db_bot_0, db_match = (
+            insert_match[2],
+            insert_match[3],
+            insert_match[5],
+        )
+        db_job = enqueue(db_connection, JobKind.MATCH, db_tournament.id, db_match.id)
+
+        assert asyncio.run(job_workers.run_next("worker"))
+        assert not asyncio.run(job_workers.run_next("worker"))
+
+        job = DBJob(db_connection, id=db_job.id).to_schema()
+        assert job.status is JobStatus.DONE
+        assert job.result == {"winner": str(db_bot_0.id)}
+        assert DBMatch(db_connection, id=db_match.id).winner == db_bot_0.id
+        assert bot_env.requests.count("/run-match") == 1
+
+    def test_retry_idempotent(self, bot_env, db_connection, insert_match, job_workers):
+        db_tournament, db_bot_0, db_match = (
+            insert_match[2],
+            insert_match[3],
+            insert_match[5],
+        )
+        db_job = enqueue(db_connection, JobKind.MATCH, db_tournament.id, db_match.id)
+
+        # a worker that died after recording the result, before finishing the job
+        db_connection.db.jobs.update_one(
+            {"_id": db_job.id},
+            {
+                "$set": {
+                    "status": "running",
+                    "attempts": 1,
+                    "lease_until": datetime.now(),
+                }
+            },
+        )
+        asyncio.run(DBMatch(db_connection, id=db_match.id).run())
+
+        assert asyncio.run(job_workers.run_next("worker"))
+
+        job = DBJob(db_connection, id=db_job.id).to_schema()
+        assert job.status is JobStatus.DONE
+        assert job.attempts == 2
+        assert bot_env.requests.count("/run-match") == 1
+        assert DBBot(db_connection, id=db_bot_0.id).games_played == 1
+
+    def test_failure(
+        self, bot_env, monkeypatch, db_connection, insert_match, job_workers
+    ):
+        monkeypatch.setattr("app.utils.connection.settings.BOT_ENV_RETRIES", 0)
+        monkeypatch.setattr("app.utils.jobs.settings.JOB_MAX_ATTEMPTS", 2)
+        db_tournament, db_match = insert_match[2], insert_match[5]
+        db_job = enqueue(db_connection, JobKind.MATCH, db_tournament.id, db_match.id)
+
+        bot_env.failures = 1
+        assert asyncio.run(job_workers.run_next("worker"))
+        job = DBJob(db_connection, id=db_job.id).to_schema()
+        assert job.status is JobStatus.QUEUED
+        assert job.error == "Bot environment is unavailable."
+
+        bot_env.failures = 1
+        assert asyncio.run(job_workers.run_next("worker"))
+        job = DBJob(db_connection, id=db_job.id).to_schema()
+        assert job.status is JobStatus.FAILED
+        assert job.attempts == 2
+
+    def test_run_tournament(self, bot_env, db_connection, insert_match, job_workers):
+        db_tournament = insert_match[2]
+        db_tournament.start()
+        db_job = enqueue(db_connection, JobKind.TOURNAMENT, db_tournament.id)
+
+        assert asyncio.run(job_workers.run_next("worker"))
+
+        db_tournament = DBTournament(db_connection, id=db_tournament.id)
+        job = DBJob(db_connection, id=db_job.id).to_schema()
+        assert job.status is JobStatus.DONE
+        assert job.progress == 1.0
+        assert job.result == {"winner": str(db_tournament.bracket[0])}
+        assert db_tournament.winner == db_tournament.bracket[0]
@@ -0,0 +1,61 @@
+from bson import ObjectId
+
+from app.utils.loaders import Loader, get_loaders
+from app.schemas.user import UserUpdate
+from database.main import MongoDB
+
+
+def test_loader():
+    batches = []
+
+    def fetch(keys):
+        batches.append(keys)
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = Loader(fetch)
+
+    assert loader.load_many([1, 2, 1, 3]) == [10, 20, 10, None]
+    assert loader.load_many([2, 4]) == [20, 40]
+    assert loader.load(3) is None
+    assert batches == [[1, 2, 3], [4]]
+
+    loader.clear(2)
+    loader.prime(5, 50)
+    assert loader.load_many([2, 5]) == [20, 50]
+    assert batches[-1] == [2]
+
+
+def test_get_loaders(db_connection):
+    other = MongoDB(client=db_connection.client)
+
+    assert get_loaders(db_connection) is get_loaders(db_connection)
+    assert get_loaders(db_connection) is not get_loaders(other)
+
+
+def test_prefetch_bots(db_connection):
+    game_type_id = db_connection.db.game_types.insert_one(
+        {"name": "nim", "description": "Nim"}
+    ).inserted_id
+    bot_ids = [
+        db_connection.db.bots.insert_one({"game_type": game_type_id}).inserted_id
+        for _ in range(2)
+    ]
+    owner_id = db_connection.db.users.insert_one({"bots": bot_ids}).inserted_id
+
+    loaders = get_loaders(db_connection)
+    loaders.prefetch_bots([*bot_ids, ObjectId()])
+
+    assert [bot["_id"] for bot in loaders.bots.load_many(bot_ids)] == bot_ids
+    assert loaders.owners.load(bot_ids[1])["_id"] == owner_id
+    assert loaders.users.load(owner_id)["bots"] == bot_ids
+    assert loaders.game_types.load(game_type_id)["name"] == "nim"
+
+
+def test_update_user_clears_owner(db_connection, insert_bot):
+    _, db_user, db_bot = insert_bot
+    assert not db_bot.get_owner().is_banned
+
+    db_user.update(UserUpdate(is_banned=True))
+
+    assert db_bot.get_owner().is_banned
+    assert get_loaders(db_connection).users.load(db_user.id)["is_banned"]
@@ -1,8 +1,9 @@
 from fastapi import HTTPException
+import asyncio
 import pytest
 
+from app.schemas.match import Match, MatchCreate
 from app.models.match import DBMatch
-from app.schemas.match import Match
 from app.models.bot import DBBot
 
 
@@ -23,7 +24,7 @@ class TestMatchModel:
         assert db_match.id == match_dict["_id"]
         assert db_match.game_num == match_dict["game_num"]
         assert db_match.players == match_dict["players"]
-        assert db_match.moves == match_dict["moves"]
+        assert db_match.get_moves() == match_dict["moves"]
         assert db_match.winner == match_dict["winner"]
 
     def test_init_id(self, db_connection, match_dict):
@@ -48,5 +49,83 @@ class TestMatchModel:
 
         assert db_match.game_num == match_dict["game_num"]
         assert len(db_match.players) == 2
-        assert db_match.moves == []
+        assert db_match.get_moves() == []
         assert db_match.winner is None
+
+    def test_get_states(self, monkeypatch, insert_match):
+        db_match = insert_match[5]
+        db_match._collection.add_move(db_match.id, [0])
+        db_match._collection.add_move(db_match.id, [1])
+        calls = []
+
+        async def mock_replay_match(game_name, moves, ply):
+            calls.append((game_name, moves, ply))
+            return ["state"]
+
+        monkeypatch.setattr("app.models.match.conn.replay_match", mock_replay_match)
+
+        assert asyncio.run(db_match.get_states(1)) == ["state"]
+        assert calls == [("Test Game", [[0], [1]], 1)]
+
+    def test_run(self, bot_env, db_connection, insert_match):
+        db_bot_0, db_bot_1, db_match = insert_match[3:]
+
+        result = asyncio.run(db_match.run())
+        db_match = DBMatch(db_connection, id=db_match.id)
+
+        assert result["winner"].id == db_bot_0.id
+        assert result["loser"].id == db_bot_1.id
+        assert result["winner"].wins == 1
+        assert result["loser"].losses == 1
+        assert db_match.winner == db_bot_0.id
+        assert db_match.n_moves == 2
+        assert db_match.get_moves() == [[0], [1]]
+        assert db_match.get_moves(1, 5) == [[1]]
+        assert bot_env.requests[-1] == "/run-match"
+
+        # a second run does not overwrite the result or count it again
+        result = asyncio.run(db_match.run())
+
+        assert result["winner"].id == db_bot_0.id
+        assert result["winner"].games_played == 1
+
+    def test_run_seed(self, bot_env, db_connection, insert_match):
+        db_match = insert_match[5]
+
+        asyncio.run(db_match.run())
+
+        assert db_match.seed is not None
+        assert DBMatch(db_connection, id=db_match.id).seed == db_match.seed
+        assert db_match.to_schema().seed == db_match.seed
+
+    def test_run_cached(self, bot_env, db_connection, insert_match):
+        db_tournament, db_bot_0, db_bot_1 = insert_match[2:5]
+        db_matches = [
+            DBMatch.insert(
+                db_connection,
+                db_tournament.id,
+                MatchCreate(game_num=i, players=[db_bot_0.id, db_bot_1.id], seed=3),
+            )
+            for i in range(2)
+        ]
+
+        for db_match in db_matches:
+            asyncio.run(db_match.run())
+        db_matches = [DBMatch(db_connection, id=db_match.id) for db_match in db_matches]
+
+        assert bot_env.requests.count("/run-match") == 1
+        assert db_matches[0].winner == db_matches[1].winner == db_bot_0.id
+        assert db_matches[0].get_moves() == db_matches[1].get_moves()
+
+    def test_run_draw(self, bot_env, db_connection, insert_match):
+        db_tournament, db_bot_0, db_bot_1 = insert_match[2:5]
+        match_data = MatchCreate(game_num=1, players=[db_bot_0.id, db_bot_1.id], seed=3)
+        db_match = DBMatch.insert(db_connection, db_tournament.id, match_data)
+        bot_env.draws = 2
+        assert db_match.to_schema().seed is None
+
+        asyncio.run(db_match.run())
+
+        # the draws are replayed with the next seeds, the seed of the win is kept
+        assert bot_env.requests.count("/run-match") == 3
+        assert DBMatch(db_connection, id=db_match.id).seed == 5
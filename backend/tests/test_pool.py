@@ -0,0 +1,52 @@
+from pymongo import monitoring
+
+from app.utils.database import PoolMonitor
+import app.utils.database as database
+
+
+ADDRESS = ("localhost", 27017)
+
+
+def test_shared_client():
+    with database.get_db_connection() as db_0, database.get_db_connection() as db_1:
+        assert db_0.client is db_1.client
+        assert db_0.client is database.get_client()
+
+    # handing out a handle does not close the shared client
+    assert database.get_client() is db_0.client
+
+    database.close_client()
+    assert database.get_client() is not db_0.client
+    database.close_client()
+
+
+def test_other_database():
+    with database.get_db_connection("mongodb://other:27017") as db:
+        assert db.client is not database.get_client()
+    database.close_client()
+
+
+def test_monitor():
+    monitor = PoolMonitor()
+
+    for i in range(2):
+        monitor.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, i))
+    for wait in (0.1, 0.3, 0.2):
+        monitor.connection_checked_out(
+            monitoring.ConnectionCheckedOutEvent(ADDRESS, 0, wait)
+        )
+    monitor.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 0))
+    monitor.connection_check_out_failed(
+        monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 0.4)
+    )
+    monitor.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 1, "idle"))
+
+    stats = monitor.get_stats()
+
+    assert stats.open == 1
+    assert stats.in_use == 2
+    assert stats.checkouts == 3
+    assert stats.checkout_failures == 1
+    assert stats.wait_max_sec == 0.4
+    assert stats.wait_p50_sec == 0.3
+    assert abs(stats.wait_avg_sec - 0.25) < 1e-9
@@ -0,0 +1,65 @@
+import asyncio
+
+from app.utils.scheduler import round_robin_rounds, swiss_pairings, run_pairings
+
+
+def test_round_robin_rounds():
+    rounds = round_robin_rounds([0, 1, 2, 3])
+    pairings = [frozenset(pairing) for round in rounds for pairing in round]
+
+    assert len(rounds) == 3
+    assert len(set(pairings)) == len(pairings) == 6
+    for round in rounds:
+        bots = [bot for pairing in round for bot in pairing]
+        assert sorted(bots) == [0, 1, 2, 3]
+
+
+def test_round_robin_rounds_odd():
+    rounds = round_robin_rounds([0, 1, 2, 3, 4])
+    pairings = [frozenset(pairing) for round in rounds for pairing in round]
+    sitting_out = [
+        ({0, 1, 2, 3, 4} - {bot for pairing in round for bot in pairing}).pop()
+        for round in rounds
+    ]
+
+    assert len(rounds) == 5
+    assert len(set(pairings)) == len(pairings) == 10
+    assert sorted(sitting_out) == [0, 1, 2, 3, 4]
+
+
+def test_swiss_pairings():
+    pairings, bye = swiss_pairings([0, 1, 2, 3], {frozenset((0, 1))}, set())
+
+    assert pairings == [(0, 2), (1, 3)]
+    assert bye is None
+
+
+def test_swiss_pairings_bye():
+    pairings, bye = swiss_pairings([0, 1, 2, 3, 4], set(), {4})
+
+    assert pairings == [(0, 1), (2, 4)]
+    assert bye == 3
+
+
+def test_swiss_pairings_rematch():
+    pairings, _ = swiss_pairings([0, 1], {frozenset((0, 1))}, set())
+
+    assert pairings == [(0, 1)]
+
+
+def test_run_pairings():
+    running = 0
+    max_running = 0
+
+    async def play(pairing):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (pairing % 3))
+        running -= 1
+        return pairing * 2
+
+    results = asyncio.run(run_pairings(list(range(10)), play, capacity=3))
+
+    assert results == [pairing * 2 for pairing in range(10)]
+    assert max_running == 3
@@ -1,8 +1,42 @@
 from fastapi import HTTPException
+import asyncio
+import mongomock
+import random
 import pytest
 
-from app.models.tournament import DBTournament
+from app.models.tournament import DBTournament, _MatchRunner
 from app.schemas.tournament import Tournament
+from app.schemas.match import MatchCreate
+from app.models.match import DBMatch
+from app.models.user import DBUser
+from database.main import MongoDB
+from app.models.bot import DBBot
+
+
+@pytest.fixture
+def add_participants(bot_env, db_connection, insert_tournament, bot_dict):
+    db_game_type, _, db_tournament = insert_tournament
+
+    def add(n_participants):
+        db_connection.db.tournaments.update_one(
+            {"_id": db_tournament.id}, {"$set": {"max_participants": n_participants}}
+        )
+        for i in range(n_participants):
+            db_user = DBUser.insert(db_connection, f"user_{i}", "password_hash")
+            db_bot = asyncio.run(
+                DBBot.insert(
+                    db_connection,
+                    db_user.to_schema(),
+                    bot_dict["name"],
+                    db_game_type.id,
+                    bot_dict["code"],
+                )
+            )
+            db_tournament.add_participant(db_bot.id)
+
+        return DBTournament(db_connection, id=db_tournament.id)
+
+    return add
 
 
 def test_tournament_schema(tournament_dict):
@@ -46,6 +80,8 @@ class TestTournamentModel:
         tournament_dict["_id"] = db_tournament.id
         tournament = Tournament(**tournament_dict)
 
+        # the seed is hidden until the tournament is finished
+        assert db_tournament.seed is not None
         assert db_tournament.to_schema() == tournament
 
     def test_insert(self, tournament_dict, insert_tournament):
@@ -68,3 +104,167 @@ class TestTournamentModel:
 
         assert len(tournaments) == 1
         assert tournaments[0].id == db_tournament.id
+
+    def test_start(self, add_participants):
+        db_tournament = add_participants(3)
+        db_tournament.start()
+
+        assert sorted(db_tournament.bracket) == sorted(db_tournament.participants)
+        with pytest.raises(HTTPException):
+            db_tournament.start()
+
+        # the bracket is drawn with the seed of the tournament
+        bracket = list(db_tournament.participants)
+        random.Random(db_tournament.seed).shuffle(bracket)
+        assert db_tournament.bracket == bracket
+
+    def test_start_too_few(self, add_participants):
+        db_tournament = add_participants(1)
+
+        with pytest.raises(HTTPException):
+            db_tournament.start()
+
+    def test_prepare_run(self, bot_env, add_participants):
+        db_tournament = add_participants(3)
+        db_tournament.prepare_run()
+        bracket = db_tournament.bracket
+
+        # a started tournament can be queued again to resume its run
+        db_tournament.prepare_run()
+        assert db_tournament.bracket == bracket
+
+        asyncio.run(db_tournament.run())
+        with pytest.raises(HTTPException):
+            db_tournament.prepare_run()
+
+    def test_get_matches(self, monkeypatch, bot_env, db_connection, add_participants):
+        db_tournament = add_participants(8)
+        asyncio.run(db_tournament.run())
+        db = MongoDB(client=db_connection.client)
+        db.db = db_connection.db
+        queries = []
+
+        # mongomock's find_one goes through find
+        find = mongomock.Collection.find
+
+        def count(self, *args, **kwargs):
+            queries.append(self.name)
+            return find(self, *args, **kwargs)
+
+        monkeypatch.setattr(mongomock.Collection, "find", count)
+
+        matches = DBTournament(db, id=db_tournament.id).get_matches()
+
+        # the tournament, its matches, and the bots, owners and game types of all
+        assert len(matches) == 7
+        assert matches[-1].winner is not None
+        assert queries == ["tournaments", "matches", "bots", "users", "game_types"]
+
+    def test_run(self, bot_env, db_connection, add_participants):
+        db_tournament = add_participants(5)
+        progress = []
+
+        winner = asyncio.run(db_tournament.run(progress.append))
+        db_tournament = DBTournament(db_connection, id=db_tournament.id)
+        db_matches = [DBMatch(db_connection, id=id) for id in db_tournament.matches]
+        bracket = db_tournament.bracket
+
+        # the first player always wins, 3 bots get a bye to the second round
+        assert winner == bracket[0]
+        assert db_tournament.winner == bracket[0]
+        assert [list(db_match.players) for db_match in db_matches] == [
+            bracket[3:5],
+            bracket[0:2],
+            [bracket[2], bracket[3]],
+            [bracket[0], bracket[2]],
+        ]
+        assert [db_match.game_num for db_match in db_matches] == [0, 1, 2, 3]
+        assert progress == [0.25, 0.5, 0.75, 1.0]
+        assert bot_env.requests.count("/run-match") == 4
+
+    def test_to_schema_finished(self, bot_env, add_participants):
+        db_tournament = add_participants(2)
+        asyncio.run(db_tournament.run())
+
+        assert db_tournament.to_schema().seed == db_tournament.seed
+        assert all(match.seed is not None for match in db_tournament.get_matches())
+
+    def test_run_resume(self, bot_env, db_connection, add_participants):
+        db_tournament = add_participants(4)
+        db_tournament.start()
+        bracket = db_tournament.bracket
+
+        first_match = DBMatch.insert(
+            db_connection,
+            db_tournament.id,
+            MatchCreate(game_num=0, players=bracket[0:2]),
+        )
+        asyncio.run(first_match.run())
+
+        db_tournament = DBTournament(db_connection, id=db_tournament.id)
+        winner = asyncio.run(db_tournament.run())
+
+        assert winner == bracket[0]
+        assert len(DBTournament(db_connection, id=db_tournament.id).matches) == 3
+        assert bot_env.requests.count("/run-match") == 3
+        assert asyncio.run(db_tournament.run()) == winner
+
+    def test_resume_loads_matches_at_once(
+        self, monkeypatch, bot_env, add_participants
+    ):
+        db_tournament = add_participants(4)
+        asyncio.run(db_tournament.run())
+        queries = []
+
+        # mongomock's find_one goes through find
+        find = mongomock.Collection.find
+
+        def count(self, *args, **kwargs):
+            queries.append(self.name)
+            return find(self, *args, **kwargs)
+
+        monkeypatch.setattr(mongomock.Collection, "find", count)
+
+        runner = _MatchRunner(db_tournament, 3, None)
+
+        assert sorted(runner.existing) == [0, 1, 2]
+        assert queries == ["matches"]
+
+    def test_run_round_robin(self, bot_env, db_connection, add_participants):
+        db_tournament = add_participants(5)
+        db_connection.db.tournaments.update_one(
+            {"_id": db_tournament.id}, {"$set": {"format": "round_robin"}}
+        )
+        db_tournament = DBTournament(db_connection, id=db_tournament.id)
+
+        winner = asyncio.run(db_tournament.run())
+        standings = db_tournament.get_standings()
+
+        assert len(db_tournament.matches) == 10
+        assert [standing.played for standing in standings] == [4] * 5
+        assert sum(standing.wins for standing in standings) == 10
+        assert winner == standings[0].bot_id
+        assert db_tournament.winner == winner
+
+    def test_run_swiss(self, bot_env, db_connection, add_participants):
+        db_tournament = add_participants(5)
+        db_connection.db.tournaments.update_one(
+            {"_id": db_tournament.id}, {"$set": {"format": "swiss", "rounds": 3}}
+        )
+        db_tournament = DBTournament(db_connection, id=db_tournament.id)
+
+        winner = asyncio.run(db_tournament.run())
+        standings = db_tournament.get_standings()
+
+        assert len(db_tournament.matches) == 6
+        assert sum(standing.byes for standing in standings) == 3
+        assert all(standing.byes <= 1 for standing in standings)
+        assert sum(standing.points for standing in standings) == 9
+        assert winner == standings[0].bot_id
+
+        # running again does not count the results twice
+        db_connection.db.tournaments.update_one(
+            {"_id": db_tournament.id}, {"$set": {"winner": None}}
+        )
+        asyncio.run(DBTournament(db_connection, id=db_tournament.id).run())
+        assert db_tournament.get_standings() == standings
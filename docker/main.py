@@ -1,6 +1,25 @@
-from src.app.services.validation.bot_validation import BotValidationManager
-from src.app.services.run_game.bot_runner import BotRunner
+from src.app.services.run_game.move_log import GameReplayer
+from src.app.services.run_game.clock import Clock
+from src.app.services.worker_pool import jobs
+from src.app.services.worker_pool.worker_pool import get_worker_pool
 from fastapi import FastAPI, Form, HTTPException, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import os
+
+# upper bounds for a whole job, after which the worker running it is recycled
+MATCH_TIME_LIMIT_SEC = float(os.getenv("MATCH_TIME_LIMIT_SEC", "300"))
+VALIDATION_TIME_LIMIT_SEC = float(os.getenv("VALIDATION_TIME_LIMIT_SEC", "10"))
+
+# default clock of a match, a bot that runs over its time forfeits
+MOVE_TIME_LIMIT_SEC = float(os.getenv("MOVE_TIME_LIMIT_SEC", "5"))
+TIME_BANK_SEC = float(os.getenv("TIME_BANK_SEC", "0")) or None
+TIME_INCREMENT_SEC = float(os.getenv("TIME_INCREMENT_SEC", "0"))
 
 app = FastAPI()
 
@@ -10,6 +29,10 @@ async def run_match(
     game: str = Form(...),
     file1: UploadFile = File(...),
     file2: UploadFile = File(...),
+    move_time_limit: Optional[float] = Form(MOVE_TIME_LIMIT_SEC),
+    time_bank: Optional[float] = Form(TIME_BANK_SEC),
+    increment: float = Form(TIME_INCREMENT_SEC),
+    seed: Optional[int] = Form(None),
 ):
     try:
 
@@ -19,10 +42,99 @@ async def run_match(
         bot_1_str = file1.file.read().decode()
         bot_2_str = file2.file.read().decode()
 
-        runner = BotRunner(game, bot_1_str, bot_2_str, filename1, filename2)
-        winner, states = runner.run_game()
+        clock = Clock(move_time_limit, time_bank, increment)
+        result = await run_in_threadpool(
+            get_worker_pool().run,
+            jobs.run_match,
+            game,
+            bot_1_str,
+            bot_2_str,
+            filename1,
+            filename2,
+            clock,
+            seed,
+            timeout=MATCH_TIME_LIMIT_SEC,
+        )
+
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class Pairing(BaseModel):
+    bot_1: str
+    bot_2: str
+    seed: Optional[int] = None
+
+
+class RunMatchesRequest(BaseModel):
+    game: str
+    bots: Dict[str, str]
+    matches: List[Pairing]
+    move_time_limit: Optional[float] = MOVE_TIME_LIMIT_SEC
+    time_bank: Optional[float] = TIME_BANK_SEC
+    increment: float = TIME_INCREMENT_SEC
+
+
+@app.post("/run-matches")
+async def run_matches(request: RunMatchesRequest):
+    """
+    Runs many matches between bots sent once, keyed by the SHA-256 of their source.
+    Results are streamed as JSON lines in the order the matches finish; winner and
+    forfeit are bot hashes and index is the position of the match in the request.
+    """
+    for bot_hash, bot_str in request.bots.items():
+        if hashlib.sha256(bot_str.encode()).hexdigest() != bot_hash:
+            raise HTTPException(
+                status_code=400, detail=f"Hash does not match source of bot {bot_hash}"
+            )
+    for pairing in request.matches:
+        for bot_hash in (pairing.bot_1, pairing.bot_2):
+            if bot_hash not in request.bots:
+                raise HTTPException(status_code=400, detail=f"Unknown bot {bot_hash}")
+
+    clock = Clock(request.move_time_limit, request.time_bank, request.increment)
+
+    async def play(index: int, pairing: Pairing):
+        try:
+            result = await run_in_threadpool(
+                get_worker_pool().run,
+                jobs.run_match,
+                request.game,
+                request.bots[pairing.bot_1],
+                request.bots[pairing.bot_2],
+                pairing.bot_1,
+                pairing.bot_2,
+                clock,
+                pairing.seed,
+                timeout=MATCH_TIME_LIMIT_SEC,
+            )
+            return {"index": index, **result}
+        except Exception as e:
+            return {"index": index, "error": str(e)}
+
+    async def stream_results():
+        tasks = [play(index, pairing) for index, pairing in enumerate(request.matches)]
+        for task in asyncio.as_completed(tasks):
+            yield json.dumps(await task) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+class ReplayRequest(BaseModel):
+    game: str
+    moves: List[Any]
+    ply: Optional[int] = None
+
+
+@app.post("/replay")
+async def replay(request: ReplayRequest):
+    try:
+        replayer = GameReplayer(request.game)
+        # a long log takes a while to replay, so it is kept off the event loop
+        states = await run_in_threadpool(replayer.replay, request.moves, request.ply)
 
-        return {"winner": winner, "states": states}
+        return {"states": states}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -31,8 +143,13 @@ async def run_match(
 async def validate(game: str = Form(...), file: UploadFile = File(...)):
     try:
         bot_str = file.file.read().decode()
-        validator = BotValidationManager(bot_str, game)
-        validator.validate()
+        await run_in_threadpool(
+            get_worker_pool().run,
+            jobs.validate_bot,
+            bot_str,
+            game,
+            timeout=VALIDATION_TIME_LIMIT_SEC,
+        )
         return {"success": True, "message": "Validation passed."}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
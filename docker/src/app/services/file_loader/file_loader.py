@@ -1,7 +1,8 @@
 import inspect
+from functools import lru_cache
 from typing import BinaryIO
-import types
 import os
+from src.app.services.file_loader.module_cache import MODULE_CACHE
 
 # Check if running in Docker (e.g., based on an environment variable)
 IN_DOCKER = os.getenv("IN_DOCKER", "false").lower() == "true"
@@ -17,15 +18,20 @@ class FileLoader:
 
     @staticmethod
     def get_class(file_str, class_name):
+        """Retrieves the class from the module cached per source, shared by all callers."""
+        module = MODULE_CACHE.get(file_str).module
+        return FileLoader.retrieve_class(module, class_name)
+
+    @staticmethod
+    def load_class(file_str, class_name):
+        """Retrieves the class from a new module, so no state is kept between its users."""
         module = FileLoader.load_module_from_str(file_str)
         return FileLoader.retrieve_class(module, class_name)
 
     @staticmethod
     def load_module_from_str(file_str):
-        module_name = "dynamic_module"
-        module = types.ModuleType(module_name)
-        exec(file_str, module.__dict__)
-        return module
+        """Loads a new module, reusing the bytecode compiled for the source."""
+        return MODULE_CACHE.get(file_str).new_module()
 
     @staticmethod
     def load_file_as_string(file: BinaryIO):
@@ -65,5 +71,10 @@ class FileLoader:
         if game_name not in file_map:
             raise ValueError(f"Game '{game_name}' not found in the file map.")
 
-        with open(file_map[game_name], "r") as f:
+        return FileLoader._read_file(file_map[game_name])
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _read_file(path: str) -> str:
+        with open(path, "r") as f:
             return f.read()
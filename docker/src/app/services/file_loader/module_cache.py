@@ -0,0 +1,112 @@
+import ast
+import hashlib
+import os
+import threading
+import types
+from collections import OrderedDict
+from RestrictedPython import compile_restricted
+from src.app.services.file_visitor.class_index import ClassIndex
+
+
+class CachedSource:
+    """
+    Artifacts built from one source file: the parsed AST, the index of its classes,
+    the bytecode, the restricted bytecode and the loaded module. Each of them is built on first use only.
+    """
+
+    def __init__(self, source: str, digest: str):
+        self.source = source
+        self.digest = digest
+        self._tree = None
+        self._class_index = None
+        self._code = None
+        self._restricted_code = None
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def tree(self) -> ast.Module:
+        if self._tree is None:
+            self._tree = ast.parse(self.source)
+        return self._tree
+
+    @property
+    def class_index(self) -> ClassIndex:
+        if self._class_index is None:
+            self._class_index = ClassIndex(self.tree)
+        return self._class_index
+
+    @property
+    def code(self) -> types.CodeType:
+        if self._code is None:
+            self._code = compile(self.tree, "<string>", "exec")
+        return self._code
+
+    @property
+    def restricted_code(self) -> types.CodeType:
+        if self._restricted_code is None:
+            self._restricted_code = compile_restricted(
+                self.source, filename="<bot_code>", mode="exec"
+            )
+        return self._restricted_code
+
+    @property
+    def module(self) -> types.ModuleType:
+        """The module loaded from the source, executed only once per process"""
+        with self._lock:
+            if self._module is None:
+                self._module = self.new_module()
+        return self._module
+
+    def new_module(self) -> types.ModuleType:
+        """A new module executed from the cached bytecode, sharing no state with others"""
+        module = types.ModuleType("dynamic_module")
+        exec(self.code, module.__dict__)
+        return module
+
+
+class ModuleCache:
+    """
+    LRU cache of CachedSource objects keyed by the SHA-256 of the source.
+
+    The same bots and games are loaded for every match they play, so whatever was
+    built for a source is kept until max_size other sources were used after it.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CachedSource:
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(digest)
+                return entry
+
+            self.misses += 1
+            entry = self._entries[digest] = CachedSource(source, digest)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return entry
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            The number of cache hits, misses and cached sources
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+MODULE_CACHE = ModuleCache(int(os.getenv("MODULE_CACHE_SIZE", "256")))
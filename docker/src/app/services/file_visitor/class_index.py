@@ -0,0 +1,89 @@
+import ast
+from typing import Dict, List, Set
+
+
+class ClassIndex:
+    """
+    Index of the classes defined in a source, built in a single pass over its AST.
+
+    Attributes:
+        nodes: class name to its definition (the last one if defined more than once)
+        bases: class name to the names of its direct base classes
+        ancestors: class name to the names of all the classes it inherits from,
+                   including classes that are not defined in the source
+
+    Only bases given by plain names (class A(B)) are taken into account.
+    """
+
+    def __init__(self, tree: ast.AST):
+        class_defs = sorted(
+            (node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)),
+            key=lambda node: (node.lineno, node.col_offset),
+        )
+
+        self.nodes: Dict[str, ast.ClassDef] = {}
+        self.bases: Dict[str, List[str]] = {}
+        for node in class_defs:
+            self.nodes[node.name] = node
+            self.bases[node.name] = [
+                base.id for base in node.bases if isinstance(base, ast.Name)
+            ]
+
+        self.ancestors: Dict[str, Set[str]] = {}
+        for name in self.nodes:
+            self._collect_ancestors(name, set())
+
+        self._leaves: Dict[str, List[str]] = {}
+
+    def get_descendants(self, base: str) -> List[str]:
+        """
+        Returns:
+            Names of the classes that inherit from base, in the order of definition
+        """
+        return [name for name in self.nodes if base in self.ancestors[name]]
+
+    def get_leaves(self, base: str) -> List[str]:
+        """
+        Returns:
+            Names of the most derived classes that inherit from base (classes that no
+            other class in the source inherits from), in the order of definition
+        """
+        leaves = self._leaves.get(base)
+        if leaves is None:
+            descendants = self.get_descendants(base)
+            parents = {parent for name in descendants for parent in self.bases[name]}
+            leaves = self._leaves[base] = [
+                name for name in descendants if name not in parents
+            ]
+        return list(leaves)
+
+    def get_methods(self, class_name: str, method_name: str) -> List[ast.FunctionDef]:
+        """
+        Returns:
+            Definitions of the method in the body of the class
+        """
+        node = self.nodes.get(class_name)
+        if node is None:
+            return []
+        return [
+            item
+            for item in node.body
+            if isinstance(item, ast.FunctionDef) and item.name == method_name
+        ]
+
+    def _collect_ancestors(self, name: str, visiting: Set[str]) -> Set[str]:
+        ancestors = self.ancestors.get(name)
+        if ancestors is not None:
+            return ancestors
+
+        ancestors = set()
+        visiting.add(name)
+        for base in self.bases.get(name, ()):
+            ancestors.add(base)
+            if base in self.nodes and base not in visiting:
+                ancestors |= self._collect_ancestors(base, visiting)
+        visiting.discard(name)
+
+        if name in self.nodes:
+            self.ancestors[name] = ancestors
+        return ancestors
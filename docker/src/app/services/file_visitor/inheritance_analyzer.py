@@ -1,12 +1,12 @@
-import ast
-from src.app.services.file_visitor.hierarchy_visitor import ClassHierarchyVisitor
+from src.app.services.file_loader.module_cache import MODULE_CACHE
 
 
 class InheritanceAnalyzer:
     def __init__(self, source_code, target_bases):
-        self.tree = ast.parse(source_code)
-        self.visitor = ClassHierarchyVisitor(target_bases)
-        self.visitor_result = self.visitor.visit(self.tree)
+        cached = MODULE_CACHE.get(source_code)
+        self.tree = cached.tree
+        self.index = cached.class_index
+        self.target_bases = target_bases
 
     """
     A utility class for analyzing inheritance hierarchies in Python source code.
@@ -32,4 +32,4 @@ class InheritanceAnalyzer:
     """
 
     def get_last_children(self):
-        return self.visitor.tree.get_leaves()
+        return self.index.get_leaves(self.target_bases)
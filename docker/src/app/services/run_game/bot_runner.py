@@ -1,17 +1,43 @@
 from src.app.services.file_loader.file_loader import FileLoader
 from src.app.utils.class_retriever import ClassRetriever
-from copy import deepcopy
+from src.app.services.run_game.move_log import MoveLog
+from src.app.services.run_game.clock import Clock
+from src.app.services.validation.runtime_validation import (
+    TimeExceededException,
+    alarm_runner,
+)
+import numpy as np
+import threading
+import random
+import time
+
+# seeds are drawn from the same range as the seeds of numpy's legacy generator
+MAX_SEED = 2**32 - 1
 
 
 class BotRunner:
 
     def __init__(
-        self, game_name: str, bot_1: str, bot_2: str, bot_1_name: str, bot_2_name: str
+        self,
+        game_name: str,
+        bot_1: str,
+        bot_2: str,
+        bot_1_name: str,
+        bot_2_name: str,
+        clock: Clock = None,
+        seed: int = None,
     ):
         self._initialize_game(game_name)
         self._initialize_bots(bot_1, bot_2)
         self._init_game()
         self.moves = []
+        self.move_times = []
+        self.forfeit = None
+        self.clock = clock or Clock()
+        # a match without a seed gets a fresh one, so that it can still be replayed
+        if seed is None:
+            seed = random.SystemRandom().randint(0, MAX_SEED)
+        self.seed = seed
         self.map = {self.bot_1: bot_1_name, self.bot_2: bot_2_name}
 
     def _initialize_game(self, game_name: str):
@@ -21,11 +47,11 @@ class BotRunner:
         self.game = FileLoader.get_class(self.game_file_str, self.game_class)
 
     def _initialize_bots(self, bot_1: str, bot_2: str):
-        """Load the bot files and classes."""
+        """Load the bot files and classes, each bot into a module of its own."""
         self.bot_class = ClassRetriever(bot_1).get_bot()
         self.bot_class2 = ClassRetriever(bot_2).get_bot()
-        self.bot_1 = FileLoader.get_class(bot_1, self.bot_class)
-        self.bot_2 = FileLoader.get_class(bot_2, self.bot_class2)
+        self.bot_1 = FileLoader.load_class(bot_1, self.bot_class)
+        self.bot_2 = FileLoader.load_class(bot_2, self.bot_class2)
 
     def _init_game(self):
         self.bot_1 = self.bot_1(self.game.FIRST_PLAYER_DEFAULT_CHAR)
@@ -33,13 +59,50 @@ class BotRunner:
         self.game = self.game(first_player=self.bot_1, second_player=self.bot_2)
 
     def run_game(self):
+        self._seed_random()
         while not self.game.is_finished():
             current_player = self.game.get_current_player()
-            state_copy = deepcopy(self.game.state)
-            move = current_player.get_move(state_copy)
-            self.moves.append(str(self.game.state))
+            state_copy = self.game.state.snapshot()
+            move, elapsed, in_time = self._get_move(current_player, state_copy)
+            self.move_times.append(elapsed)
+            if not in_time:
+                # a bot that runs out of time forfeits the match
+                self.forfeit = self.map.get(current_player)
+                winner = self.bot_2 if current_player is self.bot_1 else self.bot_1
+                return self.map.get(winner), self.moves
+
             self.game.make_move(move)
+            self.moves.append(MoveLog.encode(move))
 
         winner = self.game.get_winner()
         winner_str = self.map.get(winner)
         return winner_str, self.moves
+
+    def _seed_random(self):
+        """
+        Seeds the generators the bots can use, so that the same bots, game and seed
+        always play the same match.
+        """
+        random.seed(self.seed)
+        np.random.seed(self.seed % (MAX_SEED + 1))
+
+    def _get_move(self, player, state):
+        """
+        Asks the bot for a move, interrupting it when it runs out of time.
+        Returns the move, the time it took and if it was made in time.
+        """
+        time_limit = self.clock.get_time_limit(player)
+        start = time.perf_counter()
+        try:
+            # the alarm can only interrupt the bot in the main thread; elsewhere
+            # the overrun is detected after the bot returns
+            if time_limit is not None and (
+                threading.current_thread() is threading.main_thread()
+            ):
+                move = alarm_runner(player.get_move, max(time_limit, 1e-6), state)
+            else:
+                move = player.get_move(state)
+        except TimeExceededException:
+            return None, time.perf_counter() - start, False
+        elapsed = time.perf_counter() - start
+        return move, elapsed, self.clock.record(player, elapsed)
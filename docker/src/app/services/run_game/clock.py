@@ -0,0 +1,57 @@
+from typing import Dict, Hashable, Optional
+
+
+class Clock:
+    """
+    Chess clock for the bots of a match.
+
+    Every move must fit in the per-move limit and, if a time bank is set, in the time
+    the bot has left in its bank. The bank is charged with the time used by each move
+    and credited with the increment afterwards. A bot that runs over forfeits.
+    """
+
+    def __init__(
+        self,
+        move_time_limit: Optional[float] = None,
+        time_bank: Optional[float] = None,
+        increment: float = 0.0,
+    ):
+        self.move_time_limit = move_time_limit
+        self.time_bank = time_bank
+        self.increment = increment
+        self.remaining: Dict[Hashable, float] = {}
+
+    def get_time_limit(self, player: Hashable) -> Optional[float]:
+        """
+        Returns:
+            The time the player may use for its next move, None if not limited
+        """
+        limits = [
+            limit
+            for limit in (self.move_time_limit, self.get_remaining(player))
+            if limit is not None
+        ]
+        return min(limits) if limits else None
+
+    def get_remaining(self, player: Hashable) -> Optional[float]:
+        """
+        Returns:
+            The time left in the player's bank, None if there is no time bank
+        """
+        if self.time_bank is None:
+            return None
+        return self.remaining.setdefault(player, self.time_bank)
+
+    def record(self, player: Hashable, elapsed: float) -> bool:
+        """
+        Charges the player for a move that took elapsed seconds.
+
+        Returns:
+            If the move was made in time
+        """
+        time_limit = self.get_time_limit(player)
+        if time_limit is not None and elapsed > time_limit:
+            return False
+        if self.time_bank is not None:
+            self.remaining[player] += self.increment - elapsed
+        return True
@@ -0,0 +1,53 @@
+from src.app.services.file_loader.file_loader import FileLoader
+from src.app.utils.class_retriever import ClassRetriever
+from typing import Any, List, Optional
+
+
+class MoveLog:
+    """
+    Compact, JSON friendly representation of the moves played in a match.
+
+    A move is stored as the list of its constructor arguments if its class defines
+    __reduce__ (as all the built-in games do), otherwise as a dict of its attributes.
+    """
+
+    @staticmethod
+    def encode(move) -> Any:
+        if type(move).__reduce__ is not object.__reduce__:
+            return list(move.__reduce__()[1])
+        return dict(vars(move))
+
+    @staticmethod
+    def decode(move_class, data: Any):
+        if isinstance(data, dict):
+            move = move_class.__new__(move_class)
+            move.__dict__.update(data)
+            return move
+        return move_class(*data)
+
+
+class GameReplayer:
+    """Regenerates the states of a match from its move log."""
+
+    def __init__(self, game_name: str):
+        game_file_str = FileLoader.get_file_str_by_name(game_name)
+        retriever = ClassRetriever(game_file_str)
+        self.game_class = FileLoader.get_class(game_file_str, retriever.get_game())
+        self.move_class = FileLoader.get_class(game_file_str, retriever.get_move())
+
+    def replay(self, moves: List[Any], ply: Optional[int] = None) -> List[str]:
+        """
+        Returns the text representations of the states of the match, from the initial
+        state to the state after the last move. If ply is given, only the state after
+        that many moves is returned.
+        """
+        if ply is not None and not 0 <= ply <= len(moves):
+            raise ValueError(f"Ply {ply} is out of range for {len(moves)} moves.")
+
+        game = self.game_class()
+        states = [] if ply else [str(game.state)]
+        for i, data in enumerate(moves[:ply]):
+            game.make_move(MoveLog.decode(self.move_class, data))
+            if ply is None or i + 1 == ply:
+                states.append(str(game.state))
+        return states
@@ -3,7 +3,8 @@ from src.app.utils.class_retriever import ClassRetriever
 from src.app.services.validation.validator_base_class import BaseValidator
 from copy import deepcopy
 from src.bots.example_bots.testing_bots.bot_1 import Bot_1
-from RestrictedPython import compile_restricted, safe_builtins
+from src.app.services.file_loader.module_cache import MODULE_CACHE
+from RestrictedPython import safe_builtins
 from RestrictedPython.Eval import default_guarded_getiter, default_guarded_getitem
 from RestrictedPython.Guards import (
     safer_getattr,
@@ -12,7 +13,6 @@ from RestrictedPython.Guards import (
 )
 from src.app.services.validation.runtime_validation import run_with_timer
 
-
 EXEC_TIME_LIMIT_SEC = 2
 
 
@@ -147,9 +147,7 @@ class GameValidatorDynamic(BaseValidator):
         )
 
         try:
-            byte_code = compile_restricted(
-                self.bot_source_code, filename="<bot_code>", mode="exec"
-            )
+            byte_code = MODULE_CACHE.get(self.bot_source_code).restricted_code
 
             exec_env = {
                 "__builtins__": restricted_builtins,
@@ -188,7 +186,7 @@ class GameValidatorDynamic(BaseValidator):
         try:
             while not self.game.is_finished():
                 current_player = self.game.get_current_player()
-                state_copy = deepcopy(self.game.state)
+                state_copy = self.game.state.snapshot()
 
                 move = current_player.get_move(state_copy)
                 if current_player == bot_player:
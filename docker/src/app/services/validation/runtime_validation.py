@@ -1,6 +1,7 @@
 import multiprocessing
 from functools import wraps
 import signal
+import threading
 
 # Source: https://towardsdatascience.com/limiting-a-python-functions-execution-time-using-a-decorator-and-multiprocessing-6fcfe01da6f8
 
@@ -9,6 +10,11 @@ class TimeExceededException(Exception):
     pass
 
 
+# set in worker pool processes, which are already isolated from the server: there the
+# time limit is enforced with an alarm signal instead of forking another process
+INLINE = False
+
+
 def parametrized(dec):
     def layer(*args, **kwargs):
         def repl(f):
@@ -40,10 +46,28 @@ def function_runner(*args, **kwargs):
     send_end.send(result)
 
 
+def alarm_runner(func, max_execution_time, *args, **kwargs):
+    """Runs the function in the current process, interrupting it with SIGALRM"""
+
+    def handle_alarm(signum, frame):
+        raise TimeExceededException("Bot does not meet runtime limits.")
+
+    previous_handler = signal.signal(signal.SIGALRM, handle_alarm)
+    signal.setitimer(signal.ITIMER_REAL, max_execution_time)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
 @parametrized
 def run_with_timer(func, max_execution_time):
     @wraps(func)
     def wrapper(*args, **kwargs):
+        if INLINE and threading.current_thread() is threading.main_thread():
+            return alarm_runner(func, max_execution_time, *args, **kwargs)
+
         multiprocessing.set_start_method("fork", force=True)
         recv_end, send_end = multiprocessing.Pipe()
         kwargs["__send_end"] = send_end
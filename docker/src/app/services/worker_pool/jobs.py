@@ -0,0 +1,32 @@
+from src.app.services.validation.bot_validation import BotValidationManager
+from src.app.services.run_game.bot_runner import BotRunner
+from src.app.services.run_game.clock import Clock
+
+# Jobs run by the worker pool. They are module level functions, so that they can be
+# sent to the workers over a pipe.
+
+
+def validate_bot(bot_str: str, game: str) -> bool:
+    validator = BotValidationManager(bot_str, game)
+    validator.validate()
+    return True
+
+
+def run_match(
+    game: str,
+    bot_1_str: str,
+    bot_2_str: str,
+    bot_1_name,
+    bot_2_name,
+    clock: Clock = None,
+    seed: int = None,
+) -> dict:
+    runner = BotRunner(game, bot_1_str, bot_2_str, bot_1_name, bot_2_name, clock, seed)
+    winner, moves = runner.run_game()
+    return {
+        "winner": winner,
+        "moves": moves,
+        "times": runner.move_times,
+        "forfeit": runner.forfeit,
+        "seed": runner.seed,
+    }
@@ -0,0 +1,170 @@
+import atexit
+import importlib
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from src.app.services.validation import runtime_validation
+from src.app.services.validation.runtime_validation import TimeExceededException
+
+
+class WorkerDiedException(Exception):
+    pass
+
+
+def worker_loop(connection):
+    """Runs jobs received over the connection until the pool closes it."""
+
+    # the worker is already an isolated process, so time limits are enforced inline
+    runtime_validation.INLINE = True
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+
+        function, args, kwargs = job
+        try:
+            result = False, function(*args, **kwargs)
+        except Exception as e:
+            result = True, e
+
+        try:
+            connection.send(result)
+        except Exception as e:  # the result or the exception could not be pickled
+            connection.send((True, Exception(str(e))))
+
+
+class Worker:
+    def __init__(self, context):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=worker_loop, args=(child_connection,), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.jobs = 0
+
+    def stop(self, timeout: float = 1):
+        """Terminates the process, and kills it if it does not exit within timeout."""
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """
+    A pool of pre-forked worker processes that run jobs in isolation.
+
+    Modules passed as preload are imported before forking, so every worker starts
+    with them already loaded. A worker is replaced with a fresh one after max_jobs
+    jobs, when a job exceeds its timeout and when it dies.
+    """
+
+    def __init__(self, n_workers: int = None, max_jobs: int = 100, preload=()):
+        for module in preload:
+            importlib.import_module(module)
+
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self._context = multiprocessing.get_context("fork")
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._workers_lock = threading.Lock()
+        for _ in range(self.n_workers):
+            worker = Worker(self._context)
+            self._workers.add(worker)
+            self._idle.put(worker)
+
+    def run(self, function, *args, timeout: float = None, **kwargs):
+        """
+        Runs function(*args, **kwargs) in one of the workers and returns its result.
+        Exceptions raised by the function are raised again in the caller.
+        Blocks until a worker is free.
+        """
+        worker = self._idle.get()
+        try:
+            worker.connection.send((function, args, kwargs))
+            if not worker.connection.poll(timeout):
+                worker = self._replace(worker)
+                raise TimeExceededException("Bot does not meet runtime limits.")
+            failed, result = worker.connection.recv()
+            worker.jobs += 1
+            if worker.jobs >= self.max_jobs:
+                worker = self._replace(worker)
+        except (EOFError, OSError):
+            worker = self._replace(worker)
+            raise WorkerDiedException("Worker process died while running the job.")
+        finally:
+            self._idle.put(worker)
+
+        if failed:
+            raise result
+        return result
+
+    def close(self, timeout: float = 1):
+        """
+        Stops all the workers.
+        Idle workers exit on their own, busy ones are given timeout to finish their job
+        and then stopped, so that a job that never ends cannot hang the shutdown.
+        """
+        with self._workers_lock:
+            workers = list(self._workers)
+            self._workers.clear()
+
+        for worker in workers:
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.process.join(max(0, deadline - time.monotonic()))
+            worker.stop()
+
+    def _replace(self, worker):
+        worker.stop()
+        new_worker = Worker(self._context)
+        with self._workers_lock:
+            self._workers.discard(worker)
+            self._workers.add(new_worker)
+        return new_worker
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """
+    Returns:
+        The process-wide worker pool, created on the first call
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(
+                n_workers=int(os.getenv("BOT_WORKERS", "0")) or None,
+                max_jobs=int(os.getenv("BOT_WORKER_MAX_JOBS", "100")),
+                preload=(
+                    "numpy",
+                    "RestrictedPython",
+                    "two_player_games.games.connect_four",
+                    "two_player_games.games.dots_and_boxes",
+                    "two_player_games.games.morris",
+                    "two_player_games.games.nim",
+                    "two_player_games.games.Pick",
+                    "src.app.services.validation.bot_validation",
+                    "src.app.services.run_game.bot_runner",
+                ),
+            )
+            atexit.register(_pool.close)
+        return _pool
@@ -1,20 +1,18 @@
-from src.app.services.file_loader.file_loader import FileLoader
-from src.app.services.file_visitor.inheritance_analyzer import InheritanceAnalyzer
-import ast
+from src.app.services.file_loader.module_cache import MODULE_CACHE
 
 
 class ClassRetriever:
     def __init__(self, file_str: str):
         self.game_file = file_str
         self.base_classes = {"Game": "Game", "Move": "Move", "Bot": "Bot"}
+        self.index = MODULE_CACHE.get(file_str).class_index
 
     def _get_class(self, base_class_key):
         class_name = self.base_classes.get(base_class_key)
         if class_name is None:
             raise ValueError(f"Invalid base class key: {base_class_key}")
 
-        self.analyzer = InheritanceAnalyzer(self.game_file, class_name)
-        child_classes = self.analyzer.get_last_children()
+        child_classes = self.index.get_leaves(class_name)
 
         if not child_classes:
             raise ValueError(f"No class inheriting from {class_name} found.")
@@ -34,15 +32,7 @@ class ClassRetriever:
         return result[0]
 
     def get_method(self, bot_class, method_name):
-        body_items = []
-        for node in self.analyzer.tree.body:
-            if isinstance(node, ast.ClassDef) and node.name == bot_class:
-                for body_item in node.body:
-                    if (
-                        isinstance(body_item, ast.FunctionDef)
-                        and body_item.name == method_name
-                    ):  # It's a method
-                        body_items.append(body_item)
+        body_items = self.index.get_methods(bot_class, method_name)
         if len(body_items) > 1:
             raise ValueError(f"Too many methods: {method_name} in {bot_class} class")
         return body_items[0] if len(body_items) > 0 else None
@@ -2,6 +2,8 @@ import unittest
 from fastapi.testclient import TestClient
 from main import app  # Replace with your actual app module
 import io
+import json
+import hashlib
 
 client = TestClient(app)
 
@@ -25,9 +27,101 @@ class TestRunMatch(unittest.TestCase):
         assert response.status_code == 200
         data = response.json()
         assert "winner" in data
-        assert "states" in data
+        assert "moves" in data
         self.assertIn(data["winner"], [0, 1, None])
-        assert len(data["states"]) > 100
+        assert len(data["moves"]) == 12
+        assert len(data["times"]) == 12
+        assert data["forfeit"] is None
+
+        response = client.post(
+            "/replay", json={"game": game_name, "moves": data["moves"]}
+        )
+
+        assert response.status_code == 200
+        states = response.json()["states"]
+        assert len(states) == len(data["moves"]) + 1
+        assert states[0].startswith("Current player: 1")
+
+        response = client.post(
+            "/replay", json={"game": game_name, "moves": data["moves"], "ply": 12}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["states"] == states[-1:]
+
+    def test_seeded_match(self):
+        with open("docker/src/bots/example_bots/testing_bots/bot_1.py", "rb") as f:
+            bot_str = f.read()
+
+        results = []
+        for _ in range(2):
+            response = client.post(
+                "/run-match",
+                data={"game": "connect_four", "seed": 3},
+                files={"file1": bot_str, "file2": bot_str},
+            )
+            assert response.status_code == 200
+            results.append(response.json())
+
+        assert results[0]["seed"] == 3
+        assert results[0]["winner"] == results[1]["winner"]
+        assert results[0]["moves"] == results[1]["moves"]
+
+    def test_replay_invalid_move(self):
+        response = client.post(
+            "/replay", json={"game": "connect_four", "moves": [[0], [9]]}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "list index out of range"
+
+
+class TestRunMatches(unittest.TestCase):
+    def setUp(self):
+        self.bots = {}
+        for path in (
+            "docker/src/bots/example_bots/testing_bots/bot_1.py",
+            "docker/src/bots/example_bots/testing_bots/bot_2.py",
+        ):
+            with open(path) as f:
+                bot_str = f.read()
+            self.bots[hashlib.sha256(bot_str.encode()).hexdigest()] = bot_str
+        self.bot_1, self.bot_2 = self.bots
+
+    def test_results_are_streamed(self):
+        pairings = [
+            {"bot_1": self.bot_1, "bot_2": self.bot_2, "seed": 1},
+            {"bot_1": self.bot_2, "bot_2": self.bot_1, "seed": 2},
+            {"bot_1": self.bot_1, "bot_2": self.bot_2, "seed": 1},
+        ]
+        response = client.post(
+            "/run-matches",
+            json={"game": "nim", "bots": self.bots, "matches": pairings},
+        )
+
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        results.sort(key=lambda result: result["index"])
+        self.assertEqual([result["index"] for result in results], [0, 1, 2])
+        for result in results:
+            self.assertIn(result["winner"], [self.bot_1, self.bot_2])
+            self.assertEqual(len(result["times"]), len(result["moves"]))
+        self.assertEqual(results[0]["moves"], results[2]["moves"])
+
+    def test_invalid_bots(self):
+        pairing = {"bot_1": self.bot_1, "bot_2": "unknown"}
+        response = client.post(
+            "/run-matches",
+            json={"game": "nim", "bots": self.bots, "matches": [pairing]},
+        )
+        assert response.status_code == 400
+
+        bots = {self.bot_1: self.bots[self.bot_2]}
+        pairing = {"bot_1": self.bot_1, "bot_2": self.bot_1}
+        response = client.post(
+            "/run-matches", json={"game": "nim", "bots": bots, "matches": [pairing]}
+        )
+        assert response.status_code == 400
 
 
 class TestValidation(unittest.TestCase):
@@ -41,6 +41,81 @@ class TestSixMensMorrisBotRun(unittest.TestCase):
         self.assertIsInstance(states, list)
         self.assertGreaterEqual(len(states), 0)
 
+    def test_replay(self):
+        from src.app.services.run_game.bot_runner import BotRunner
+        from src.app.services.run_game.move_log import GameReplayer
+
+        with open("docker/src/bots/example_bots/testing_bots/bot_1.py") as f:
+            bot_str = f.read()
+
+        runner = BotRunner("morris", bot_str, bot_str, "bot_1", "bot_2")
+        _, moves = runner.run_game()
+        states = GameReplayer("morris").replay(moves)
+
+        self.assertEqual(len(states), len(moves) + 1)
+        self.assertEqual(states[-1], str(runner.game.state))
+        self.assertEqual(GameReplayer("morris").replay(moves, 1), states[1:2])
+
+    def test_seeded_match_is_reproducible(self):
+        from src.app.services.run_game.bot_runner import BotRunner
+
+        with open("docker/src/bots/example_bots/testing_bots/bot_1.py") as f:
+            bot_str = f.read()
+
+        runs = [
+            BotRunner("connect_four", bot_str, bot_str, "bot_1", "bot_2", seed=seed)
+            for seed in (7, 7, 8)
+        ]
+        results = [runner.run_game() for runner in runs]
+
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual(results[0][1], results[2][1])
+        self.assertEqual(runs[0].seed, 7)
+        self.assertIsInstance(BotRunner("nim", bot_str, bot_str, "a", "b").seed, int)
+
+    def test_bot_state_is_not_shared(self):
+        from src.app.services.run_game.bot_runner import BotRunner
+
+        bot_str = (
+            "import random\n"
+            "from src.bots.example_bots.example_bot import Bot\n\n\n"
+            "class Memory_Bot(Bot):\n"
+            "    seen = []\n\n"
+            "    def get_move(self, state):\n"
+            "        self.seen.append(random.random())\n"
+            "        moves = state.get_moves()\n"
+            "        return moves[len(self.seen) % len(moves)]\n"
+        )
+
+        runs = [
+            BotRunner("connect_four", bot_str, bot_str, "a", "b", seed=5)
+            for _ in range(2)
+        ]
+        results = [runner.run_game() for runner in runs]
+
+        self.assertEqual(results[0], results[1])
+        self.assertIsNot(runs[0].bot_1.seen, runs[0].bot_2.seen)
+
+    def test_forfeit_on_overrun(self):
+        from src.app.services.run_game.bot_runner import BotRunner
+        from src.app.services.run_game.clock import Clock
+
+        with open("docker/src/bots/example_bots/testing_bots/bot_1.py") as f:
+            bot_str = f.read()
+        with open("docker/tests/sample_bots/unsafe_behaviour/runtime_error.py") as f:
+            slow_bot_str = f.read()
+
+        runner = BotRunner(
+            "nim", bot_str, slow_bot_str, "bot_1", "slow", Clock(move_time_limit=0.2)
+        )
+        winner, moves = runner.run_game()
+
+        self.assertEqual(winner, "bot_1")
+        self.assertEqual(runner.forfeit, "slow")
+        self.assertEqual(len(moves), 1)
+        self.assertEqual(len(runner.move_times), 2)
+        self.assertLess(runner.move_times[1], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
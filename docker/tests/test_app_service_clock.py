@@ -0,0 +1,36 @@
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from src.app.services.run_game.clock import Clock
+
+
+class TestClock(unittest.TestCase):
+    def test_no_limits(self):
+        clock = Clock()
+
+        self.assertIsNone(clock.get_time_limit("bot"))
+        self.assertTrue(clock.record("bot", 100))
+
+    def test_move_time_limit(self):
+        clock = Clock(move_time_limit=1)
+
+        self.assertEqual(clock.get_time_limit("bot"), 1)
+        self.assertTrue(clock.record("bot", 0.5))
+        self.assertFalse(clock.record("bot", 1.5))
+
+    def test_time_bank_with_increment(self):
+        clock = Clock(move_time_limit=2, time_bank=3, increment=0.5)
+
+        self.assertEqual(clock.get_time_limit("bot"), 2)
+        self.assertTrue(clock.record("bot", 2))
+        self.assertEqual(clock.get_remaining("bot"), 1.5)
+        self.assertEqual(clock.get_time_limit("bot"), 1.5)
+        self.assertEqual(clock.get_remaining("other"), 3)
+        self.assertFalse(clock.record("bot", 1.6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -128,5 +128,70 @@ class Final(Derived):
         self.assertEqual(result, ["Final"])
 
 
+class TestClassIndex(unittest.TestCase):
+    source_code = """
+class Move:
+    pass
+
+class Bot:
+    pass
+
+class GameMove(Move):
+    pass
+
+class Helper(Bot):
+    def get_move(self, state):
+        pass
+
+class MyBot(Helper):
+    def get_move(self, state):
+        class Inner(Move):
+            pass
+
+    def get_move(self, state):
+        pass
+"""
+
+    def test_single_parse(self):
+        from src.app.services.file_loader.module_cache import MODULE_CACHE
+        from src.app.services.file_visitor.inheritance_analyzer import (
+            InheritanceAnalyzer,
+        )
+        from src.app.utils.class_retriever import ClassRetriever
+
+        cached = MODULE_CACHE.get(self.source_code)
+        index = cached.class_index
+
+        self.assertIs(ClassRetriever(self.source_code).index, index)
+        self.assertIs(InheritanceAnalyzer(self.source_code, "Move").index, index)
+        self.assertIs(index, cached.class_index)
+
+    def test_leaves_in_definition_order(self):
+        from src.app.utils.class_retriever import ClassRetriever
+
+        retriever = ClassRetriever(self.source_code)
+
+        self.assertEqual(retriever.index.get_leaves("Move"), ["GameMove", "Inner"])
+        self.assertEqual(retriever.index.ancestors["MyBot"], {"Helper", "Bot"})
+        self.assertEqual(retriever.get_move(), "GameMove")
+        self.assertEqual(retriever.get_bot(), "MyBot")
+        self.assertEqual(retriever.get_method("Helper", "get_move").name, "get_move")
+        self.assertIsNone(retriever.get_method("Helper", "run"))
+        with self.assertRaises(ValueError):
+            retriever.get_method("MyBot", "get_move")
+        with self.assertRaises(ValueError):
+            retriever.get_game()
+
+    def test_cyclic_bases(self):
+        from src.app.services.file_visitor.class_index import ClassIndex
+        import ast
+
+        index = ClassIndex(
+            ast.parse("class A(B): pass\nclass B(A): pass\nclass C(A): pass")
+        )
+
+        self.assertEqual(index.get_leaves("A"), ["C"])
+
+
 if __name__ == "__main__":
     unittest.main()
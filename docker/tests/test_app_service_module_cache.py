@@ -0,0 +1,75 @@
+from unittest.mock import patch
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.app.services.file_loader.module_cache import ModuleCache, MODULE_CACHE
+from src.app.services.file_loader.file_loader import FileLoader
+
+
+class TestModuleCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ModuleCache(max_size=2)
+
+    def test_hits_and_misses(self):
+        first = self.cache.get("x = 1")
+        second = self.cache.get("x = 1")
+
+        self.assertIs(first, second)
+        self.assertIs(first.module, second.module)
+        self.assertIs(first.tree, second.tree)
+        self.assertEqual(first.module.x, 1)
+        self.assertEqual(self.cache.get_stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_least_recently_used_is_evicted(self):
+        first = self.cache.get("x = 1")
+        self.cache.get("x = 2")
+        self.cache.get("x = 1")
+        self.cache.get("x = 3")
+
+        self.assertIs(self.cache.get("x = 1"), first)
+        self.cache.get("x = 2")
+        self.assertEqual(self.cache.get_stats(), {"hits": 2, "misses": 4, "size": 2})
+
+    def test_restricted_code(self):
+        entry = self.cache.get("def f(x):\n    return x._y\n")
+
+        with self.assertRaises(SyntaxError):
+            entry.restricted_code
+        self.assertIs(entry.code, entry.code)
+
+    def test_new_module_reuses_code(self):
+        entry = self.cache.get("items = []")
+        first = entry.new_module()
+        first.items.append(1)
+
+        with patch(
+            "src.app.services.file_loader.module_cache.compile", create=True
+        ) as compile:
+            second = entry.new_module()
+
+        compile.assert_not_called()
+        self.assertEqual(second.items, [])
+        self.assertIsNot(first, entry.module)
+
+    def test_file_loader_uses_cache(self):
+        source = "class A:\n    pass\n"
+        misses = MODULE_CACHE.get_stats()["misses"]
+
+        first = FileLoader.get_class(source, "A")
+        second = FileLoader.get_class(source, "A")
+        fresh = FileLoader.retrieve_class(FileLoader.load_module_from_str(source), "A")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, fresh)
+        self.assertEqual(MODULE_CACHE.get_stats()["misses"], misses + 1)
+        self.assertIs(
+            FileLoader.get_file_str_by_name("nim"),
+            FileLoader.get_file_str_by_name("nim"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
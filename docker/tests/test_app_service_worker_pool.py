@@ -0,0 +1,93 @@
+import threading
+import unittest
+import os
+import time
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from src.app.services.worker_pool.worker_pool import WorkerPool, WorkerDiedException
+from src.app.services.validation.runtime_validation import (
+    TimeExceededException,
+    run_with_timer,
+)
+
+
+def get_pid():
+    return os.getpid()
+
+
+def divide(x, y):
+    return x / y
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+
+
+def die():
+    os._exit(1)
+
+
+@run_with_timer(max_execution_time=0.2)
+def loop_forever():
+    while True:
+        pass
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(n_workers=1, max_jobs=3)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_run(self):
+        self.assertEqual(self.pool.run(divide, 6, y=3), 2)
+        self.assertNotEqual(self.pool.run(get_pid), os.getpid())
+
+    def test_worker_is_reused_and_recycled(self):
+        pids = [self.pool.run(get_pid) for _ in range(4)]
+
+        self.assertEqual(len(set(pids[:3])), 1)
+        self.assertNotEqual(pids[3], pids[0])
+
+    def test_exception_is_raised_in_caller(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.pool.run(divide, 1, 0)
+
+    def test_timeout_replaces_worker(self):
+        pid = self.pool.run(get_pid)
+        with self.assertRaises(TimeExceededException):
+            self.pool.run(sleep, 5, timeout=0.2)
+
+        self.assertNotEqual(self.pool.run(get_pid), pid)
+
+    def test_dead_worker_is_replaced(self):
+        with self.assertRaises(WorkerDiedException):
+            self.pool.run(die)
+
+        self.assertEqual(self.pool.run(divide, 1, 1), 1)
+
+    def test_close_stops_busy_worker(self):
+        thread = threading.Thread(
+            target=self.assertRaises, args=(Exception, self.pool.run, sleep, 60)
+        )
+        thread.start()
+        time.sleep(0.2)
+
+        start = time.monotonic()
+        self.pool.close(timeout=0.2)
+
+        self.assertLess(time.monotonic() - start, 5)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_time_limit_inside_worker(self):
+        with self.assertRaises(TimeExceededException):
+            self.pool.run(loop_forever, timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
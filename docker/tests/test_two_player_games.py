@@ -0,0 +1,474 @@
+import unittest
+import random
+import copy
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from two_player_games.player import Player
+
+
+def play_random(states, seed, n_games=50):
+    """Plays random games on equivalent states and yields them after every move."""
+    rng = random.Random(seed)
+    for _ in range(n_games):
+        current = list(states)
+        yield current
+        while not current[0].is_finished():
+            move = rng.choice(current[0].get_moves())
+            current = [state.make_move(move) for state in current]
+            yield current
+
+
+class TestConnectFour(unittest.TestCase):
+    def setUp(self):
+        self.first = Player("1")
+        self.second = Player("2")
+
+    def test_bitboard_matches_list_state(self):
+        from two_player_games.games.connect_four import (
+            BitboardConnectFourState,
+            ConnectFourState,
+        )
+
+        states = (
+            ConnectFourState((7, 6), self.first, self.second),
+            BitboardConnectFourState((7, 6), self.first, self.second),
+        )
+        for reference, bitboard in play_random(states, seed=0):
+            self.assertEqual(str(reference), str(bitboard))
+            self.assertEqual(reference.fields, bitboard.fields)
+            self.assertEqual(reference.get_moves(), bitboard.get_moves())
+            self.assertEqual(reference.is_finished(), bitboard.is_finished())
+            self.assertIs(reference.get_winner(), bitboard.get_winner())
+
+    def test_bitboard_from_fields(self):
+        from two_player_games.games.connect_four import BitboardConnectFourState
+
+        fields = [[None] * 6 for _ in range(7)]
+        for i in range(4):
+            fields[i][i] = self.second
+        state = BitboardConnectFourState(
+            current_player=self.first, other_player=self.second, fields=fields
+        )
+
+        self.assertIs(state.get_winner(), self.second)
+        self.assertTrue(state.is_finished())
+        self.assertEqual(state.fields, fields)
+
+    def test_bitboard_full_column(self):
+        from two_player_games.games.connect_four import (
+            BitboardConnectFourState,
+            ConnectFourState,
+            ConnectFourMove,
+        )
+
+        for state_class in (ConnectFourState, BitboardConnectFourState):
+            state = state_class((2, 2), self.first, self.second)
+            for column in (0, 0, 0, -1):
+                state = state.make_move(ConnectFourMove(column))
+
+            self.assertEqual(state.get_moves(), [ConnectFourMove(1)])
+            self.assertEqual(
+                [state.fields[0], state.fields[1][:1]],
+                [[self.first, self.second], [self.second]],
+            )
+            self.assertIs(state.get_current_player(), self.first)
+            self.assertEqual(
+                state,
+                state_class(
+                    current_player=self.first,
+                    other_player=self.second,
+                    fields=state.fields,
+                ),
+            )
+            with self.assertRaises(IndexError):
+                state.make_move(ConnectFourMove(2))
+
+        state = BitboardConnectFourState((1, 2), self.first, self.second)
+        state.push(ConnectFourMove(0))
+        state.push(ConnectFourMove(0))
+        text = str(state)
+        state.push(ConnectFourMove(0))
+        state.pop()
+        self.assertEqual(str(state), text)
+
+
+class TestDotsAndBoxes(unittest.TestCase):
+    def setUp(self):
+        self.first = Player("1")
+        self.second = Player("2")
+
+    def test_incremental_state_matches_lists(self):
+        from two_player_games.games.dots_and_boxes import DotsAndBoxesState
+
+        states = (DotsAndBoxesState(self.first, self.second, 3),)
+        for (state,) in play_random(states, seed=0, n_games=20):
+            owners = [box for row in state.boxes for box in row]
+            scores = state.get_scores()
+            self.assertEqual(scores[self.first], owners.count(self.first))
+            self.assertEqual(scores[self.second], owners.count(self.second))
+            self.assertEqual(state.is_finished(), all(owners))
+            if not any(owners):
+                continue
+
+            loaded = DotsAndBoxesState(
+                state.get_current_player(),
+                state.get_players()[1],
+                horizontals=state.horizontals,
+                verticals=state.verticals,
+                boxes=state.boxes,
+            )
+            self.assertEqual(str(loaded), str(state))
+            self.assertEqual(loaded.get_moves(), state.get_moves())
+            self.assertEqual(loaded.get_scores(), scores)
+            self.assertIs(loaded.get_winner(), state.get_winner())
+
+    def test_completing_box_keeps_turn(self):
+        from two_player_games.games.dots_and_boxes import (
+            DotsAndBoxesMove,
+            DotsAndBoxesState,
+        )
+
+        state = DotsAndBoxesState(self.first, self.second, 1)
+        for connection, loc in (("h", (0, 0)), ("h", (0, 1)), ("v", (0, 0))):
+            state = state.make_move(DotsAndBoxesMove(connection, loc))
+        state = state.make_move(DotsAndBoxesMove("v", (0, 1)))
+
+        self.assertIs(state.get_current_player(), self.second)
+        self.assertEqual(state.boxes, [[self.second]])
+        self.assertTrue(state.is_finished())
+        self.assertIs(state.get_winner(), self.second)
+        with self.assertRaises(ValueError):
+            state.make_move(DotsAndBoxesMove("v", (0, 1)))
+
+    def test_move_indexes_like_lists(self):
+        from two_player_games.games.dots_and_boxes import (
+            DotsAndBoxesMove,
+            DotsAndBoxesState,
+        )
+
+        state = DotsAndBoxesState(self.first, self.second, 2)
+        negative = state.make_move(DotsAndBoxesMove("h", (-1, -1)))
+
+        self.assertEqual(negative, state.make_move(DotsAndBoxesMove("h", (1, 2))))
+        with self.assertRaises(ValueError):
+            negative.make_move(DotsAndBoxesMove("h", (1, 2)))
+        for loc in ((2, 0), (0, 3), (-3, 0), (0, -4)):
+            with self.assertRaises(IndexError):
+                state.make_move(DotsAndBoxesMove("v", loc))
+
+
+class TestMorris(unittest.TestCase):
+    def test_tables(self):
+        from two_player_games.games.morris import SixMensMorris
+
+        state = SixMensMorris().state
+
+        self.assertEqual(state.tables.neighbours[0], ((0, 1), (7, 7)))
+        self.assertEqual(state.tables.morrises[0], ((0, 1, 2), (6, 7, 0)))
+        self.assertEqual(state.tables.neighbours[1], ((0, 0), (1, 2), (16, 9)))
+
+    def test_tables_shared_between_states(self):
+        from two_player_games.games.morris import SixMensMorris
+
+        state = SixMensMorris().state
+        next_state = state.make_move(state.get_moves()[0])
+
+        self.assertIs(next_state.tables, state.tables)
+        self.assertIsNone(next_state._result)
+        self.assertFalse(next_state.is_finished())
+
+    def test_mill_allows_removal(self):
+        from two_player_games.games.morris import MorrisMove, SixMensMorris
+
+        state = SixMensMorris().state
+        for place_pawn in (0, 8, 1, 9):
+            state = state.make_move(MorrisMove(place_pawn=place_pawn))
+
+        moves = [move for move in state.get_moves() if move.place_pawn == 2]
+
+        self.assertEqual([move.remove_pawn for move in moves], [8, 9])
+
+
+class TestPick(unittest.TestCase):
+    def setUp(self):
+        self.first = Player("1")
+        self.second = Player("2")
+
+    def test_sums_index(self):
+        from two_player_games.games.Pick import PickState
+
+        state = PickState(self.first, self.second, 3, [1, 2, 3, 4])
+
+        self.assertEqual(state.aim_value, 15)
+        self.assertTrue(state._sums_to_aim_value(state._get_sums([1, 5, 9, 2])))
+        self.assertFalse(state._sums_to_aim_value(state._get_sums([1, 5, 7, 2])))
+        self.assertFalse(state.is_finished())
+        self.assertEqual(state.selected_numbers, {1, 2, 3, 4})
+
+    def test_win_after_move(self):
+        from two_player_games.games.Pick import PickMove, PickState
+
+        state = PickState(self.first, self.second, 3, [2, 4], [1, 3])
+        state = state.make_move(PickMove(9))
+
+        self.assertTrue(state.is_finished())
+        self.assertIs(state.get_winner(), self.first)
+        self.assertEqual(state.other_player_numbers, [2, 4, 9])
+        with self.assertRaises(ValueError):
+            state.make_move(PickMove(9))
+
+
+class TestNim(unittest.TestCase):
+    def setUp(self):
+        self.first = Player("1")
+        self.second = Player("2")
+
+    def test_moves_are_interned(self):
+        from two_player_games.games.nim import NimMove, NimState
+
+        state = NimState(self.first, self.second, (2, 0, 1))
+        moves = state.get_moves()
+
+        self.assertEqual(
+            [(move.heap, move.n) for move in moves], [(0, 1), (0, 2), (2, 1)]
+        )
+        self.assertEqual(moves, list(state.iter_moves()))
+        self.assertIs(moves[0], NimMove.get(0, 1))
+        self.assertIs(state.get_moves()[2], moves[2])
+
+    def test_misere_outcome(self):
+        from two_player_games.games.nim import NimState
+
+        cases = [
+            ((0, 0), True),
+            ((1, 0), False),
+            ((1, 1), True),
+            ((2, 2), False),
+            ((3, 1), True),
+            ((2, 1, 1), True),
+        ]
+        for heaps, winning in cases:
+            state = NimState(self.first, self.second, heaps)
+            self.assertEqual(state.is_winning(), winning, heaps)
+
+        self.assertEqual(NimState(self.first, self.second, (7, 5, 3)).get_nim_sum(), 1)
+
+
+class TestMoves(unittest.TestCase):
+    def test_moves_are_shared_and_hashable(self):
+        for game in TestZobristHashing.get_games(self):
+            state = game.state
+            moves = state.get_moves()
+            for move, other in zip(moves, state.get_moves()):
+                self.assertIs(move, other)
+                self.assertFalse(hasattr(move, "__dict__"))
+
+            copies = [copy.deepcopy(move) for move in moves]
+            pickled = pickle.loads(pickle.dumps(moves))
+            self.assertEqual(copies, moves)
+            self.assertEqual(pickled, moves)
+            self.assertEqual(set(moves), set(copies) | set(pickled))
+            self.assertEqual(len(set(moves)), len(moves))
+            self.assertEqual(
+                [hash(move) for move in moves], [hash(move) for move in pickled]
+            )
+
+    def test_moves_are_immutable(self):
+        from two_player_games.games.connect_four import ConnectFourMove
+        from two_player_games.games.dots_and_boxes import DotsAndBoxesMove
+
+        move = ConnectFourMove.get(0)
+        with self.assertRaises(AttributeError):
+            move.column = 1
+        self.assertEqual(ConnectFourMove.get(0).column, 0)
+        self.assertEqual(
+            DotsAndBoxesMove("h", [0, 1]), DotsAndBoxesMove.get("h", (0, 1))
+        )
+
+    def test_player_has_no_dict(self):
+        player = Player("1")
+
+        self.assertFalse(hasattr(player, "__dict__"))
+        with self.assertRaises(AttributeError):
+            player.name = "first"
+
+
+class TestZobristHashing(unittest.TestCase):
+    def get_games(self):
+        from two_player_games.games.connect_four import ConnectFour
+        from two_player_games.games.dots_and_boxes import DotsAndBoxes
+        from two_player_games.games.morris import SixMensMorris
+        from two_player_games.games.nim import Nim
+        from two_player_games.games.Pick import Pick
+
+        return [
+            ConnectFour(),
+            ConnectFour(bitboard=False),
+            DotsAndBoxes(size=3),
+            SixMensMorris(),
+            Nim(),
+            Pick(),
+        ]
+
+    def test_incremental_hash_matches_full_hash(self):
+        for game in self.get_games():
+            for (state,) in play_random((game.state,), seed=0, n_games=5):
+                fresh = copy.copy(state)
+                fresh._hash = None
+                self.assertEqual(fresh.get_hash(), state.get_hash())
+                self.assertEqual(fresh, state)
+
+    def test_transpositions(self):
+        from two_player_games.games.connect_four import ConnectFourMove
+        from two_player_games.games.nim import NimMove
+
+        for game in self.get_games()[:2]:
+            state = game.state
+            first = state.make_move(ConnectFourMove(0)).make_move(ConnectFourMove(1))
+            first = first.make_move(ConnectFourMove(2))
+            second = state.make_move(ConnectFourMove(2)).make_move(ConnectFourMove(1))
+            second = second.make_move(ConnectFourMove(0))
+
+            self.assertEqual(hash(first), hash(second))
+            self.assertEqual(first, second)
+            self.assertNotEqual(first, state)
+            self.assertEqual(len({first, second, state}), 2)
+
+        state = self.get_games()[4].state
+        first = state.make_move(NimMove(0, 1)).make_move(NimMove(1, 2))
+        second = state.make_move(NimMove(1, 2)).make_move(NimMove(0, 1))
+        turn = state.make_move(NimMove(0, 1)).make_move(NimMove(1, 1))
+        turn = turn.make_move(NimMove(1, 1))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, turn)
+        self.assertNotEqual(hash(first), hash(turn))
+
+
+class TestPushPop(unittest.TestCase):
+    def get_games(self):
+        return TestZobristHashing.get_games(self)
+
+    def test_push_matches_make_move(self):
+        for game in self.get_games():
+            rng = random.Random(0)
+            for _ in range(5):
+                state = game.state
+                pushed = copy.deepcopy(state)
+                expected = [state]
+                while not pushed.is_finished():
+                    move = rng.choice(pushed.get_moves())
+                    expected.append(expected[-1].make_move(move))
+                    pushed.push(move)
+                    self.assertEqual(str(pushed), str(expected[-1]))
+                    self.assertEqual(pushed.get_moves(), expected[-1].get_moves())
+                    self.assertEqual(pushed, expected[-1])
+
+                while len(expected) > 1:
+                    expected.pop()
+                    pushed.pop()
+                    self.assertEqual(str(pushed), str(expected[-1]))
+                    self.assertEqual(pushed.get_moves(), expected[-1].get_moves())
+                    self.assertIs(pushed.is_finished(), expected[-1].is_finished())
+                    self.assertEqual(pushed.get_hash(), expected[-1].get_hash())
+
+                self.assertEqual(str(game.state), str(state))
+
+    def test_invalid_push_keeps_state(self):
+        from two_player_games.games.connect_four import ConnectFourMove
+        from two_player_games.games.Pick import PickMove
+
+        for game, move, error in (
+            (self.get_games()[0], ConnectFourMove(7), IndexError),
+            (self.get_games()[5], PickMove(0), ValueError),
+        ):
+            state = game.state
+            text = str(state)
+            with self.assertRaises(error):
+                state.push(move)
+            self.assertEqual(str(state), text)
+            with self.assertRaises(IndexError):
+                state.pop()
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_snapshot_is_isolated(self):
+        for game in TestZobristHashing.get_games(self):
+            for (state,) in play_random((game.state,), seed=0, n_games=2):
+                if state.is_finished():
+                    continue
+                text = str(state)
+                snapshot = state.snapshot()
+
+                self.assertEqual(snapshot, state)
+                self.assertEqual(str(snapshot), text)
+                self.assertEqual(snapshot.get_moves(), state.get_moves())
+                # bots get players of their own, not the ones of the other bot
+                for copied, player in zip(snapshot.get_players(), state.get_players()):
+                    self.assertIsNot(copied, player)
+                    self.assertEqual(copied.char, player.char)
+                    self.assertIs(type(copied), Player)
+
+                for name in ("fields", "grid", "current_player_numbers"):
+                    if hasattr(snapshot, name):
+                        getattr(snapshot, name).clear()
+                if hasattr(snapshot, "placed_pawns"):
+                    snapshot.placed_pawns.clear()
+                self.assertEqual(str(state), text)
+
+                snapshot = state.snapshot()
+                snapshot.push(snapshot.get_moves()[0])
+                self.assertEqual(str(state), text)
+
+    def test_default_snapshot_replaces_players(self):
+        from two_player_games.state import State
+
+        class ListState(State):
+            def __init__(self, current_player, other_player):
+                super().__init__(current_player, other_player)
+                self.fields = [current_player, None]
+
+        state = ListState(Player("1"), Player("2"))
+        snapshot = state.snapshot()
+        snapshot.fields[1] = snapshot.get_current_player()
+
+        self.assertIsNot(snapshot.get_current_player(), state.get_current_player())
+        self.assertIs(snapshot.fields[0], snapshot.get_current_player())
+        self.assertIsNone(state.fields[1])
+
+    def test_snapshot_replaces_held_players(self):
+        from two_player_games.games.connect_four import (
+            BitboardConnectFourState,
+            ConnectFourState,
+            ConnectFourMove,
+        )
+
+        for state_class in (ConnectFourState, BitboardConnectFourState):
+            state = state_class((4, 4), Player("1"), Player("2"))
+            for column in (0, 1, 0, 1, 0, 1, 0):
+                state = state.make_move(ConnectFourMove(column))
+            snapshot = state.snapshot()
+            players = set(map(id, snapshot.get_players()))
+
+            self.assertIn(id(snapshot.get_winner()), players)
+            self.assertTrue(
+                {id(field) for column in snapshot.fields for field in column}
+                <= players | {id(None)}
+            )
+
+        for game in TestZobristHashing.get_games(self):
+            for (state,) in play_random((game.state,), seed=0, n_games=1):
+                snapshot = state.snapshot()
+                players = set(map(id, snapshot.get_players()))
+                self.assertIn(id(snapshot.get_winner()), players | {id(None)})
+                self.assertEqual(str(snapshot), str(state))
+                if not snapshot.is_finished():
+                    snapshot.push(snapshot.get_moves()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
-import itertools
-from typing import Iterable, List, Optional
+from typing import Hashable, Iterable, List, Optional, Set, Tuple
 from two_player_games.game import Game
 from two_player_games.move import Move
 from two_player_games.player import Player
 from two_player_games.state import State
+from two_player_games.zobrist import ZobristTable
+
+ZOBRIST = ZobristTable("pick")
 
 
 class Pick(Game):
@@ -39,17 +41,35 @@ class PickMove(Move):
         number: selected number (from 1 to n^2)
     """
 
+    __slots__ = ("number",)
+
     def __init__(self, number: int):
-        self.number = number
+        object.__setattr__(self, "number", number)
 
     def __eq__(self, o: object) -> bool:
         if not isinstance(o, PickMove):
             return False
         return self.number == o.number
 
+    def __hash__(self) -> int:
+        return hash(self.number)
+
+    def __reduce__(self) -> Tuple:
+        return PickMove, (self.number,)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 class PickState(State):
-    """Class that represents a state in the PickState game"""
+    """
+    Class that represents a state in the PickState game
+
+    For each player the state keeps a subset-sum index: a tuple of n + 1 bitsets, where
+    bit s of the k-th one is set if k of the player's numbers sum up to s (sums above
+    the aim value are dropped). The index is extended on every move, so checking for a
+    winner is a single bit lookup.
+    """
 
     def __init__(
         self,
@@ -68,48 +88,77 @@ class PickState(State):
 
         self.current_player_numbers = current_player_numbers
         self.other_player_numbers = other_player_numbers
-        self.selected_numbers = set(self.current_player_numbers).union(
-            self.other_player_numbers
-        )
         self.n = n
         self.max_number = n**2
         self.aim_value = int((n**2 * (n**2 + 1)) / (2 * n))
+        self._current_player_sums = self._get_sums(current_player_numbers)
+        self._other_player_sums = self._get_sums(other_player_numbers)
+        self._selected = 0
+        for number in current_player_numbers + other_player_numbers:
+            self._selected |= 1 << number
+        self._selected_numbers = None
+        self._hash = None
         super().__init__(current_player, other_player)
 
+    @property
+    def selected_numbers(self) -> Set[int]:
+        if self._selected_numbers is None:
+            self._selected_numbers = set(self.current_player_numbers).union(
+                self.other_player_numbers
+            )
+        return self._selected_numbers
+
     def get_moves(self) -> Iterable[PickMove]:
         return [
-            PickMove(number)
+            PickMove.get(number)
             for number in range(1, self.max_number + 1)
-            if number not in self.selected_numbers
+            if not self._selected >> number & 1
         ]
 
     def make_move(self, move: PickMove) -> "PickState":
-        if move.number > self.max_number or move.number in self.selected_numbers:
-            raise ValueError("Invalid move")
-        else:
-            next_player = self._other_player
-            next_player_numbers = self.other_player_numbers
-
-            other_player = self._current_player
-            other_player_numbers = self.current_player_numbers + [move.number]
-
-        return PickState(
-            next_player, other_player, self.n, next_player_numbers, other_player_numbers
+        state = self._copy()
+        state._apply(move)
+        return state
+
+    def push(self, move: PickMove) -> None:
+        self._undo_stack.append(self._apply(move))
+
+    def pop(self) -> PickMove:
+        move, sums, self._hash = self._undo_stack.pop()
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        self.current_player_numbers, self.other_player_numbers = (
+            self.other_player_numbers,
+            self.current_player_numbers,
+        )
+        self.current_player_numbers.pop()
+        self._current_player_sums, self._other_player_sums = (
+            sums,
+            self._current_player_sums,
         )
+        self._selected &= ~(1 << move.number)
+        self._selected_numbers = None
+        return move
+
+    def snapshot(self) -> "PickState":
+        state = self._copy()
+        state._replace_players(self._get_stand_ins())
+        return state
 
     def is_finished(self) -> bool:
         return (
-            self._check_if_sums_to_aim_value(self.current_player_numbers)
-            or self._check_if_sums_to_aim_value(self.other_player_numbers)
-            or len(self.selected_numbers) == self.max_number
+            self._sums_to_aim_value(self._current_player_sums)
+            or self._sums_to_aim_value(self._other_player_sums)
+            or len(self.current_player_numbers) + len(self.other_player_numbers)
+            == self.max_number
         )
 
     def get_winner(self) -> Optional[Player]:
-        if not self.is_finished():
-            return None
-        if self._check_if_sums_to_aim_value(self.current_player_numbers):
+        if self._sums_to_aim_value(self._current_player_sums):
             return self._current_player
-        elif self._check_if_sums_to_aim_value(self.other_player_numbers):
+        elif self._sums_to_aim_value(self._other_player_sums):
             return self._other_player
         else:
             return None
@@ -123,9 +172,80 @@ class PickState(State):
             f"{'[]' if not self.other_player_numbers else sorted(self.other_player_numbers)}"
         )
 
+    def get_hash(self) -> int:
+        if self._hash is None:
+            self._hash = ZOBRIST.get_key("turn", self._current_player.char)
+            for player, numbers in (
+                (self._current_player, self.current_player_numbers),
+                (self._other_player, self.other_player_numbers),
+            ):
+                for number in numbers:
+                    self._hash ^= ZOBRIST.get_key("number", number, player.char)
+        return self._hash
+
     # below are helper methods for the public interface
 
-    def _check_if_sums_to_aim_value(self, numbers: List[int]) -> bool:
-        return self.aim_value in [
-            sum(i) for i in itertools.combinations(numbers, self.n)
-        ]
+    def _get_key(self) -> Hashable:
+        return (
+            self._current_player.char,
+            frozenset(self.current_player_numbers),
+            self._other_player.char,
+            frozenset(self.other_player_numbers),
+        )
+
+    def _copy(self) -> "PickState":
+        state = PickState.__new__(PickState)
+        State.__init__(state, self._current_player, self._other_player)
+        state.current_player_numbers = list(self.current_player_numbers)
+        state.other_player_numbers = list(self.other_player_numbers)
+        state.n = self.n
+        state.max_number = self.max_number
+        state.aim_value = self.aim_value
+        state._current_player_sums = self._current_player_sums
+        state._other_player_sums = self._other_player_sums
+        state._selected = self._selected
+        state._selected_numbers = None
+        state._hash = self.get_hash()
+        return state
+
+    def _apply(self, move: PickMove) -> Tuple:
+        if not 1 <= move.number <= self.max_number or self._selected >> move.number & 1:
+            raise ValueError("Invalid move")
+
+        undo = move, self._current_player_sums, self.get_hash()
+        self._hash ^= (
+            ZOBRIST.get_key("number", move.number, self._current_player.char)
+            ^ ZOBRIST.get_key("turn", self._current_player.char)
+            ^ ZOBRIST.get_key("turn", self._other_player.char)
+        )
+        self.current_player_numbers.append(move.number)
+        self.current_player_numbers, self.other_player_numbers = (
+            self.other_player_numbers,
+            self.current_player_numbers,
+        )
+        self._current_player_sums, self._other_player_sums = (
+            self._other_player_sums,
+            self._add_to_sums(self._current_player_sums, move.number),
+        )
+        self._selected |= 1 << move.number
+        self._selected_numbers = None
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        return undo
+
+    def _get_sums(self, numbers: List[int]) -> Tuple[int, ...]:
+        sums = (1,) + (0,) * self.n
+        for number in numbers:
+            sums = self._add_to_sums(sums, number)
+        return sums
+
+    def _add_to_sums(self, sums: Tuple[int, ...], number: int) -> Tuple[int, ...]:
+        mask = (1 << self.aim_value + 1) - 1
+        return (sums[0],) + tuple(
+            (sums[k] | sums[k - 1] << number) & mask for k in range(1, self.n + 1)
+        )
+
+    def _sums_to_aim_value(self, sums: Tuple[int, ...]) -> bool:
+        return bool(sums[self.n] >> self.aim_value & 1)
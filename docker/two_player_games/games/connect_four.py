@@ -1,9 +1,11 @@
-from dataclasses import fields
 from two_player_games.move import Move
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
 from two_player_games.game import Game
 from two_player_games.player import Player
 from two_player_games.state import State
+from two_player_games.zobrist import ZobristTable
+
+ZOBRIST = ZobristTable("connect_four")
 
 
 class ConnectFour(Game):
@@ -17,6 +19,7 @@ class ConnectFour(Game):
         size: Tuple[int, int] = (7, 6),
         first_player: Player = None,
         second_player: Player = None,
+        bitboard: bool = True,
     ):
         """
         Initializes game.
@@ -25,11 +28,13 @@ class ConnectFour(Game):
             size: the size of the game as number of columns and rows
             first_player: the player that will go first (if None is passed, a player will be created)
             second_player: the player that will go second (if None is passed, a player will be created)
+            bitboard: if the state should be backed by bitboards instead of lists of players
         """
         self.first_player = first_player or Player(self.FIRST_PLAYER_DEFAULT_CHAR)
         self.second_player = second_player or Player(self.SECOND_PLAYER_DEFAULT_CHAR)
 
-        state = ConnectFourState(size, self.first_player, self.second_player)
+        state_class = BitboardConnectFourState if bitboard else ConnectFourState
+        state = state_class(size, self.first_player, self.second_player)
         super().__init__(state)
 
 
@@ -41,8 +46,10 @@ class ConnectFourMove(Move):
         column: index of the column to put the token to
     """
 
+    __slots__ = ("column",)
+
     def __init__(self, column) -> None:
-        self.column = column
+        object.__setattr__(self, "column", column)
         super().__init__()
 
     def __eq__(self, other: object) -> bool:
@@ -50,6 +57,15 @@ class ConnectFourMove(Move):
             return False
         return self.column == other.column
 
+    def __hash__(self) -> int:
+        return hash(self.column)
+
+    def __reduce__(self) -> Tuple:
+        return ConnectFourMove, (self.column,)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 class ConnectFourState(State):
     """Class that represents the state of the hex game"""
@@ -69,9 +85,11 @@ class ConnectFourState(State):
 
         super().__init__(current_player, other_player)
 
+        self._hash = None
+
     def get_moves(self) -> Iterable[ConnectFourMove]:
         return [
-            ConnectFourMove(i)
+            ConnectFourMove.get(i)
             for i, column in enumerate(self.fields)
             if column[-1] is None
         ]
@@ -80,13 +98,28 @@ class ConnectFourState(State):
         return self._current_player
 
     def make_move(self, move: ConnectFourMove) -> "ConnectFourState":
-        new_fields = [list(column) for column in self.fields]
-        self._put(new_fields, move)
-        return ConnectFourState(
-            current_player=self._other_player,
-            other_player=self._current_player,
-            fields=new_fields,
+        state = self._copy()
+        state._apply(move)
+        return state
+
+    def push(self, move: ConnectFourMove) -> None:
+        self._undo_stack.append(self._apply(move))
+
+    def pop(self) -> ConnectFourMove:
+        move, row, old_hash = self._undo_stack.pop()
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
         )
+        if row is not None:
+            self.fields[move.column][row] = None
+        self._hash = old_hash
+        return move
+
+    def snapshot(self) -> "ConnectFourState":
+        state = self._copy()
+        state._replace_players(self._get_stand_ins())
+        return state
 
     def is_finished(self) -> bool:
         return all(map(all, self.fields)) or self.get_winner() is not None
@@ -129,13 +162,66 @@ class ConnectFourState(State):
 
         return f"Current player: {self._current_player.char}\n{text}"
 
+    def get_hash(self) -> int:
+        if self._hash is None:
+            self._hash = ZOBRIST.get_key("turn", self._current_player.char)
+            for column_id, column in enumerate(self.fields):
+                for row_id, field in enumerate(column):
+                    if field is not None:
+                        self._hash ^= ZOBRIST.get_key(
+                            "field", column_id, row_id, field.char
+                        )
+        return self._hash
+
     # below are helper methods for the public interface
 
-    def _put(self, fields: List[List[Player]], move: ConnectFourMove) -> None:
+    def _replace_players(self, players: Dict[Player, Player]) -> None:
+        super()._replace_players(players)
+        for column in self.fields:
+            for row, field in enumerate(column):
+                if field is not None:
+                    column[row] = players[field]
+
+    def _get_key(self) -> Hashable:
+        return self._current_player.char, tuple(
+            tuple(None if field is None else field.char for field in column)
+            for column in self.fields
+        )
+
+    def _copy(self) -> "ConnectFourState":
+        state = ConnectFourState(
+            current_player=self._current_player,
+            other_player=self._other_player,
+            fields=[list(column) for column in self.fields],
+        )
+        state._hash = self.get_hash()
+        return state
+
+    def _apply(self, move: ConnectFourMove) -> Tuple:
+        old_hash = self.get_hash()
+        row = self._put(self.fields, move)
+        column = move.column % len(self.fields)
+        self._hash = old_hash ^ self._get_hash_delta(column, row)
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        return move, row, old_hash
+
+    def _get_hash_delta(self, column: int, row: Optional[int]) -> int:
+        delta = ZOBRIST.get_key("turn", self._current_player.char) ^ ZOBRIST.get_key(
+            "turn", self._other_player.char
+        )
+        if row is not None:
+            delta ^= ZOBRIST.get_key("field", column, row, self._current_player.char)
+        return delta
+
+    def _put(self, fields: List[List[Player]], move: ConnectFourMove) -> Optional[int]:
         for i, field in enumerate(fields[move.column]):
             if field is None:
                 fields[move.column][i] = self._current_player
-                break
+                return i
+        return None
 
     def _check_four(
         self, start_coords: Tuple[int, int], move_coords: Tuple[int, int]
@@ -151,3 +237,204 @@ class ConnectFourState(State):
             return None
 
         return next(iter(fields))
+
+
+class BitboardConnectFourState(ConnectFourState):
+    """
+    Class that represents the state of the connect four game backed by bitboards.
+
+    The state keeps one integer per player (bit column * rows + row is set if the player
+    has a token there) and the height of every column. A win is detected when a token is
+    dropped, by masking the mover's board with the lines of four that pass through it.
+    `fields` is built lazily, so bots see the same interface as with ConnectFourState.
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = None,
+        current_player: Player = None,
+        other_player: Player = None,
+        fields: List[List[Player]] = None,
+    ):
+        if fields is not None:
+            size = (len(fields), len(fields[0]))
+
+        self.size = size
+        self._current_board = 0
+        self._other_board = 0
+        self._heights = tuple(0 for _ in range(size[0]))
+        self._fields = None
+        self._winner = None
+        self._hash = None
+
+        State.__init__(self, current_player, other_player)
+
+        if fields is not None:
+            self._load_fields(fields)
+
+    @property
+    def fields(self) -> List[List[Player]]:
+        if self._fields is None:
+            cols, rows = self.size
+            self._fields = [
+                [self._get_field(column * rows + row) for row in range(rows)]
+                for column in range(cols)
+            ]
+        return self._fields
+
+    def get_moves(self) -> Iterable[ConnectFourMove]:
+        rows = self.size[1]
+        return [
+            ConnectFourMove.get(i)
+            for i, height in enumerate(self._heights)
+            if height < rows
+        ]
+
+    def make_move(self, move: ConnectFourMove) -> "BitboardConnectFourState":
+        state = self._copy()
+        state._apply(move)
+        return state
+
+    def pop(self) -> ConnectFourMove:
+        move, board, heights, winner, old_hash = self._undo_stack.pop()
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        self._current_board, self._other_board = board, self._current_board
+        column = move.column % self.size[0]
+        if self._fields is not None and heights[column] != self._heights[column]:
+            self._fields[column][heights[column]] = None
+        self._heights = heights
+        self._winner = winner
+        self._hash = old_hash
+        return move
+
+    def is_finished(self) -> bool:
+        return self._winner is not None or min(self._heights) == self.size[1]
+
+    def get_winner(self) -> Optional[Player]:
+        return self._winner
+
+    # below are helper methods for the public interface
+
+    def _replace_players(self, players: Dict[Player, Player]) -> None:
+        # fields are built from the players when needed, so only the winner is held
+        State._replace_players(self, players)
+        if self._winner is not None:
+            self._winner = players[self._winner]
+
+    def _copy(self) -> "BitboardConnectFourState":
+        state = BitboardConnectFourState.__new__(BitboardConnectFourState)
+        State.__init__(state, self._current_player, self._other_player)
+        state.size = self.size
+        state._current_board = self._current_board
+        state._other_board = self._other_board
+        state._heights = self._heights
+        state._fields = None
+        state._winner = self._winner
+        state._hash = self.get_hash()
+        return state
+
+    def _apply(self, move: ConnectFourMove) -> Tuple:
+        cols, rows = self.size
+        # columns are indexed like the lists of ConnectFourState.fields
+        if not -cols <= move.column < cols:
+            raise IndexError("list index out of range")
+        column = move.column % cols
+        undo = move, self._current_board, self._heights, self._winner, self.get_hash()
+
+        # a move to a full column only passes the turn, as in ConnectFourState
+        row = self._heights[column] if self._heights[column] < rows else None
+        board = self._current_board
+        self._hash ^= self._get_hash_delta(column, row)
+        if row is not None:
+            position = column * rows + row
+            board |= 1 << position
+            if self._fields is not None:
+                self._fields[column][row] = self._current_player
+            if self._is_four(board, position):
+                self._winner = self._current_player
+            self._heights = (
+                self._heights[:column] + (row + 1,) + self._heights[column + 1 :]
+            )
+        self._current_board, self._other_board = self._other_board, board
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        return undo
+
+    def _get_key(self) -> Hashable:
+        return (
+            self._current_player.char,
+            self._other_player.char,
+            self._current_board,
+            self._other_board,
+        )
+
+    def _get_field(self, position: int) -> Optional[Player]:
+        if self._current_board >> position & 1:
+            return self._current_player
+        if self._other_board >> position & 1:
+            return self._other_player
+        return None
+
+    def _load_fields(self, fields: List[List[Player]]) -> None:
+        rows = self.size[1]
+        heights = []
+        for column_id, column in enumerate(fields):
+            for row_id, field in enumerate(column):
+                if field is self._current_player:
+                    self._current_board |= 1 << (column_id * rows + row_id)
+                elif field is self._other_player:
+                    self._other_board |= 1 << (column_id * rows + row_id)
+            heights.append(sum(field is not None for field in column))
+        self._heights = tuple(heights)
+
+        if self._has_four(self._current_board):
+            self._winner = self._current_player
+        elif self._has_four(self._other_board):
+            self._winner = self._other_player
+
+    def _is_four(self, board: int, position: int) -> bool:
+        return any(board & line == line for line in _get_lines(self.size)[position])
+
+    def _has_four(self, board: int) -> bool:
+        return any(
+            self._is_four(board, position)
+            for position in range(len(_get_lines(self.size)))
+        )
+
+
+_LINES: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
+
+
+def _get_lines(size: Tuple[int, int]) -> List[Tuple[int, ...]]:
+    """
+    Returns:
+        For every position on a board of the given size, the bit masks of all the lines
+        of four that pass through that position (computed once per board size)
+    """
+    lines = _LINES.get(size)
+    if lines is None:
+        cols, rows = size
+        per_position = [[] for _ in range(cols * rows)]
+        for column in range(cols):
+            for row in range(rows):
+                for d_column, d_row in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_column = column + 3 * d_column
+                    end_row = row + 3 * d_row
+                    if not (0 <= end_column < cols and 0 <= end_row < rows):
+                        continue
+                    positions = [
+                        (column + i * d_column) * rows + row + i * d_row
+                        for i in range(4)
+                    ]
+                    line = sum(1 << position for position in positions)
+                    for position in positions:
+                        per_position[position].append(line)
+        lines = _LINES[size] = [
+            tuple(position_lines) for position_lines in per_position
+        ]
+    return lines
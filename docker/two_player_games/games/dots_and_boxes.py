@@ -1,8 +1,11 @@
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
 from two_player_games.game import Game
 from two_player_games.move import Move
 from two_player_games.player import Player
 from two_player_games.state import State
+from two_player_games.zobrist import ZobristTable
+
+ZOBRIST = ZobristTable("dots_and_boxes")
 
 
 class DotsAndBoxes(Game):
@@ -39,18 +42,37 @@ class DotsAndBoxesMove(Move):
         loc: line coordinates as a tuple: (column, row) for horizontal or (row, column) for vertical
     """
 
+    __slots__ = ("connection", "loc")
+
     def __init__(self, connection: str, loc: Tuple[int, int]):
-        self.connection = connection
-        self.loc = loc
+        object.__setattr__(self, "connection", connection)
+        object.__setattr__(self, "loc", tuple(loc))
 
     def __eq__(self, o: object) -> bool:
         if not isinstance(o, DotsAndBoxesMove):
             return False
         return self.connection == o.connection and self.loc == o.loc
 
+    def __hash__(self) -> int:
+        return hash((self.connection, self.loc))
+
+    def __reduce__(self) -> Tuple:
+        return DotsAndBoxesMove, (self.connection, self.loc)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 class DotsAndBoxesState(State):
-    """Class that represents a state in the dots and boxes game"""
+    """
+    Class that represents a state in the dots and boxes game
+
+    Lines are kept as two bitsets (bit col * (size + 1) + row of horizontal lines and
+    bit row * (size + 1) + col of vertical lines), boxes as a counter of drawn sides
+    (3 bits per box) and a bitset of owned boxes per player. Scores and the number of
+    free lines are maintained on every move, and `horizontals`, `verticals` and `boxes`
+    are built lazily from the bitsets.
+    """
 
     def __init__(
         self,
@@ -63,66 +85,96 @@ class DotsAndBoxesState(State):
     ):
         """Creates the state. Do not call directly."""
 
+        super().__init__(current_player, other_player)
+
         if horizontals and verticals and boxes:
-            self.horizontals = horizontals
-            self.verticals = verticals
-            self.boxes = boxes
+            self._load(horizontals, verticals, boxes)
         elif size:
-            self.horizontals = [[False for _ in range(size + 1)] for _ in range(size)]
-            self.verticals = [[False for _ in range(size + 1)] for _ in range(size)]
-            self.boxes = [[None for _ in range(size)] for _ in range(size)]
+            self.size = size
+            self._horizontal_lines = 0
+            self._vertical_lines = 0
+            self._box_sides = 0
+            self._owned = {current_player: 0, other_player: 0}
+            self._scores = {current_player: 0, other_player: 0}
+            self._free_lines = 2 * size * (size + 1)
         else:
             raise ValueError("Cannot initialize state, parameters missing")
 
-        super().__init__(current_player, other_player)
+        self._hash = None
+        self._clear_cache()
+
+    @property
+    def horizontals(self) -> List[List[bool]]:
+        if self._horizontals is None:
+            self._horizontals = self._unpack_lines(self._horizontal_lines)
+        return self._horizontals
+
+    @property
+    def verticals(self) -> List[List[bool]]:
+        if self._verticals is None:
+            self._verticals = self._unpack_lines(self._vertical_lines)
+        return self._verticals
+
+    @property
+    def boxes(self) -> List[List[Player]]:
+        if self._boxes is None:
+            self._boxes = [
+                [self._get_owner(row * self.size + col) for col in range(self.size)]
+                for row in range(self.size)
+            ]
+        return self._boxes
 
     def get_moves(self) -> Iterable[DotsAndBoxesMove]:
-        return [
-            DotsAndBoxesMove("h", loc) for loc in self._get_free_lines(self.horizontals)
-        ] + [DotsAndBoxesMove("v", loc) for loc in self._get_free_lines(self.verticals)]
+        if self._moves is None:
+            self._moves = [
+                DotsAndBoxesMove.get("h", loc)
+                for loc in self._get_free_lines(self._horizontal_lines)
+            ] + [
+                DotsAndBoxesMove.get("v", loc)
+                for loc in self._get_free_lines(self._vertical_lines)
+            ]
+        return list(self._moves)
 
     def make_move(self, move: DotsAndBoxesMove) -> "DotsAndBoxesState":
-        collection = self.horizontals if move.connection == "h" else self.verticals
-        if collection[move.loc[0]][move.loc[1]]:
-            raise ValueError("Invalid move")
-
-        horizontals = (
-            self._set(self.horizontals, move.loc)
-            if move.connection == "h"
-            else self.horizontals
-        )
-        verticals = (
-            self._set(self.verticals, move.loc)
-            if move.connection == "v"
-            else self.verticals
-        )
-        boxes, changed = self._check_boxes_after_move(horizontals, verticals, move)
-
-        if changed:
-            next_player = self._current_player
-            other_player = self._other_player
-        else:
-            next_player = self._other_player
-            other_player = self._current_player
-
-        return DotsAndBoxesState(
-            next_player,
-            other_player,
-            horizontals=horizontals,
-            verticals=verticals,
-            boxes=boxes,
-        )
+        state = self._copy()
+        state._apply(move)
+        return state
+
+    def push(self, move: DotsAndBoxesMove) -> None:
+        self._undo_stack.append(self._apply(move))
+
+    def pop(self) -> DotsAndBoxesMove:
+        (
+            move,
+            self._current_player,
+            self._other_player,
+            self._horizontal_lines,
+            self._vertical_lines,
+            self._box_sides,
+            self._owned,
+            self._scores,
+            self._hash,
+        ) = self._undo_stack.pop()
+        self._free_lines += 1
+        self._clear_cache()
+        return move
+
+    def snapshot(self) -> "DotsAndBoxesState":
+        state = self._copy()
+        state._replace_players(self._get_stand_ins())
+        return state
 
     def is_finished(self) -> bool:
-        return all(all(box_row) for box_row in self.boxes)
+        return self._free_lines == 0
 
     def get_winner(self) -> Optional[Player]:
         if not self.is_finished():
             return None
-        scores = self.get_scores()
-        if scores[self._current_player] > scores[self._other_player]:
+        current_score = self._scores[self._current_player]
+        other_score = self._scores[self._other_player]
+        if current_score > other_score:
             return self._current_player
-        elif scores[self._current_player] < scores[self._other_player]:
+        elif current_score < other_score:
             return self._other_player
         else:
             return None
@@ -139,106 +191,191 @@ class DotsAndBoxesState(State):
         return f"Current player: {self._current_player.char}\n" + "\n".join(text)
 
     def get_scores(self) -> Dict[Player, int]:
-        scores = {self._current_player: 0, self._other_player: 0}
-
-        for row in self.boxes:
-            for box in row:
-                if box:
-                    scores[box] += 1
-
-        return scores
+        return {
+            self._current_player: self._scores[self._current_player],
+            self._other_player: self._scores[self._other_player],
+        }
+
+    def get_hash(self) -> int:
+        if self._hash is None:
+            self._hash = ZOBRIST.get_key("turn", self._current_player.char)
+            for line in range(self.size * (self.size + 1)):
+                if self._horizontal_lines >> line & 1:
+                    self._hash ^= ZOBRIST.get_key("h", line)
+                if self._vertical_lines >> line & 1:
+                    self._hash ^= ZOBRIST.get_key("v", line)
+            for player, owned in self._owned.items():
+                for box in range(self.size**2):
+                    if owned >> box & 1:
+                        self._hash ^= ZOBRIST.get_key("box", box, player.char)
+        return self._hash
 
     # below are helper methods for the public interface
 
-    def _get_free_lines(self, collection: List[List[bool]]) -> List[Tuple[int, int]]:
-        return [
-            (loc1, loc2)
-            for loc1, subcol in enumerate(collection)
-            for loc2, line in enumerate(subcol)
-            if not line
-        ]
+    def _get_key(self) -> Hashable:
+        return (
+            self._current_player.char,
+            self._horizontal_lines,
+            self._vertical_lines,
+            frozenset((player.char, owned) for player, owned in self._owned.items()),
+        )
 
-    def _set(
-        self, collection: List[List[bool]], loc: Tuple[int, int]
-    ) -> List[List[bool]]:
-        return [
-            (
-                [True if loc2 == loc[1] else line for loc2, line in enumerate(subcol)]
-                if loc1 == loc[0]
-                else subcol
-            )
-            for loc1, subcol in enumerate(collection)
-        ]
+    def _replace_players(self, players: Dict[Player, Player]) -> None:
+        super()._replace_players(players)
+        self._owned = {players[player]: owned for player, owned in self._owned.items()}
+        self._scores = {
+            players[player]: score for player, score in self._scores.items()
+        }
+
+    def _copy(self) -> "DotsAndBoxesState":
+        state = DotsAndBoxesState.__new__(DotsAndBoxesState)
+        State.__init__(state, self._current_player, self._other_player)
+        state.size = self.size
+        state._horizontal_lines = self._horizontal_lines
+        state._vertical_lines = self._vertical_lines
+        state._box_sides = self._box_sides
+        state._owned = self._owned
+        state._scores = self._scores
+        state._free_lines = self._free_lines
+        state._hash = self.get_hash()
+        state._clear_cache()
+        return state
+
+    def _apply(self, move: DotsAndBoxesMove) -> Tuple:
+        line = self._get_line(move)
+        if move.connection == "h":
+            if self._horizontal_lines >> line & 1:
+                raise ValueError("Invalid move")
+            adjacent_boxes = _get_adjacent_boxes(self.size)[0][line]
+        else:
+            if self._vertical_lines >> line & 1:
+                raise ValueError("Invalid move")
+            adjacent_boxes = _get_adjacent_boxes(self.size)[1][line]
+
+        undo = (
+            move,
+            self._current_player,
+            self._other_player,
+            self._horizontal_lines,
+            self._vertical_lines,
+            self._box_sides,
+            self._owned,
+            self._scores,
+            self.get_hash(),
+        )
 
-    def _check_box(self, horizontals, verticals, col, row) -> Player:
-        if self.boxes[row][col]:
-            return self.boxes[row][col]
+        self._hash ^= ZOBRIST.get_key(move.connection, line)
+        if move.connection == "h":
+            self._horizontal_lines |= 1 << line
+        else:
+            self._vertical_lines |= 1 << line
+
+        completed = 0
+        n_completed = 0
+        for box in adjacent_boxes:
+            self._box_sides += 1 << 3 * box
+            if self._box_sides >> 3 * box & 7 == 4:
+                completed |= 1 << box
+                n_completed += 1
+                self._hash ^= ZOBRIST.get_key("box", box, self._current_player.char)
+
+        if completed:
+            # owned and scores may be shared with other states, so they are copied
+            self._owned = dict(self._owned)
+            self._owned[self._current_player] |= completed
+            self._scores = dict(self._scores)
+            self._scores[self._current_player] += n_completed
+        else:
+            self._hash ^= ZOBRIST.get_key(
+                "turn", self._current_player.char
+            ) ^ ZOBRIST.get_key("turn", self._other_player.char)
+            self._current_player, self._other_player = (
+                self._other_player,
+                self._current_player,
+            )
 
-        if (
-            horizontals[col][row]
-            and horizontals[col][row + 1]
-            and verticals[row][col]
-            and verticals[row][col + 1]
-        ):
-            return self._current_player
+        self._free_lines -= 1
+        self._clear_cache()
+        return undo
 
-        return None
+    def _clear_cache(self) -> None:
+        self._horizontals = None
+        self._verticals = None
+        self._boxes = None
+        self._moves = None
 
-    def _check_boxes_after_move(
+    def _load(
         self,
         horizontals: List[List[bool]],
         verticals: List[List[bool]],
-        move: DotsAndBoxesMove,
-    ) -> Tuple[List[List[Player]], bool]:
-        box1_col = None
-        box1_row = None
-
-        box2_col = None
-        box2_row = None
-
-        if move.connection == "h":
-            col, row = move.loc
-            if row > 0:
-                box1_col = col
-                box1_row = row - 1
-            if row < len(self.boxes):
-                box2_col = col
-                box2_row = row
-        else:
-            row, col = move.loc
-            if col > 0:
-                box1_col = col - 1
-                box1_row = row
-            if col < len(self.boxes[0]):
-                box2_col = col
-                box2_row = row
-
-        new_boxes = [
-            (
-                [
-                    (
-                        self._check_box(horizontals, verticals, col, row)
-                        if col in (box1_col, box2_col)
-                        else box
+        boxes: List[List[Player]],
+    ) -> None:
+        self.size = len(boxes)
+        self._horizontal_lines = self._pack_lines(horizontals)
+        self._vertical_lines = self._pack_lines(verticals)
+
+        self._box_sides = 0
+        self._owned = {self._current_player: 0, self._other_player: 0}
+        self._scores = {self._current_player: 0, self._other_player: 0}
+        for row, row_boxes in enumerate(boxes):
+            for col, box in enumerate(row_boxes):
+                sides = (
+                    horizontals[col][row]
+                    + horizontals[col][row + 1]
+                    + verticals[row][col]
+                    + verticals[row][col + 1]
+                )
+                self._box_sides |= sides << 3 * (row * self.size + col)
+                if box:
+                    self._owned[box] = self._owned.get(box, 0) | 1 << (
+                        row * self.size + col
                     )
-                    for col, box in enumerate(row_boxes)
-                ]
-                if row in (box1_row, box2_row)
-                else row_boxes
-            )
-            for row, row_boxes in enumerate(self.boxes)
+                    self._scores[box] = self._scores.get(box, 0) + 1
+
+        n_drawn = bin(self._horizontal_lines).count("1") + bin(
+            self._vertical_lines
+        ).count("1")
+        self._free_lines = 2 * self.size * (self.size + 1) - n_drawn
+
+    def _pack_lines(self, collection: List[List[bool]]) -> int:
+        lines = 0
+        for loc1, subcol in enumerate(collection):
+            for loc2, line in enumerate(subcol):
+                if line:
+                    lines |= 1 << (loc1 * (self.size + 1) + loc2)
+        return lines
+
+    def _unpack_lines(self, lines: int) -> List[List[bool]]:
+        return [
+            [
+                bool(lines >> (loc1 * (self.size + 1) + loc2) & 1)
+                for loc2 in range(self.size + 1)
+            ]
+            for loc1 in range(self.size)
         ]
 
-        changed = False
-        if box1_col is not None:
-            if self.boxes[box1_row][box1_col] != new_boxes[box1_row][box1_col]:
-                changed = True
+    def _get_free_lines(self, lines: int) -> List[Tuple[int, int]]:
+        return [
+            divmod(line, self.size + 1)
+            for line in range(self.size * (self.size + 1))
+            if not lines >> line & 1
+        ]
 
-        if box2_col is not None:
-            if self.boxes[box2_row][box2_col] != new_boxes[box2_row][box2_col]:
-                changed = True
+    def _get_line(self, move: DotsAndBoxesMove) -> int:
+        # coordinates are indexed like the size x (size + 1) lists of lines
+        loc1, loc2 = move.loc
+        if (
+            not -self.size <= loc1 < self.size
+            or not -self.size - 1 <= loc2 <= self.size
+        ):
+            raise IndexError("list index out of range")
+        return loc1 % self.size * (self.size + 1) + loc2 % (self.size + 1)
 
-        return new_boxes, changed
+    def _get_owner(self, box: int) -> Optional[Player]:
+        for player, owned in self._owned.items():
+            if owned >> box & 1:
+                return player
+        return None
 
     def _lines_row_to_str(self, row):
         return (
@@ -254,3 +391,36 @@ class DotsAndBoxesState(State):
         chars.append("|" if self.verticals[row][-1] else " ")
 
         return "".join(chars)
+
+
+_ADJACENT_BOXES: Dict[int, Tuple[List[Tuple[int, ...]], List[Tuple[int, ...]]]] = {}
+
+
+def _get_adjacent_boxes(
+    size: int,
+) -> Tuple[List[Tuple[int, ...]], List[Tuple[int, ...]]]:
+    """
+    Returns:
+        For every horizontal and every vertical line of a board of the given size,
+        the indices (row * size + col) of the boxes it borders (computed once per size)
+    """
+    adjacent_boxes = _ADJACENT_BOXES.get(size)
+    if adjacent_boxes is None:
+        horizontal = []
+        vertical = []
+        for loc1 in range(size):
+            for loc2 in range(size + 1):
+                # horizontal line (col, row) borders boxes above and below it
+                horizontal.append(
+                    tuple(
+                        row * size + loc1 for row in (loc2 - 1, loc2) if 0 <= row < size
+                    )
+                )
+                # vertical line (row, col) borders boxes to the left and right of it
+                vertical.append(
+                    tuple(
+                        loc1 * size + col for col in (loc2 - 1, loc2) if 0 <= col < size
+                    )
+                )
+        adjacent_boxes = _ADJACENT_BOXES[size] = (horizontal, vertical)
+    return adjacent_boxes
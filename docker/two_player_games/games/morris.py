@@ -1,8 +1,11 @@
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
 from two_player_games.game import Game
 from two_player_games.move import Move
 from two_player_games.player import Player
 from two_player_games.state import State
+from two_player_games.zobrist import ZobristTable
+
+ZOBRIST = ZobristTable("morris")
 
 
 class Morris(Game):
@@ -123,15 +126,17 @@ class MorrisMove(Move):
      - additionally, an enemy pawn may be removed
     """
 
+    __slots__ = ("take_pawn", "place_pawn", "remove_pawn")
+
     def __init__(
         self,
         take_pawn: Optional[int] = None,
         place_pawn: Optional[int] = None,
         remove_pawn: Optional[int] = None,
     ) -> None:
-        self.take_pawn = take_pawn
-        self.place_pawn = place_pawn
-        self.remove_pawn = remove_pawn
+        object.__setattr__(self, "take_pawn", take_pawn)
+        object.__setattr__(self, "place_pawn", place_pawn)
+        object.__setattr__(self, "remove_pawn", remove_pawn)
 
         super().__init__()
 
@@ -144,6 +149,15 @@ class MorrisMove(Move):
             and self.remove_pawn == o.remove_pawn
         )
 
+    def __hash__(self) -> int:
+        return hash((self.take_pawn, self.place_pawn, self.remove_pawn))
+
+    def __reduce__(self) -> Tuple:
+        return MorrisMove, (self.take_pawn, self.place_pawn, self.remove_pawn)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 class MorrisState(State):
     """Represents a state in the morris game. Current implementation does not allow flying."""
@@ -161,12 +175,14 @@ class MorrisState(State):
         n_moves: int = None,
         placed_pawns: Dict[Player, int] = None,
         grid: List[Optional[Player]] = None,
+        tables: "MorrisTables" = None,
     ) -> None:
         self.n_pawns = n_pawns
         self.size = size
         self.connections = connections
         self.possible_morrises = possible_morrises
         self.moves_limit = moves_limit
+        self.tables = tables or MorrisTables(size, connections, possible_morrises)
 
         self.grid_str = grid_str
 
@@ -181,39 +197,45 @@ class MorrisState(State):
 
         super().__init__(current_player, other_player)
 
-        self.finished, self.winner = self.check_finished()
+        self._result = None
+        self._hash = None
 
-    def check_finished(self) -> Tuple[bool, Optional[Player]]:
-        pawns = {
-            self._current_player: self.n_pawns
-            - self.placed_pawns[self._current_player],
-            self._other_player: self.n_pawns - self.placed_pawns[self._other_player],
-        }
+    @property
+    def finished(self) -> bool:
+        if self._result is None:
+            self._result = self.check_finished()
+        return self._result[0]
 
-        for field in self.grid:
-            if field is not None:
-                pawns[field] += 1
+    @property
+    def winner(self) -> Optional[Player]:
+        if self._result is None:
+            self._result = self.check_finished()
+        return self._result[1]
 
-        if pawns[self._current_player] < 3:
+    def check_finished(self) -> Tuple[bool, Optional[Player]]:
+        current_pawns = (
+            self.n_pawns
+            - self.placed_pawns[self._current_player]
+            + self.grid.count(self._current_player)
+        )
+        other_pawns = (
+            self.n_pawns
+            - self.placed_pawns[self._other_player]
+            + self.grid.count(self._other_player)
+        )
+
+        if current_pawns < 3:
             return True, self._other_player
-        elif pawns[self._other_player] < 3:
+        elif other_pawns < 3:
             return True, self._current_player
 
-        available_move = False
-        if self.placed_pawns[self._current_player] < self.n_pawns:
-            for field in self.grid:
-                if field is None:
-                    available_move = True
-                    break
-        for connection in self.connections:
-            if (
-                self.grid[connection[0]] is self._current_player
-                and self.grid[connection[1]] is None
-                or self.grid[connection[1]] is self._current_player
-                and self.grid[connection[0]] is None
-            ):
-                available_move = True
-                break
+        available_move = (
+            self.placed_pawns[self._current_player] < self.n_pawns and None in self.grid
+        ) or any(
+            self.grid[neighbour] is None
+            for field in self._get_pawns(self._current_player)
+            for _, neighbour in self.tables.neighbours[field]
+        )
 
         if not available_move:
             return True, self._other_player
@@ -227,99 +249,72 @@ class MorrisState(State):
         if self.placed_pawns[self._current_player] < self.n_pawns:
             moves = [(None, i) for i, field in enumerate(self.grid) if field is None]
         else:
-            moves = []
-            for connection in self.connections:
-                if (
-                    self.grid[connection[0]] is self._current_player
-                    and self.grid[connection[1]] is None
-                ):
-                    moves.append((connection[0], connection[1]))
-                if (
-                    self.grid[connection[1]] is self._current_player
-                    and self.grid[connection[0]] is None
-                ):
-                    moves.append((connection[1], connection[0]))
-
-        other_player_pawns = {
-            i for i, field in enumerate(self.grid) if field == self._other_player
-        }
-        other_player_pawns_in_morrises = set()
-        for morris in self.possible_morrises:
-            if all(self.grid[i] == self._other_player for i in morris):
-                other_player_pawns_in_morrises.update(morris)
+            # sorted by connection index, so that moves keep the order of `connections`
+            moves = [
+                (field, neighbour)
+                for _, field, neighbour in sorted(
+                    (connection, field, neighbour)
+                    for field in self._get_pawns(self._current_player)
+                    for connection, neighbour in self.tables.neighbours[field]
+                    if self.grid[neighbour] is None
+                )
+            ]
 
-        other_player_pawns_not_in_morrises = other_player_pawns.difference(
-            other_player_pawns_in_morrises
-        )
+        other_player_pawns = self._get_pawns(self._other_player)
+        other_player_pawns_not_in_morrises = [
+            field
+            for field in other_player_pawns
+            if not self._is_in_morris(field, self._other_player)
+        ]
 
         if other_player_pawns_not_in_morrises:
             removables = other_player_pawns_not_in_morrises
         else:
-            removables = other_player_pawns_in_morrises
+            removables = other_player_pawns
 
         moves_list = []
 
         for move in moves:
-            makes_morris = False
-            for morris in self.possible_morrises:
-                if move[0] not in morris and move[1] in morris:
-                    if (
-                        len([i for i in morris if self.grid[i] == self._current_player])
-                        == 2
-                    ):
-                        makes_morris = True
-                        break
-
-            if makes_morris:
+            if self._makes_morris(*move):
                 moves_list.extend(
-                    MorrisMove(*move, removable) for removable in removables
+                    MorrisMove.get(*move, removable) for removable in removables
                 )
             else:
-                moves_list.append(MorrisMove(*move, None))
+                moves_list.append(MorrisMove.get(*move, None))
 
         return moves_list
 
     def make_move(self, move: MorrisMove) -> "MorrisState":
-        if self.finished:
-            raise ValueError("Cannot make move on finished game")
-        new_grid = list(self.grid)
-        n_moves = self.n_moves
-        new_placed_pawns = dict(self.placed_pawns)
-
-        if move.take_pawn is not None:
-            if self.grid[move.take_pawn] is not self._current_player:
-                raise ValueError("Cannot move pawn from empty space")
-            new_grid[move.take_pawn] = None
-        else:
-            if self.placed_pawns[self._current_player] == self.n_pawns:
-                raise ValueError("Maximum pawns number already placed")
-            new_placed_pawns[self._current_player] += 1
-
-        if self.grid[move.place_pawn] is not None:
-            raise ValueError("Cannot place pawn at occupied space")
-        new_grid[move.place_pawn] = self._current_player
-
-        if move.remove_pawn is not None:
-            if self.grid[move.remove_pawn] is not self._other_player:
-                raise ValueError("Cannot remove pawn from empty space")
-            new_grid[move.remove_pawn] = None
-            n_moves = 0
-        else:
-            n_moves += 1
-
-        return MorrisState(
-            self.n_pawns,
-            self.size,
-            self.connections,
-            self.possible_morrises,
-            self.moves_limit,
-            self.grid_str,
+        state = self._copy()
+        state._apply(move)
+        return state
+
+    def push(self, move: MorrisMove) -> None:
+        self._undo_stack.append(self._apply(move))
+
+    def pop(self) -> MorrisMove:
+        (
+            move,
+            self.n_moves,
+            self.placed_pawns,
+            self._result,
+            self._hash,
+        ) = self._undo_stack.pop()
+        self._current_player, self._other_player = (
             self._other_player,
             self._current_player,
-            n_moves,
-            new_placed_pawns,
-            new_grid,
         )
+        if move.remove_pawn is not None:
+            self.grid[move.remove_pawn] = self._other_player
+        self.grid[move.place_pawn] = None
+        if move.take_pawn is not None:
+            self.grid[move.take_pawn] = self._current_player
+        return move
+
+    def snapshot(self) -> "MorrisState":
+        state = self._copy()
+        state._replace_players(self._get_stand_ins())
+        return state
 
     def is_finished(self) -> bool:
         return self.finished
@@ -354,3 +349,160 @@ class MorrisState(State):
             + current_player_text
             + finished_text
         )
+
+    def get_hash(self) -> int:
+        if self._hash is None:
+            self._hash = ZOBRIST.get_key(
+                "turn", self._current_player.char
+            ) ^ ZOBRIST.get_key("n_moves", self.n_moves)
+            for player, placed_pawns in self.placed_pawns.items():
+                self._hash ^= ZOBRIST.get_key("placed", player.char, placed_pawns)
+            for i, field in enumerate(self.grid):
+                if field is not None:
+                    self._hash ^= ZOBRIST.get_key("field", i, field.char)
+        return self._hash
+
+    # below are helper methods for the public interface
+
+    def _get_key(self) -> Hashable:
+        return (
+            self._current_player.char,
+            tuple(None if field is None else field.char for field in self.grid),
+            frozenset(
+                (player.char, placed_pawns)
+                for player, placed_pawns in self.placed_pawns.items()
+            ),
+            self.n_moves,
+        )
+
+    def _replace_players(self, players: Dict[Player, Player]) -> None:
+        super()._replace_players(players)
+        self.placed_pawns = {
+            players[player]: placed for player, placed in self.placed_pawns.items()
+        }
+        self.grid = [None if field is None else players[field] for field in self.grid]
+        if self._result is not None and self._result[1] is not None:
+            self._result = self._result[0], players[self._result[1]]
+
+    def _copy(self) -> "MorrisState":
+        state = MorrisState(
+            self.n_pawns,
+            self.size,
+            self.connections,
+            self.possible_morrises,
+            self.moves_limit,
+            self.grid_str,
+            self._current_player,
+            self._other_player,
+            self.n_moves,
+            self.placed_pawns,
+            list(self.grid),
+            self.tables,
+        )
+        state._result = self._result
+        state._hash = self.get_hash()
+        return state
+
+    def _apply(self, move: MorrisMove) -> Tuple:
+        if self.finished:
+            raise ValueError("Cannot make move on finished game")
+        if move.take_pawn is not None:
+            if self.grid[move.take_pawn] is not self._current_player:
+                raise ValueError("Cannot move pawn from empty space")
+        elif self.placed_pawns[self._current_player] == self.n_pawns:
+            raise ValueError("Maximum pawns number already placed")
+        if self.grid[move.place_pawn] is not None:
+            raise ValueError("Cannot place pawn at occupied space")
+        if (
+            move.remove_pawn is not None
+            and self.grid[move.remove_pawn] is not self._other_player
+        ):
+            raise ValueError("Cannot remove pawn from empty space")
+
+        undo = move, self.n_moves, self.placed_pawns, self._result, self.get_hash()
+        current_char = self._current_player.char
+        self._hash ^= ZOBRIST.get_key("turn", current_char) ^ ZOBRIST.get_key(
+            "turn", self._other_player.char
+        )
+
+        if move.take_pawn is not None:
+            self.grid[move.take_pawn] = None
+            self._hash ^= ZOBRIST.get_key("field", move.take_pawn, current_char)
+        else:
+            # placed_pawns may be shared with other states, so it is copied
+            placed_pawns = self.placed_pawns[self._current_player]
+            self.placed_pawns = dict(self.placed_pawns)
+            self.placed_pawns[self._current_player] += 1
+            self._hash ^= ZOBRIST.get_key(
+                "placed", current_char, placed_pawns
+            ) ^ ZOBRIST.get_key("placed", current_char, placed_pawns + 1)
+
+        self.grid[move.place_pawn] = self._current_player
+        self._hash ^= ZOBRIST.get_key("field", move.place_pawn, current_char)
+
+        n_moves = self.n_moves
+        if move.remove_pawn is not None:
+            self.grid[move.remove_pawn] = None
+            self._hash ^= ZOBRIST.get_key(
+                "field", move.remove_pawn, self._other_player.char
+            )
+            self.n_moves = 0
+        else:
+            self.n_moves += 1
+        self._hash ^= ZOBRIST.get_key("n_moves", n_moves) ^ ZOBRIST.get_key(
+            "n_moves", self.n_moves
+        )
+
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        self._result = None
+        return undo
+
+    def _get_pawns(self, player: Player) -> List[int]:
+        return [i for i, field in enumerate(self.grid) if field is player]
+
+    def _is_in_morris(self, field: int, player: Player) -> bool:
+        return any(
+            all(self.grid[i] is player for i in morris)
+            for morris in self.tables.morrises[field]
+        )
+
+    def _makes_morris(self, take_pawn: Optional[int], place_pawn: int) -> bool:
+        return any(
+            take_pawn not in morris
+            and all(
+                self.grid[i] is self._current_player for i in morris if i != place_pawn
+            )
+            for morris in self.tables.morrises[place_pawn]
+        )
+
+
+class MorrisTables:
+    """
+    Lookup tables of a morris board, shared by all the states of a game.
+
+    Variables:
+        neighbours: for every field, (connection index, neighbouring field) pairs
+        morrises: for every field, the possible morrises that contain it
+    """
+
+    def __init__(
+        self,
+        size: int,
+        connections: List[Tuple[int, int]],
+        possible_morrises: List[Tuple[int, int, int]],
+    ) -> None:
+        neighbours = [[] for _ in range(size)]
+        for i, (field_1, field_2) in enumerate(connections):
+            neighbours[field_1].append((i, field_2))
+            neighbours[field_2].append((i, field_1))
+
+        morrises = [[] for _ in range(size)]
+        for morris in possible_morrises:
+            for field in morris:
+                morrises[field].append(tuple(morris))
+
+        self.neighbours = tuple(tuple(field) for field in neighbours)
+        self.morrises = tuple(tuple(field) for field in morrises)
@@ -1,8 +1,11 @@
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Hashable, Iterable, Iterator, Optional, Tuple
 from two_player_games.game import Game
 from two_player_games.move import Move
 from two_player_games.player import Player
 from two_player_games.state import State
+from two_player_games.zobrist import ZobristTable
+
+ZOBRIST = ZobristTable("nim")
 
 
 class Nim(Game):
@@ -42,15 +45,26 @@ class NimMove(Move):
         n: number of elements to take
     """
 
+    __slots__ = ("heap", "n")
+
     def __init__(self, heap: int, n: int):
-        self.heap = heap
-        self.n = n
+        object.__setattr__(self, "heap", heap)
+        object.__setattr__(self, "n", n)
 
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, NimMove):
             return False
         return self.heap == value.heap and self.n == value.n
 
+    def __hash__(self) -> int:
+        return hash((self.heap, self.n))
+
+    def __reduce__(self) -> Tuple:
+        return NimMove, (self.heap, self.n)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
 
 class NimState(State):
     """Class that represents a state in the nim game (misere variant)"""
@@ -65,20 +79,68 @@ class NimState(State):
 
         super().__init__(current_player, other_player)
 
+        self._nim_sum = None
+        self._winning = None
+        self._hash = None
+
     def get_moves(self) -> Iterable[NimMove]:
-        return [
-            NimMove(i, n)
-            for i, heap in enumerate(self.heaps)
-            for n in range(1, heap + 1)
-        ]
+        return list(self.iter_moves())
+
+    def iter_moves(self) -> Iterator[NimMove]:
+        """
+        Returns:
+            Generator of possible moves, in the same order as get_moves
+        """
+        for i, heap in enumerate(self.heaps):
+            for n in range(1, heap + 1):
+                yield NimMove.get(i, n)
+
+    def get_nim_sum(self) -> int:
+        """
+        Returns:
+            Xor of the heap sizes (the Sprague-Grundy value of the position)
+        """
+        if self._nim_sum is None:
+            nim_sum = 0
+            for heap in self.heaps:
+                nim_sum ^= heap
+            self._nim_sum = nim_sum
+        return self._nim_sum
+
+    def is_winning(self) -> bool:
+        """
+        Returns:
+            If the current player wins with perfect play under misere rules
+        """
+        if self._winning is None:
+            if all(heap <= 1 for heap in self.heaps):
+                self._winning = sum(self.heaps) % 2 == 0
+            else:
+                self._winning = self.get_nim_sum() != 0
+        return self._winning
 
     def make_move(self, move: NimMove) -> "NimState":
-        assert move.n > 0 and self.heaps[move.heap] >= move.n
-        heaps = tuple(
-            heap - move.n if i == move.heap else heap
-            for i, heap in enumerate(self.heaps)
+        state = self._copy()
+        state._apply(move)
+        return state
+
+    def push(self, move: NimMove) -> None:
+        self._undo_stack.append(self._apply(move))
+
+    def pop(self) -> NimMove:
+        move, self.heaps, self._nim_sum, self._winning, self._hash = (
+            self._undo_stack.pop()
         )
-        return NimState(self._other_player, self._current_player, heaps)
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        return move
+
+    def snapshot(self) -> "NimState":
+        state = self._copy()
+        state._replace_players(self._get_stand_ins())
+        return state
 
     def is_finished(self) -> bool:
         return all(heap == 0 for heap in self.heaps)
@@ -101,3 +163,43 @@ class NimState(State):
             text.append(str(i + 1) + ": " + "|" * heap)
 
         return "\n".join(text)
+
+    def get_hash(self) -> int:
+        if self._hash is None:
+            self._hash = ZOBRIST.get_key("turn", self._current_player.char)
+            for i, heap in enumerate(self.heaps):
+                self._hash ^= ZOBRIST.get_key("heap", i, heap)
+        return self._hash
+
+    # below are helper methods for the public interface
+
+    def _get_key(self) -> Hashable:
+        return self._current_player.char, self.heaps
+
+    def _copy(self) -> "NimState":
+        state = NimState(self._current_player, self._other_player, self.heaps)
+        state._nim_sum = self._nim_sum
+        state._winning = self._winning
+        state._hash = self.get_hash()
+        return state
+
+    def _apply(self, move: NimMove) -> Tuple:
+        assert move.n > 0 and self.heaps[move.heap] >= move.n
+        undo = move, self.heaps, self._nim_sum, self._winning, self.get_hash()
+        heap = self.heaps[move.heap]
+        self.heaps = (
+            self.heaps[: move.heap] + (heap - move.n,) + self.heaps[move.heap + 1 :]
+        )
+        self._hash ^= (
+            ZOBRIST.get_key("heap", move.heap, heap)
+            ^ ZOBRIST.get_key("heap", move.heap, heap - move.n)
+            ^ ZOBRIST.get_key("turn", self._current_player.char)
+            ^ ZOBRIST.get_key("turn", self._other_player.char)
+        )
+        self._current_player, self._other_player = (
+            self._other_player,
+            self._current_player,
+        )
+        self._nim_sum = None
+        self._winning = None
+        return undo
@@ -1,3 +1,29 @@
+from typing import Any, Dict, Tuple
+
+
 class Move:
-    """A base class for classes that represent moves in games"""
-    pass
+    """
+    A base class for classes that represent moves in games
+
+    Every subclass gets its own table of interned moves, so games can hand out shared
+    instances from get_moves instead of allocating new ones for every call.
+    """
+
+    __slots__ = ()
+
+    _interned: Dict[Tuple[Any, ...], "Move"] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._interned = {}
+
+    @classmethod
+    def get(cls, *args: Any) -> "Move":
+        """
+        Returns:
+            A shared move instance created with the given arguments
+        """
+        move = cls._interned.get(args)
+        if move is None:
+            move = cls._interned[args] = cls(*args)
+        return move
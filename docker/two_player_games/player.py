@@ -1,5 +1,8 @@
 class Player:
     """A class that represents a player in a game"""
+
+    __slots__ = ("char",)
+
     def __init__(self, char: str) -> None:
         """
         Initializes a player.
@@ -8,6 +11,6 @@ class Player:
             char: a single-character string to represent the player in textual representations of game state
         """
         if len(char) != 1:
-            raise ValueError('Character that represents player should be of length 1')
+            raise ValueError("Character that represents player should be of length 1")
 
         self.char = char
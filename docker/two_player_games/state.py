@@ -1,15 +1,22 @@
-from typing import Iterable, Optional
+from copy import deepcopy
+from typing import Dict, Hashable, Iterable, Optional
 
 from two_player_games.move import Move
 from two_player_games.player import Player
 
 
 class State:
-    """Immutable game state object"""
+    """
+    Immutable game state object
+
+    For search, a state can also be changed in place with push and undone with pop.
+    make_move never changes the state it is called on.
+    """
 
     def __init__(self, current_player, other_player) -> None:
         self._current_player = current_player
         self._other_player = other_player
+        self._undo_stack = []
 
     def get_moves(self) -> Iterable[Move]:
         """
@@ -37,6 +44,38 @@ class State:
         """
         raise NotImplementedError
 
+    def push(self, move: Move) -> None:
+        """
+        Makes the move in place, without creating a new state
+
+        Parameters:
+            move: the move to make
+        """
+        raise NotImplementedError
+
+    def pop(self) -> Move:
+        """
+        Undoes the last move made with push
+
+        Returns:
+            The undone move
+        """
+        raise NotImplementedError
+
+    def snapshot(self) -> "State":
+        """
+        Creates a copy of the state that can be changed without affecting this one.
+        The players are replaced by new players with the same chars, so that a bot
+        given the copy cannot reach the other bot.
+
+        Returns:
+            The copy of the state (with nothing to pop)
+        """
+        players = self._get_stand_ins()
+        memo = {id(player): stand_in for player, stand_in in players.items()}
+        memo[id(self._undo_stack)] = []
+        return deepcopy(self, memo)
+
     def is_finished(self) -> bool:
         """
         Returns:
@@ -58,9 +97,51 @@ class State:
         """
         return [self._current_player, self._other_player]
 
+    def get_hash(self) -> int:
+        """
+        Returns:
+            The 64-bit Zobrist hash of the state
+        """
+        raise NotImplementedError
+
+    def __hash__(self) -> int:
+        return self.get_hash()
+
+    def __eq__(self, other: object) -> bool:
+        if type(self) is not type(other):
+            return False
+        return (
+            self.get_hash() == other.get_hash() and self._get_key() == other._get_key()
+        )
+
     def __str__(self) -> str:
         """
         Returns:
             The string representation of the game's state
         """
         raise NotImplementedError
+
+    def _get_stand_ins(self) -> Dict[Player, Player]:
+        """
+        Returns:
+            New players with the chars of the players of the state, by the players
+        """
+        return {player: Player(player.char) for player in self.get_players()}
+
+    def _replace_players(self, players: Dict[Player, Player]) -> None:
+        """
+        Replaces the players everywhere in a copied state, the ones held by the state
+        it was copied from are left as they are
+
+        Parameters:
+            players: the replacements by the players
+        """
+        self._current_player = players[self._current_player]
+        self._other_player = players[self._other_player]
+
+    def _get_key(self) -> Hashable:
+        """
+        Returns:
+            A value that is equal for states with the same position
+        """
+        raise NotImplementedError
@@ -0,0 +1,36 @@
+import hashlib
+from typing import Dict, Hashable, Tuple
+
+
+class ZobristTable:
+    """
+    Zobrist keys of a game.
+
+    Keys are 64-bit integers derived from the game name and a feature (e.g. a field and
+    the character of the player occupying it), so they are the same in every process.
+    A position's hash is the xor of the keys of its features, which lets states update
+    it incrementally by xoring in and out the features changed by a move.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initializes the table.
+
+        Parameters:
+            name: name of the game, keys of different games are independent
+        """
+        self.name = name
+        self._keys: Dict[Tuple[Hashable, ...], int] = {}
+
+    def get_key(self, *feature: Hashable) -> int:
+        """
+        Returns:
+            The 64-bit key of the feature
+        """
+        key = self._keys.get(feature)
+        if key is None:
+            digest = hashlib.blake2b(
+                repr((self.name,) + feature).encode(), digest_size=8
+            ).digest()
+            key = self._keys[feature] = int.from_bytes(digest, "little")
+        return key
@@ -1762,6 +1762,7 @@ export const TournamentMatchScreen = ({ onNavigate, tournamentId, matchId }) =>
   const [error, setError] = useState('');
   const [user, setUser] = useState(null);
   const [tournament, setTournament] = useState(null);
+  const [states, setStates] = useState([]);
 
   useEffect(() => {
     const fetchTournament = async () => {
@@ -1773,10 +1774,22 @@ export const TournamentMatchScreen = ({ onNavigate, tournamentId, matchId }) =>
         setError('Nie udało się pobrać danych turnieju');
       }
     };
+    const fetchStates = async () => {
+      try {
+        const response = await api.get(`/tournaments/${tournamentId}/matches/${matchId}/states/`);
+        setStates(response.data);
+      } catch (err) {
+        console.error('Error fetching match states:', err);
+        setError('Nie udało się pobrać historii ruchów');
+      }
+    };
     const fetchMatch = async () => {
       try {
         const response = await api.get(`/tournaments/${tournamentId}/matches/${matchId}/`);
         setMatch(response.data);
+        if (response.data.n_moves > 0) {
+          await fetchStates();
+        }
       } catch (err) {
         console.error('Error fetching match:', err);
         setError('Nie udało się pobrać danych meczu');
@@ -1820,9 +1833,7 @@ export const TournamentMatchScreen = ({ onNavigate, tournamentId, matchId }) =>
   const isCreator = tournament?.creator?._id === user?._id;
   // const showRunButton = isCreator && !match.winner;
 
-  const formattedMoves = match.moves?.map(move => {
-    return move;
-  }).join('\n\n') || '';
+  const formattedMoves = states.join('\n\n');
 
   return (
     <div className="min-h-screen w-screen flex flex-col items-center justify-start bg-primary-bg text-white p-8 font-kanit">
@@ -1853,7 +1864,7 @@ export const TournamentMatchScreen = ({ onNavigate, tournamentId, matchId }) =>
 
         <h3 className="text-2xl font-light mb-4">Historia ruchów:</h3>
         <div className="flex-grow bg-button-bg rounded p-4 overflow-auto min-h-[500px]">
-          {match.moves && match.moves.length > 0 ? (
+          {states.length > 0 ? (
             <pre className="font-mono text-sm whitespace-pre-wrap">
               {formattedMoves}
             </pre>
@@ -1976,100 +1987,49 @@ const TournamentTreeScreen = ({ onNavigate, tournamentId }) => {
     return matches;
   };
 
+  const waitForJob = async (job, onProgress) => {
+    while (job.status === 'queued' || job.status === 'running') {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      const jobResponse = await api.get(`/jobs/${job._id}/`);
+      job = jobResponse.data;
+      if (onProgress) {
+        await onProgress(job);
+      }
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error);
+    }
+    return job;
+  };
+
+  const fetchMatches = async () => {
+    const matchesResponse = await api.get(`/tournaments/${tournamentId}/matches/`);
+    const sortedMatches = [...matchesResponse.data].sort((a, b) => a.game_num - b.game_num);
+    setMatches(sortedMatches);
+    return sortedMatches;
+  };
+
   const startTournament = async () => {
     setIsStarting(true);
     setError('');
-    
-    let previousMatch = null;
-    let matchCount = 0;
 
     try {
-      await api.put(`/tournaments/${tournamentId}/run`);
-      const matchesResponse = await api.get(`/tournaments/${tournamentId}/matches/`);
-      
-      const matchQueue = [...matchesResponse.data].sort((a, b) => a.game_num - b.game_num);
-      setMatches(matchQueue);
-      
-      while (matchQueue.length > 0) {
-        console.log('Match queue:', ...matchQueue);
-        const currentMatch = matchQueue.shift();
-        matchCount++;
-        setCurrentMatchIndex(matchCount);
-        
-        try {
-          await api.put(`/tournaments/${tournamentId}/matches/${currentMatch._id}/run/`);
-          console.log(`Running match ${matchCount}`);
-          await new Promise(resolve => setTimeout(resolve, 2000));
-          
-          const updatedMatchResponse = await api.get(`/tournaments/${tournamentId}/matches/${currentMatch._id}/`);
-          const updatedMatch = updatedMatchResponse.data;
-          
-          setMatches(prevMatches => {
-            const newMatches = [...prevMatches];
-            const matchIndex = newMatches.findIndex(m => m._id === currentMatch._id);
-            if (matchIndex !== -1) {
-              newMatches[matchIndex] = updatedMatch;
-            } else {
-              newMatches.push(updatedMatch);
-              newMatches.sort((a, b) => a.game_num - b.game_num);
-            }
-            return newMatches;
-          });
-
-          if (previousMatch) {
-            console.log("Creating new pair with winners:", {
-              match1: previousMatch.winner.name,
-              match2: updatedMatch.winner.name
-            });
-
-            const params = new URLSearchParams();
-            params.append('game_num', Math.ceil((updatedMatch.game_num + matches.length)/2) + 2); 
-            params.append('players', previousMatch.winner._id);
-            params.append('players', updatedMatch.winner._id);
-
-            const newMatchResponse = await api.post(`/tournaments/${tournamentId}/matches/?${params.toString()}`);
-            
-            matchQueue.push(newMatchResponse.data);
-            setMatches(prevMatches => [...prevMatches, newMatchResponse.data]);
-            
-            previousMatch = null;
-          } else {
-            previousMatch = updatedMatch;
-          }
-          
-        } catch (err) {
-          console.error(`Error processing match:`, err);
-          setError(`Błąd podczas przetwarzania meczu ${matchCount}`);
-          break;
-        }
-      }
+      const jobResponse = await api.put(`/tournaments/${tournamentId}/run`);
+      await waitForJob(jobResponse.data, async () => {
+        const currentMatches = await fetchMatches();
+        setCurrentMatchIndex(currentMatches.filter(match => match.winner).length + 1);
+      });
     } catch (error) {
       console.error('Error running tournament:', error);
       setError('Wystąpił błąd podczas uruchamiania turnieju');
     } finally {
-      const formData = new FormData();
-      formData.append('winner_id', previousMatch.winner._id);
-      
-      await api.put(`/tournaments/${tournamentId}/winner/`, formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      });
-
-      const tournamentResponse = await api.get(`/tournaments/${tournamentId}/`);
-      setTournament(tournamentResponse.data);
-
       setIsStarting(false);
       setCurrentMatchIndex(0);
-      
+
       try {
-        const finalMatchesResponse = await api.get(`/tournaments/${tournamentId}/matches/`);
-        const matchPromises = finalMatchesResponse.data.map(match => 
-          api.get(`/tournaments/${tournamentId}/matches/${match._id}/`)
-        );
-        const matchResults = await Promise.all(matchPromises);
-        const updatedMatches = matchResults.map(result => result.data);
-        setMatches(updatedMatches);
+        const tournamentResponse = await api.get(`/tournaments/${tournamentId}/`);
+        setTournament(tournamentResponse.data);
+        await fetchMatches();
       } catch (err) {
         console.error('Error fetching final tournament state:', err);
       }